@@ -1,9 +1,25 @@
-import heapq
 from typing import List, Tuple, TypeVar, Generic, Callable, Optional, Set
-from src.dfs import State
-from collections import deque
+from src.dfs import State, normalize_state, get_push_states, PROGRESS_INTERVAL
+from src.compact import CompactLevel
+from src.deadlock import is_freeze_deadlock
+from src.distances import PushDistances
+from src.corral import CorralPruner
+from src.matching import MatchingHeuristic
+from src.openlist import OPEN_LISTS
+from src.moves import Solution, path_to_moves, push_path_to_moves
+from src.metrics import PhaseTimer
+from src.profiling import HotPathProfiler
+from src.budget import BUDGET_CHECK_INTERVAL, SearchBudget, SearchCheckpoint
+from src.closedset import CLOSED_SETS, MmapClosedSet, MmapHashTable, MmapIntDict
+from collections import deque, OrderedDict
+from array import array
+import os
+import time
 
 
+# Seconds between two checkpoint files written by astar_solve(checkpoint_file=...)
+CHECKPOINT_INTERVAL = 300.0
+
 #ASTAR NODE IMPLEMENT
 T = TypeVar('T')
 
@@ -30,7 +46,15 @@ class AStar(Generic[T]):
                  get_neighbors: Callable[[T], List[Tuple[T, str]]],
                  heuristic: Callable[[T], int],
                  state_key: Callable[[T], tuple] = None,
-                 max_depth: int = 1000, epsilon: float = 1.0):
+                 max_depth: int = 1000, epsilon: float = 1.0,
+                 prune_counts: Optional[dict] = None,
+                 on_expand: Optional[Callable[[T], None]] = None,
+                 open_list: str = 'heap', duplicate_detection: bool = False,
+                 progress: Optional[Callable[[dict], None]] = None,
+                 profiler: Optional[HotPathProfiler] = None,
+                 budget: Optional[SearchBudget] = None,
+                 on_checkpoint: Optional[Callable[[SearchCheckpoint], None]] = None,
+                 checkpoint_interval: float = 0.0, closed_set: str = 'memory'):
         """
         Initialize A* solver
         
@@ -41,7 +65,30 @@ class AStar(Generic[T]):
             heuristic: Function to estimate distance to goal
             state_key: Function to create hashable state identifier (for cycle detection)
             max_depth: Maximum search depth to prevent infinite loops
+            prune_counts: Dict the neighbor function updates with pruning
+                          counters; reported by get_statistics
+            on_expand: Called with each state right before its neighbors are
+                       generated (lets incremental heuristics see the parent)
+            open_list: Name of the open list implementation in OPEN_LISTS
+                       ('heap' or 'bucket')
+            duplicate_detection: Keep the best g seen per state and drop
+                                 generated nodes that do not improve on it
+            progress: Called every PROGRESS_INTERVAL expansions with the node
+                      counters and the open ('open_size') and closed
+                      ('closed_size') sizes
+            profiler: Counts and samples the time of the goal test, neighbor,
+                      heuristic and state key functions and the open list
+            budget: Node, time and memory limits; when one is hit, solve()
+                    returns None with the search intact (see SearchBudget,
+                    checkpoint() and restore())
+            on_checkpoint: Called with a SearchCheckpoint of the running
+                           search every checkpoint_interval seconds
+            closed_set: 'memory' (Python set and dict) or 'mmap' (the closed
+                        set and best g table in memory-mapped files, see
+                        MmapHashTable)
         """
+        if closed_set not in CLOSED_SETS:
+            raise ValueError(f"Unknown closed set '{closed_set}' (expected one of {', '.join(CLOSED_SETS)})")
         self.initial_state = initial_state
         self.is_goal = is_goal
         self.get_neighbors = get_neighbors
@@ -52,6 +99,37 @@ class AStar(Generic[T]):
         self.nodes_expanded = 0
         self.nodes_generated = 0
         self.epsilon = epsilon
+        self.goal_node = None
+        self.prune_counts = prune_counts if prune_counts is not None else {}
+        self.on_expand = on_expand
+        self.open_list = OPEN_LISTS[open_list]
+        self.duplicate_detection = duplicate_detection
+        self.duplicates_dropped = 0
+        self.closed_set = closed_set
+        # Closed set of the last solve() (for its statistics)
+        self.closed = None
+        self.progress = progress
+        self.peak_open_size = 0
+        self.peak_closed_size = 0
+        self.budget = budget
+        self.stop_reason = None
+        self.best_node = None
+        # (open list, closed set, best g) of a stopped or restored search
+        self.frontier = None
+        self.on_checkpoint = on_checkpoint
+        self.checkpoint_interval = checkpoint_interval
+        # Level and options saved with checkpoints (set by astar_solve)
+        self.problem_info = None
+        self.profiler = profiler
+        if profiler:
+            self.is_goal = profiler.wrap('is_goal', self.is_goal)
+            self.get_neighbors = profiler.wrap('get_neighbors', self.get_neighbors)
+            self.heuristic = profiler.wrap('heuristic', self.heuristic)
+            self.state_key = profiler.wrap('state_key', self.state_key)
+    
+    def _report_progress(self, open_size: int, closed_size: Optional[int]) -> None:
+        self.progress({'nodes_explored': self.nodes_explored, 'nodes_expanded': self.nodes_expanded,
+                       'nodes_generated': self.nodes_generated, 'open_size': open_size, 'closed_size': closed_size})
     
     def solve(self) -> Optional[List[str]]:
         """
@@ -59,21 +137,56 @@ class AStar(Generic[T]):
         
         Returns:
             List of actions to reach goal, or None if no solution found
+            or the budget ran out (see stop_reason)
         """
-        counter = 0
-        initial_h = self.heuristic(self.initial_state, 0)
-        start_node = Node(self.initial_state, 0, initial_h)
-        self.nodes_generated = 1  # Count initial node
+        if self.frontier is not None:
+            # Continue a stopped or restored search
+            open_list, visited, best_g = self.frontier
+            self.frontier = None
+            self.stop_reason = None
+            self.best_node = None
+        else:
+            initial_h = self.heuristic(self.initial_state, 0)
+            start_node = Node(self.initial_state, 0, initial_h)
+            self.nodes_generated = 1  # Count initial node
+            
+            open_list = self.open_list()
+            open_list.push(start_node.f_score, 0, start_node)
+            # Best g per generated state (duplicate detection only)
+            visited, best_g = self._new_tables((), {self.state_key(self.initial_state): 0} if self.duplicate_detection else None)
+        self.closed = visited
+        if self.profiler:
+            self.profiler.wrap_methods(open_list, 'open_list', ('push', 'pop'))
         
-        heap = [(start_node.f_score, counter, start_node)]
-        visited: Set[tuple] = set()
+        budget = self.budget
+        if budget:
+            budget.start()
+        # Expansion count of the next budget / checkpoint timer check
+        check_due = None
+        if budget or self.on_checkpoint:
+            check_due = self._next_check()
+            next_checkpoint = time.perf_counter() + self.checkpoint_interval
         
-        while heap:
-            _, _, current_node = heapq.heappop(heap)
+        while open_list:
+            if check_due is not None and self.nodes_expanded >= check_due:
+                reason = budget.check(self.nodes_expanded) if budget else None
+                if reason:
+                    self._stop(reason, open_list, visited, best_g)
+                    return None
+                if self.on_checkpoint and time.perf_counter() >= next_checkpoint:
+                    self.on_checkpoint(self._make_checkpoint(open_list, visited, best_g))
+                    next_checkpoint = time.perf_counter() + self.checkpoint_interval
+                check_due = self._next_check()
+            open_size = len(open_list)
+            if open_size > self.peak_open_size:
+                self.peak_open_size = open_size
+            current_node = open_list.pop()
             self.nodes_explored += 1
             
             # Check if goal
             if self.is_goal(current_node.state):
+                self.goal_node = current_node
+                self.peak_closed_size = len(visited)  # The closed set only grows
                 return self._reconstruct_path(current_node)
             
             # Cycle detection
@@ -82,26 +195,123 @@ class AStar(Generic[T]):
                 continue
             visited.add(state_key)
             self.nodes_expanded += 1
+            if self.progress and self.nodes_expanded % PROGRESS_INTERVAL == 0:
+                self._report_progress(len(open_list), len(visited))
             
             # Depth limit check
             if current_node.g_score >= self.max_depth:
                 continue
             
+            if self.on_expand:
+                self.on_expand(current_node.state)
+            
             # Explore neighbors
             for next_state, action in self.get_neighbors(current_node.state):
                 next_state_key = self.state_key(next_state)
                 
                 if next_state_key not in visited:
                     g_score = current_node.g_score + 1
+                    if best_g is not None:
+                        if best_g.get(next_state_key, g_score + 1) <= g_score:
+                            self.duplicates_dropped += 1
+                            continue
+                        best_g[next_state_key] = g_score
                     h_score = self.epsilon * self.heuristic(next_state, g_score)
                     next_node = Node(next_state, g_score, h_score, current_node, action)
                     
-                    counter += 1
                     self.nodes_generated += 1  # Count each generated node
-                    heapq.heappush(heap, (next_node.f_score, counter, next_node))
+                    open_list.push(next_node.f_score, g_score, next_node)
         
+        self.peak_closed_size = len(visited)
         return None  # No solution found
     
+    def _new_tables(self, closed, best_g: Optional[dict]) -> tuple:
+        """(closed set, best g table or None) of the configured kind, filled with the given entries"""
+        if self.closed_set == 'mmap':
+            visited = MmapClosedSet()
+            visited.update(closed)
+            if best_g is not None:
+                table = MmapIntDict()
+                table.update(best_g)
+                best_g = table
+            return visited, best_g
+        return set(closed), dict(best_g) if best_g is not None else None
+    
+    def _next_check(self) -> int:
+        if self.budget:
+            return self.budget.next_check(self.nodes_expanded)
+        return self.nodes_expanded + BUDGET_CHECK_INTERVAL
+    
+    def _stop(self, reason: str, open_list, visited: set, best_g: Optional[dict]) -> None:
+        """Keep the search for checkpoint() and a later solve(), and note the best open node by h"""
+        if self.profiler:
+            # The next solve() wraps the list again
+            for name in ('push', 'pop'):
+                delattr(open_list, name)
+        self.frontier = (open_list, visited, best_g)
+        self.peak_closed_size = len(visited)
+        self.stop_reason = reason
+        self.best_node = min(open_list.items(), key=lambda node: node.h_score, default=None)
+        self.budget.stop(reason, self)
+    
+    def _counters(self) -> dict:
+        return {
+            'nodes_explored': self.nodes_explored,
+            'nodes_expanded': self.nodes_expanded,
+            'nodes_generated': self.nodes_generated,
+            'duplicates_dropped': self.duplicates_dropped,
+            'peak_open_size': self.peak_open_size,
+            'peak_closed_size': self.peak_closed_size,
+            'prune_counts': dict(self.prune_counts)
+        }
+    
+    def checkpoint(self) -> SearchCheckpoint:
+        """
+        Snapshot of a search stopped by its budget; open nodes and their
+        ancestors become a flat table. The closed set and best g table are
+        shared with the stopped search (restore() copies them).
+        """
+        return self._make_checkpoint(*self.frontier)
+    
+    def _make_checkpoint(self, open_list, visited: set, best_g: Optional[dict]) -> SearchCheckpoint:
+        self.peak_closed_size = len(visited)
+        open_nodes = open_list.items()
+        index = {}
+        nodes = []
+        for node in open_nodes:
+            chain = []
+            while node is not None and id(node) not in index:
+                chain.append(node)
+                node = node.parent
+            for node in reversed(chain):
+                index[id(node)] = len(nodes)
+                parent = index[id(node.parent)] if node.parent is not None else -1
+                nodes.append((node.state, node.g_score, node.h_score, parent, node.action))
+        data = {
+            'nodes': nodes,
+            'open': [index[id(node)] for node in open_nodes],
+            'closed': visited,
+            'best_g': best_g
+        }
+        return SearchCheckpoint('astar', self._counters(), data, self.problem_info)
+    
+    def restore(self, checkpoint: SearchCheckpoint) -> None:
+        """Load a checkpoint of the same level and settings; the next solve() continues it"""
+        if checkpoint.engine != 'astar':
+            raise ValueError(f"Cannot resume A* from a '{checkpoint.engine}' checkpoint")
+        counters = dict(checkpoint.counters)
+        self.prune_counts.update(counters.pop('prune_counts'))
+        for name, value in counters.items():
+            setattr(self, name, value)
+        
+        nodes = []
+        for state, g_score, h_score, parent, action in checkpoint.data['nodes']:
+            nodes.append(Node(state, g_score, h_score, nodes[parent] if parent >= 0 else None, action))
+        open_list = self.open_list()
+        for i in checkpoint.data['open']:
+            open_list.push(nodes[i].f_score, nodes[i].g_score, nodes[i])
+        self.frontier = (open_list, *self._new_tables(checkpoint.data['closed'], checkpoint.data['best_g']))
+    
     def _reconstruct_path(self, node: Node[T]) -> List[str]:
         """Reconstruct path from start to goal"""
         path = []
@@ -115,15 +325,239 @@ class AStar(Generic[T]):
         path.reverse()
         return path
     
+    def _reconstruct_states(self, node: Node[T]) -> List[T]:
+        """Reconstruct the list of states from start to the given node"""
+        states = []
+        current = node
+        
+        while current is not None:
+            states.append(current.state)
+            current = current.parent
+        
+        states.reverse()
+        return states
+    
     def get_statistics(self) -> dict:
         """Return search statistics"""
-        return {
+        stats = {
             'nodes_explored': self.nodes_explored,
             'nodes_expanded': self.nodes_expanded,
-            'nodes_generated': self.nodes_generated
+            'nodes_generated': self.nodes_generated,
+            'peak_open_size': self.peak_open_size,
+            'peak_closed_size': self.peak_closed_size,
+            **self.prune_counts
         }
+        if self.duplicate_detection:
+            stats['duplicates_dropped'] = self.duplicates_dropped
+        if self.stop_reason:
+            stats['budget_exhausted'] = self.stop_reason
+        if isinstance(self.closed, MmapHashTable):
+            stats['closed_set'] = self.closed.get_statistics()
+        # Caching heuristics report their own counters
+        heuristic = getattr(self.heuristic, '__wrapped__', self.heuristic)
+        if hasattr(heuristic, 'get_statistics'):
+            stats.update(heuristic.get_statistics())
+        if self.profiler:
+            stats['profile'] = self.profiler.get_statistics()
+        return stats
 
 
+# Default memory budget of the IDA* transposition table (bytes)
+IDA_TABLE_MEMORY = 64 * 1024 * 1024
+
+# Smallest increase of the IDA* bound between two iterations (moves)
+IDA_BOUND_STEP = 1.0
+
+class TranspositionTable:
+    """
+    Fixed-size hash table for IDA*, stored in flat arrays so its memory is
+    allocated once and never grows.
+    
+    Each slot holds a 64-bit state signature, the lowest g it was reached
+    with, the iteration that wrote it and a lower bound on the remaining
+    cost (the heuristic, raised to the backed-up bound once the subtree has
+    been searched). Colliding states replace a slot when the slot is from an
+    older iteration or was reached deeper; shallow entries prune more.
+    """
+    # Bytes per slot: signature (Q) + g (H) + iteration (I) + bound (d)
+    ENTRY_BYTES = 8 + 2 + 4 + 8
+    
+    def __init__(self, memory_limit: int = IDA_TABLE_MEMORY):
+        self.size = max(1, memory_limit // self.ENTRY_BYTES)
+        self.keys = array('Q', bytes(8 * self.size))
+        self.depths = array('H', bytes(2 * self.size))
+        self.iterations = array('I', bytes(4 * self.size))
+        self.bounds = array('d', bytes(8 * self.size))
+        self.stores = 0
+        self.replacements = 0
+    
+    def signature(self, key) -> int:
+        """64-bit signature of a state key (Zobrist keys are used as they are)"""
+        return (key if isinstance(key, int) else hash(key)) & 0xFFFFFFFFFFFFFFFF
+    
+    def probe(self, signature: int) -> int:
+        """Slot holding this signature, or -1"""
+        slot = signature % self.size
+        if self.iterations[slot] and self.keys[slot] == signature:
+            return slot
+        return -1
+    
+    def store(self, signature: int, g_score: int, iteration: int, bound: float) -> None:
+        slot = signature % self.size
+        if self.iterations[slot] and self.keys[slot] != signature:
+            if self.iterations[slot] == iteration and self.depths[slot] < g_score:
+                return
+            self.replacements += 1
+        self.stores += 1
+        self.keys[slot] = signature
+        self.depths[slot] = g_score
+        self.iterations[slot] = iteration
+        self.bounds[slot] = bound
+
+class IDAStar(AStar[T]):
+    """
+    Iterative-deepening A*: repeated depth-first searches bounded by f, each
+    bound being the smallest f that exceeded the previous one, but at least
+    IDA_BOUND_STEP higher. Weighted and depth-dependent heuristics give a
+    different f at almost every node, and without the step every iteration
+    would admit only a few more nodes and search the whole tree again. With
+    integral f the step changes nothing, and as costs are whole moves an
+    admissible heuristic still yields optimal solutions.
+    Memory is the current path plus a fixed-size TranspositionTable, which
+    - drops states already reached in this iteration with an equal or lower g
+    - keeps the backed-up bound of every searched subtree (infinite for a
+      subtree without any continuation), so later iterations start from a
+      better estimate than the plain heuristic and skip dead ends
+    Children are searched in increasing f order (move ordering).
+    """
+    
+    def __init__(self, *args, memory_limit: int = IDA_TABLE_MEMORY, **kwargs):
+        """
+        Args:
+            memory_limit: Bytes available to the transposition table
+            (other arguments as in AStar)
+        """
+        super().__init__(*args, **kwargs)
+        self.memory_limit = memory_limit
+        self.table = None
+        self.iterations = 0
+        self.transposition_hits = 0
+        self.peak_closed_size = None  # No closed set, only the fixed-size table
+    
+    def solve(self) -> Optional[List[str]]:
+        """
+        Solve using IDA*
+        
+        Returns:
+            List of actions to reach goal, or None if no solution found
+        """
+        self.table = TranspositionTable(self.memory_limit)
+        root = Node(self.initial_state, 0, self.epsilon * self.heuristic(self.initial_state, 0))
+        self.nodes_generated = 1  # Count initial node
+        
+        bound = root.f_score
+        while bound != float('inf'):
+            self.iterations += 1
+            next_bound = self._search(root, bound)
+            if self.goal_node is not None:
+                return self._reconstruct_path(self.goal_node)
+            bound = max(next_bound, bound + IDA_BOUND_STEP)
+        return None  # No solution found
+    
+    def _search(self, root: Node[T], bound: float) -> float:
+        """One bounded depth-first pass; returns the next bound"""
+        table = self.table
+        next_bound = float('inf')
+        
+        self.nodes_explored += 1
+        if self.is_goal(root.state):
+            self.goal_node = root
+            return bound
+        # Frames: [node, table signature, ordered children, next child, min exceeded f]
+        stack = [self._expand(root, table.signature(self.state_key(root.state)))]
+        self.peak_open_size = max(self.peak_open_size, 1)
+        
+        while stack:
+            frame = stack[-1]
+            node, signature, children, index, exceeded = frame
+            
+            if index == len(children):
+                stack.pop()
+                # Back up the smallest f seen below this node as its new bound
+                # (infinite when nothing below it can be continued)
+                if exceeded - node.g_score > node.h_score:
+                    table.store(signature, node.g_score, self.iterations, exceeded - node.g_score)
+                if stack:
+                    stack[-1][4] = min(stack[-1][4], exceeded)
+                continue
+            frame[3] = index + 1
+            
+            child, child_signature = children[index]
+            if child.f_score > bound:
+                # Children are sorted, so the rest exceed the bound as well
+                frame[3] = len(children)
+                frame[4] = min(exceeded, child.f_score)
+                next_bound = min(next_bound, child.f_score)
+                continue
+            
+            slot = table.probe(child_signature)
+            if slot >= 0 and table.iterations[slot] == self.iterations and table.depths[slot] <= child.g_score:
+                # Already searched this iteration with at least as much budget;
+                # its bound still counts towards this node's backed-up bound
+                self.transposition_hits += 1
+                estimate = child.g_score + table.bounds[slot]
+                frame[4] = min(exceeded, estimate)
+                if estimate > bound:
+                    next_bound = min(next_bound, estimate)
+                continue
+            
+            self.nodes_explored += 1
+            if self.is_goal(child.state):
+                self.goal_node = child
+                return bound
+            if child.g_score >= self.max_depth:
+                continue
+            stack.append(self._expand(child, child_signature))
+            if len(stack) > self.peak_open_size:
+                self.peak_open_size = len(stack)
+            if self.progress and self.nodes_expanded % PROGRESS_INTERVAL == 0:
+                # The open side of IDA* is the current path; it keeps no closed set
+                self._report_progress(len(stack), None)
+        
+        return next_bound
+    
+    def _expand(self, node: Node[T], signature: int) -> list:
+        """Record the node in the table and build its search frame"""
+        table = self.table
+        self.table.store(signature, node.g_score, self.iterations, node.h_score)
+        self.nodes_expanded += 1
+        if self.on_expand:
+            self.on_expand(node.state)
+        
+        children = []
+        g_score = node.g_score + 1
+        for next_state, action in self.get_neighbors(node.state):
+            child_signature = table.signature(self.state_key(next_state))
+            h_score = self.epsilon * self.heuristic(next_state, g_score)
+            # A bound learned in an earlier iteration beats the heuristic
+            slot = table.probe(child_signature)
+            if slot >= 0 and table.bounds[slot] > h_score:
+                h_score = table.bounds[slot]
+            children.append((Node(next_state, g_score, h_score, node, action), child_signature))
+            self.nodes_generated += 1
+        
+        # Move ordering: most promising child first
+        children.sort(key=lambda child: child[0].f_score)
+        return [node, signature, children, 0, float('inf')]
+    
+    def get_statistics(self) -> dict:
+        """Return search statistics"""
+        stats = super().get_statistics()
+        stats['iterations'] = self.iterations
+        stats['transposition_hits'] = self.transposition_hits
+        stats['transposition_table_size'] = self.table.size if self.table else 0
+        return stats
+
 
 #ASTAR SOLVE IMPLEMENT
 
@@ -166,7 +600,8 @@ def precompute_goal_distances(walls: Set[Tuple[int, int]], goals: Set[Tuple[int,
 def heuristic_bounded_relaxation(state: State, goal_distance_map: dict, current_depth: int = 0) -> int:
     """
     Bounded Relaxation Heuristic.
-    Sums the pre-computed shortest path cost for each box to its nearest goal.
+    Sums the pre-computed shortest path cost for each box to its nearest goal
+    (astar_solve passes the push distances from PushDistances.nearest_map).
     This relaxation assumes each box can be moved freely without other boxes blocking.
     """
     total_cost = 0
@@ -204,14 +639,115 @@ def dynamic_heuristic(state: State, goal_distance_map: dict, current_depth: int
     hd = hn * (1 + epsilon * weight )
     """
     base_heuristic = heuristic_bounded_relaxation(state, goal_distance_map, current_depth)
+    return apply_dynamic_weight(base_heuristic, current_depth, max_depth)
+
+def apply_dynamic_weight(base_heuristic, current_depth: int = 0, max_depth: int = 500):
+    """Depth weighting used by dynamic_heuristic, applied to an already computed base value"""
     if current_depth < max_depth:
         weight = (1 - current_depth / max_depth)
         return (1 + weight) * base_heuristic #epsilon = 1.0
     else:
         return 0
 
-def get_neighbors_with_actions(state: State, walls, goals) -> List[Tuple[State, str]]:
-    """Get all possible next states and the actions that produce them"""
+# Maximum number of box configurations kept by HeuristicCache
+HEURISTIC_CACHE_SIZE = 200000
+
+def moved_box(parent_boxes, boxes) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """(old, new) position when exactly one box moved between two box sets, else None"""
+    old = parent_boxes - boxes
+    if len(old) != 1:
+        return None
+    new = boxes - parent_boxes
+    if len(new) != 1:
+        return None
+    return next(iter(old)), next(iter(new))
+
+class HeuristicCache:
+    """
+    Memoizes an additive heuristic (sum of a per-box cost) by box configuration.
+    
+    Player moves never change the boxes, so most lookups are hits. On a miss,
+    if the configuration differs from the expanded parent (see set_parent) by
+    one moved box, the value is derived from the parent's cached value in O(1):
+    h(child) = h(parent) - cost(old) + cost(new). Otherwise the base heuristic
+    is computed in full. The cache is a bounded LRU.
+    Depth weighting (apply_dynamic_weight) is applied on top of the cached base
+    value, so the cached entries stay valid at any depth.
+    """
+    
+    def __init__(self, base_heuristic: Callable, box_cost: Callable, moved_box: Callable,
+                 depth_weight: Optional[Callable] = None, max_size: int = HEURISTIC_CACHE_SIZE):
+        """
+        Args:
+            base_heuristic: Function computing the unweighted heuristic of a state
+            box_cost: Per-box term of the base heuristic
+            moved_box: Function returning (old, new) for two box configurations
+                       that differ by one box, else None
+            depth_weight: Optional (base value, depth) -> weighted value
+        """
+        self.base_heuristic = base_heuristic
+        self.box_cost = box_cost
+        self.moved_box = moved_box
+        self.depth_weight = depth_weight
+        self.max_size = max_size
+        self.cache = OrderedDict()
+        self.parent = None
+        self.hits = 0
+        self.misses = 0
+        self.delta_updates = 0
+    
+    def set_parent(self, state) -> None:
+        """Remember the box configuration of the state being expanded"""
+        self.parent = state.boxes
+    
+    def __call__(self, state, current_depth: int = 0):
+        boxes = state.boxes
+        value = self.cache.get(boxes)
+        if value is not None:
+            self.hits += 1
+            self.cache.move_to_end(boxes)
+        else:
+            self.misses += 1
+            value = self._delta(boxes)
+            if value is None:
+                value = self.base_heuristic(state)
+            self.cache[boxes] = value
+            if len(self.cache) > self.max_size:
+                self.cache.popitem(last=False)
+        
+        if self.depth_weight:
+            return self.depth_weight(value, current_depth)
+        return value
+    
+    def _delta(self, boxes):
+        """Derive the value from the parent's when exactly one box moved"""
+        if self.parent is None:
+            return None
+        parent_value = self.cache.get(self.parent)
+        if parent_value is None or parent_value == float('inf'):
+            return None
+        moved = self.moved_box(self.parent, boxes)
+        if moved is None:
+            return None
+        old, new = moved
+        self.delta_updates += 1
+        return parent_value - self.box_cost(old) + self.box_cost(new)
+    
+    def get_statistics(self) -> dict:
+        return {
+            'heuristic_cache_hits': self.hits,
+            'heuristic_cache_misses': self.misses,
+            'heuristic_delta_updates': self.delta_updates
+        }
+
+def get_neighbors_with_actions(state: State, walls, goals, dead_squares=None, prune_counts=None) -> List[Tuple[State, str]]:
+    """
+    Get all possible next states and the actions that produce them
+    dead_squares: precomputed table from compute_dead_squares; falls back to
+                  is_simple_deadlock when not given
+    prune_counts: optional dict; 'freeze_pruned' counts pushes rejected by
+                  the freeze deadlock check
+    """
     neighbors = []
     directions = [
         (-1, 0, 'UP'),
@@ -232,12 +768,19 @@ def get_neighbors_with_actions(state: State, walls, goals) -> List[Tuple[State,
             bx, by = nx + dx, ny + dy
             if (bx, by) in walls or (bx, by) in state.boxes:
                 continue
-            # Simple deadlock check
-            if is_simple_deadlock((bx, by), walls, goals):
+            # Dead square check
+            if dead_squares is not None:
+                if (bx, by) in dead_squares:
+                    continue
+            elif is_simple_deadlock((bx, by), walls, goals):
                 continue
             new_boxes = set(state.boxes)
             new_boxes.remove((nx, ny))
             new_boxes.add((bx, by))
+            if is_freeze_deadlock((bx, by), new_boxes, walls, goals, dead_squares):
+                if prune_counts is not None:
+                    prune_counts['freeze_pruned'] = prune_counts.get('freeze_pruned', 0) + 1
+                continue
             neighbors.append((State((nx, ny), new_boxes), direction))
         else:
             neighbors.append((State((nx, ny), state.boxes), direction))
@@ -259,17 +802,32 @@ def is_simple_deadlock(box_pos, walls, goals):
         return True
     return False
 
-def astar_solve(start_state: State, walls, goals, map_width, map_height, heuristic_name = "manhattan") -> Optional[List[State]]:
-    """
-    Solve Sokoban using A* algorithm
+class SearchProblem:
+    """Start state, successor function and heuristic of one solver run (see build_search_problem)"""
     
-    Args:
-        start_state: Initial game state
-        walls: Set of wall positions
-        goals: Set of goal positions
-        
-    Returns:
-        List of states from start to goal, or None if no solution found
+    def __init__(self, initial_state, is_goal: Callable, get_neighbors: Callable, heuristic: Callable,
+                 state_key: Callable, epsilon: float, prune_counts: dict, to_moves: Callable):
+        """
+        Args:
+            to_moves: Turns the list of search states from start to goal into
+                      the LURD move string of the solution
+        """
+        self.initial_state = initial_state
+        self.is_goal = is_goal
+        self.get_neighbors = get_neighbors
+        self.heuristic = heuristic
+        self.state_key = state_key
+        self.epsilon = epsilon
+        self.prune_counts = prune_counts
+        self.to_moves = to_moves
+        # Lets incremental heuristics see the state being expanded
+        self.on_expand = getattr(heuristic, 'set_parent', None)
+
+def build_search_problem(start_state: State, walls, goals, heuristic_name = "manhattan", push_level: bool = False, compact: bool = False,
+                         corral_pruning: bool = False, heuristic_cache: bool = True) -> SearchProblem:
+    """
+    Precompute the level tables and build the successor function and heuristic
+    shared by the A*, IDA* and HDA* engines (arguments as in astar_solve)
     """
     global g_goals
     # Ensure goals is a set
@@ -277,55 +835,257 @@ def astar_solve(start_state: State, walls, goals, map_width, map_height, heurist
         goals = set(goals)
     g_goals = goals
     
+    # Shared precompute stage: goals x cells push distances and dead squares
+    push_distances = PushDistances(walls, goals, start_state.player)
+    
+    depth_weight = None
     if heuristic_name == 'BoundRelaxation (Static)':
-        goal_distance_map = precompute_goal_distances(walls, goals, map_width, map_height)
-        heuristic_func = lambda state, depth: heuristic_bounded_relaxation(state, goal_distance_map, depth)
+        goal_distance_map = push_distances.nearest_map()
+        base_heuristic = lambda state: heuristic_bounded_relaxation(state, goal_distance_map)
+        box_cost = lambda box: goal_distance_map.get(box, float('inf'))
         epsilon = 1.5  # Weight for bounded relaxation
     elif heuristic_name == 'Manhattan':
-        heuristic_func = lambda state, depth: heuristic_manhattan(state, depth)
+        base_heuristic = lambda state: heuristic_manhattan(state)
+        box_cost = lambda box: min((manhattan_distance(box, goal) for goal in goals), default=0)
         epsilon = 1.0  # Standard A*
     elif heuristic_name == 'BoundRelaxation (Dynamic)':
-        goal_distance_map = precompute_goal_distances(walls, goals, map_width, map_height)
-        heuristic_func = lambda state, depth: dynamic_heuristic(state, goal_distance_map, depth)
+        goal_distance_map = push_distances.nearest_map()
+        base_heuristic = lambda state: heuristic_bounded_relaxation(state, goal_distance_map)
+        box_cost = lambda box: goal_distance_map.get(box, float('inf'))
+        depth_weight = apply_dynamic_weight
         epsilon = 1.0  # Dynamic weight
+    elif heuristic_name == 'Matching (Hungarian)':
+        base_heuristic = MatchingHeuristic(push_distances.goal_maps(), lambda state: state.boxes)
+        epsilon = 1.0  # Admissible push lower bound
+    box_moved = moved_box
 
     def is_goal_state(state: State) -> bool:
         return all(box in g_goals for box in state.boxes)
     
+    dead_squares = push_distances.dead_squares
+    prune_counts = {'freeze_pruned': 0}
+    
     def get_neighbors(state: State) -> List[Tuple[State, str]]:
-        return get_neighbors_with_actions(state, walls, goals)
+        if push_level:
+            return [(next_state, 'PUSH') for next_state in get_push_states(state, walls, goals, dead_squares, prune_counts)]
+        return get_neighbors_with_actions(state, walls, goals, dead_squares, prune_counts)
     
     def state_key(state: State) -> tuple:
         return (state.player, tuple(sorted(state.boxes)))
     
+    initial_state = normalize_state(start_state, walls) if push_level else start_state
+    
+    if compact:
+        level = CompactLevel(walls, goals, start_state.player)
+        if heuristic_name == 'Matching (Hungarian)':
+            goal_rows = [level.cell_table(goal_map) for goal_map in push_distances.goal_maps()]
+            base_heuristic = MatchingHeuristic(goal_rows, lambda state: frozenset(level.mask_cells(state.boxes)))
+        else:
+            if heuristic_name == 'Manhattan':
+                floor = [level.position(i) for i in level.mask_cells(level.floor)]
+                table = level.cell_table({pos: box_cost(pos) for pos in floor}, 0)
+            else:
+                table = level.cell_table(goal_distance_map)
+            base_heuristic = lambda state: level.box_cost(state.boxes, table)
+            box_cost = table.__getitem__
+        box_moved = level.moved_box
+        
+        is_goal_state = level.is_goal
+        if push_level:
+            get_neighbors = lambda state: [(next_state, 'PUSH') for next_state in level.get_push_states(state)]
+            initial_state = level.normalize(level.encode(start_state))
+        else:
+            get_neighbors = level.get_next_states
+            initial_state = level.encode(start_state)
+        state_key = lambda state: state.key
+        prune_counts = level.prune_counts
+    
+    if isinstance(base_heuristic, MatchingHeuristic):
+        heuristic_func = base_heuristic  # Keeps its own per-configuration cache
+    elif heuristic_cache:
+        heuristic_func = HeuristicCache(base_heuristic, box_cost, box_moved, depth_weight)
+    elif depth_weight:
+        heuristic_func = lambda state, depth: depth_weight(base_heuristic(state), depth)
+    else:
+        heuristic_func = lambda state, depth: base_heuristic(state)
+    
+    if corral_pruning:
+        corral_pruner = CorralPruner(walls, goals, start_state.player)
+        prune_counts['corral_pruned'] = 0
+        is_corral_deadlock = corral_pruner.is_compact_deadlock if compact else corral_pruner.is_deadlock
+        expand = get_neighbors
+        
+        def get_neighbors_pruned(state) -> list:
+            if push_level:
+                # Every push state is checked once, when it is expanded
+                if is_corral_deadlock(state):
+                    prune_counts['corral_pruned'] += 1
+                    return []
+                return expand(state)
+            neighbors = []
+            for next_state, action in expand(state):
+                # Walking never changes the corrals, only pushes need a check
+                if next_state.boxes != state.boxes and is_corral_deadlock(next_state):
+                    prune_counts['corral_pruned'] += 1
+                    continue
+                neighbors.append((next_state, action))
+            return neighbors
+        get_neighbors = get_neighbors_pruned
+    
+    if push_level:
+        decode = (lambda states: [level.decode(state) for state in states]) if compact else list
+        to_moves = lambda states: push_path_to_moves(start_state, decode(states), walls)
+    elif compact:
+        to_moves = lambda states: path_to_moves(states, lambda state: level.position(state.player))
+    else:
+        to_moves = path_to_moves
+    
+    return SearchProblem(initial_state, is_goal_state, get_neighbors, heuristic_func, state_key, epsilon, prune_counts, to_moves)
+
+def astar_solve(start_state: State, walls, goals, map_width, map_height, heuristic_name = "manhattan", push_level: bool = False, compact: bool = False, corral_pruning: bool = False,
+                heuristic_cache: bool = True, open_list: str = 'heap', duplicate_detection: bool = False,
+                ida_star: bool = False, memory_limit: int = IDA_TABLE_MEMORY,
+                progress: Optional[Callable[[dict], None]] = None,
+                profiler: Optional[HotPathProfiler] = None, budget: Optional[SearchBudget] = None,
+                resume: Optional[SearchCheckpoint] = None, checkpoint_file: Optional[str] = None,
+                checkpoint_interval: float = CHECKPOINT_INTERVAL,
+                closed_set: str = 'memory') -> Tuple[Optional[Solution], dict]:
+    """
+    Solve Sokoban using A* algorithm (or IDA* with ida_star=True)
+    
+    Args:
+        start_state: Initial game state
+        walls: Set of wall positions
+        goals: Set of goal positions
+        push_level: Search over box pushes (g counts pushes) with a normalized
+                    player position; the walking steps are rebuilt afterwards
+        compact: Search over CompactState (bitmask boxes, incremental Zobrist
+                 keys) with per-cell heuristic tables
+        corral_pruning: Drop pushes that leave a PI-corral proven to be a
+                        deadlock (see CorralPruner)
+        heuristic_cache: Memoize additive heuristics by box configuration
+                         (see HeuristicCache)
+        open_list: 'heap' (binary heap) or 'bucket' (BucketOpenList, opt-in)
+        duplicate_detection: Drop generated nodes whose state was already
+                             generated with an equal or lower g
+        ida_star: Search with IDAStar instead of AStar (open_list and
+                  duplicate_detection are not used)
+        memory_limit: Bytes for the IDA* transposition table
+        progress: Called with live search counters (see AStar)
+        profiler: Hot-path counters of the search (see AStar)
+        budget: Node, time and memory limits (A* only). When one runs out the
+                statistics carry 'budget_exhausted' and 'best_frontier' (g, h
+                and moves of the open node with the lowest h), and
+                budget.checkpoint continues the search when passed as resume
+        resume: SearchCheckpoint of an earlier run with the same level and
+                settings (A* only)
+        checkpoint_file: Save the search there every checkpoint_interval
+                         seconds and when the budget runs out (A* only); the
+                         file is removed once the search ends. astar_resume
+                         continues from it after a restart.
+        closed_set: 'mmap' keeps the closed set and best g table in
+                    memory-mapped files instead of RAM (A* only, see AStar)
+        
+    Returns:
+        (Solution, or None if no solution found; search statistics)
+    """
+    if ida_star and (budget or resume or checkpoint_file):
+        raise ValueError("Search budgets, checkpoints and resume are supported by A* only")
+    problem_info = {
+        'walls': sorted(walls), 'player': start_state.player, 'boxes': sorted(start_state.boxes),
+        'goals': sorted(goals), 'map_width': map_width, 'map_height': map_height,
+        'options': {'heuristic_name': heuristic_name, 'push_level': push_level, 'compact': compact,
+                    'corral_pruning': corral_pruning, 'heuristic_cache': heuristic_cache,
+                    'open_list': open_list, 'duplicate_detection': duplicate_detection}
+    }
+    if resume and resume.problem is not None and resume.problem != problem_info:
+        raise ValueError("The checkpoint belongs to another level or other solver settings")
+    timer = PhaseTimer()
+    timer.start('precompute')
+    problem = build_search_problem(start_state, walls, goals, heuristic_name, push_level=push_level, compact=compact,
+                                   corral_pruning=corral_pruning, heuristic_cache=heuristic_cache)
+    
     # Create A* solver
-    solver = AStar(
-        initial_state=start_state,
-        is_goal=is_goal_state,
-        get_neighbors=get_neighbors,
-        heuristic=heuristic_func,
-        state_key=state_key,
-        max_depth=500,
-        epsilon=epsilon
-    )
-    
-    # Get solution as list of actions
-    actions = solver.solve()
-    
-    if not actions:
-        return None, solver.get_statistics()
-    
-    # Convert actions back to states
-    current_state = start_state
-    path = [current_state]
-    
-    for action in actions:
-        # Find the next state by applying the action
-        for next_state, next_action in get_neighbors_with_actions(current_state, walls, goals):
-            if next_action == action:
-                current_state = next_state
-                path.append(current_state)
-                break
-    
-    return path, solver.get_statistics()
+    if ida_star:
+        solver = IDAStar(
+            initial_state=problem.initial_state,
+            is_goal=problem.is_goal,
+            get_neighbors=problem.get_neighbors,
+            heuristic=problem.heuristic,
+            state_key=problem.state_key,
+            max_depth=500,
+            epsilon=problem.epsilon,
+            prune_counts=problem.prune_counts,
+            on_expand=problem.on_expand,
+            memory_limit=memory_limit,
+            progress=progress,
+            profiler=profiler
+        )
+    else:
+        solver = AStar(
+            initial_state=problem.initial_state,
+            is_goal=problem.is_goal,
+            get_neighbors=problem.get_neighbors,
+            heuristic=problem.heuristic,
+            state_key=problem.state_key,
+            max_depth=500,
+            epsilon=problem.epsilon,
+            prune_counts=problem.prune_counts,
+            on_expand=problem.on_expand,
+            open_list=open_list,
+            duplicate_detection=duplicate_detection,
+            progress=progress,
+            profiler=profiler,
+            budget=budget,
+            on_checkpoint=(lambda checkpoint: checkpoint.write(checkpoint_file)) if checkpoint_file else None,
+            checkpoint_interval=checkpoint_interval,
+            closed_set=closed_set
+        )
+        solver.problem_info = problem_info
+        if resume:
+            solver.restore(resume)
+    
+    timer.start('search')
+    solver.solve()
+    if checkpoint_file:
+        if solver.stop_reason:
+            budget.checkpoint.write(checkpoint_file)
+        elif os.path.exists(checkpoint_file):
+            os.remove(checkpoint_file)
+    stats = solver.get_statistics()
+    if solver.best_node is not None:
+        best = solver.best_node
+        stats['best_frontier'] = {'g': best.g_score, 'h': best.h_score,
+                                  'moves': problem.to_moves(solver._reconstruct_states(best))}
+    if solver.goal_node is None:
+        timer.stop()
+        stats['phases'] = timer.phases
+        return None, stats
+    timer.start('reconstruct')
+    moves = problem.to_moves(solver._reconstruct_states(solver.goal_node))
+    timer.stop()
+    stats['phases'] = timer.phases
+    return Solution(start_state, moves), stats
 
+def astar_resume(checkpoint_file: str, budget: Optional[SearchBudget] = None,
+                 progress: Optional[Callable[[dict], None]] = None, profiler: Optional[HotPathProfiler] = None,
+                 checkpoint_interval: float = CHECKPOINT_INTERVAL,
+                 closed_set: str = 'memory') -> Tuple[Optional[Solution], dict]:
+    """
+    Continue an A* search from a checkpoint file written by astar_solve, with
+    the level and options stored in it. The counters carry on from the
+    checkpoint, and the search keeps checkpointing to the same file. The
+    closed set may be of another kind than in the interrupted run.
+    
+    Returns:
+        As astar_solve
+    """
+    checkpoint = SearchCheckpoint.read(checkpoint_file)
+    if checkpoint.engine != 'astar' or checkpoint.problem is None:
+        raise ValueError(f"{checkpoint_file} is not an astar_solve checkpoint")
+    problem = checkpoint.problem
+    start_state = State(problem['player'], problem['boxes'])
+    return astar_solve(start_state, set(problem['walls']), set(problem['goals']), problem['map_width'],
+                       problem['map_height'], **problem['options'], progress=progress, profiler=profiler,
+                       budget=budget, resume=checkpoint, checkpoint_file=checkpoint_file,
+                       checkpoint_interval=checkpoint_interval, closed_set=closed_set)
@@ -0,0 +1,112 @@
+import multiprocessing
+import queue
+import signal
+import sys
+import time
+from typing import Optional
+
+from src.moves import Solution
+from src.solve import solve
+
+# Seconds between two progress messages sent by the worker
+PROGRESS_SEND_INTERVAL = 0.1
+
+
+def _solve_worker(results, args: tuple, kwargs: dict) -> None:
+    """Worker process: run solve() and send ('progress', counters), then ('done', solution, stats) or ('error', text)"""
+    # Unwind on terminate(), so solvers with their own worker processes (HDA*, portfolio) stop them
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1))
+    last_sent = [0.0]
+
+    def progress(counters: dict) -> None:
+        now = time.perf_counter()
+        if now - last_sent[0] >= PROGRESS_SEND_INTERVAL:
+            last_sent[0] = now
+            results.put(('progress', counters))
+
+    try:
+        solution, stats = solve(*args, progress=progress, **kwargs)
+    except Exception as e:
+        results.put(('error', f"{type(e).__name__}: {e}"))
+        return
+    results.put(('done', solution, stats))
+
+
+class BackgroundSolver:
+    """
+    Runs solve() in a separate process so the game loop keeps drawing.
+
+    poll() is called once per frame: it never blocks, picks up the latest
+    progress counters and returns True once the search has ended (see
+    solution, stats and error). cancel() terminates the worker at any time.
+    Live counters are reported by DFS, A* and IDA*; the other methods only
+    show the elapsed time.
+    """
+
+    def __init__(self, walls, player, boxes, goals, map_width, map_height, method, **kwargs):
+        """
+        Args:
+            (as in solve; kwargs are passed on to it)
+        """
+        self.args = (walls, player, boxes, goals, map_width, map_height, method)
+        self.kwargs = kwargs
+        self.context = multiprocessing.get_context()
+        self.results = self.context.Queue()
+        self.process = None
+        self.start_time = None
+        self.end_time = None
+        self.counters = {}
+        self.finished = False
+        self.solution: Optional[Solution] = None
+        self.stats = None
+        self.error = None
+
+    def start(self) -> None:
+        self.start_time = time.perf_counter()
+        # Not a daemon: HDA* and the portfolio start worker processes of their own
+        self.process = self.context.Process(target=_solve_worker, args=(self.results, self.args, self.kwargs))
+        self.process.start()
+
+    def poll(self) -> bool:
+        if self.finished:
+            return True
+        while True:
+            try:
+                message = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == 'progress':
+                self.counters = message[1]
+                continue
+            if message[0] == 'done':
+                self.solution, self.stats = message[1], message[2]
+            else:
+                self.error = message[1]
+            self._finish()
+            return True
+        if not self.process.is_alive() and self.results.empty():
+            self.error = f"Solver exited unexpectedly (exit code {self.process.exitcode})"
+            self._finish()
+        return self.finished
+
+    def cancel(self) -> None:
+        if self.process is not None and self.process.is_alive():
+            self.process.terminate()
+            self.error = "Cancelled"
+        self._finish()
+
+    def _finish(self) -> None:
+        if self.end_time is None:
+            self.end_time = time.perf_counter()
+        self.finished = True
+        if self.process is not None:
+            self.process.join(timeout=1)
+
+    @property
+    def elapsed(self) -> float:
+        return (self.end_time or time.perf_counter()) - self.start_time
+
+    @property
+    def nodes_per_second(self) -> float:
+        elapsed = self.elapsed
+        return self.counters.get('nodes_expanded', 0) / elapsed if elapsed > 0 else 0.0
@@ -0,0 +1,65 @@
+"""
+Open list benchmark: the binary heap against the bucket queue, each with and
+without best-g duplicate detection, on the same levels and heuristics.
+
+Usage:
+    python -m src.bench_open_list [--levels 5 7] [--repeat 3] [--compact] [--push-level]
+"""
+import argparse
+import os
+import statistics
+import time
+
+from src.dfs import State
+from src.astar import astar_solve
+from src.levels import LEVEL_FOLDER, read_level
+
+HEURISTICS = ['Manhattan', 'BoundRelaxation (Static)', 'BoundRelaxation (Dynamic)', 'Matching (Hungarian)']
+
+# (label, open_list, duplicate_detection)
+CONFIGURATIONS = [
+    ('heap', 'heap', False),
+    ('heap+best-g', 'heap', True),
+    ('bucket', 'bucket', False),
+    ('bucket+best-g', 'bucket', True)
+]
+
+
+def run(level: int, heuristic_name: str, open_list: str, duplicate_detection: bool, repeat: int, **options):
+    walls, player, boxes, goals, rows, cols = read_level(os.path.join(LEVEL_FOLDER, f"level{level}.txt"))
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        solution, stats = astar_solve(State(player, boxes), walls, goals, cols, rows, heuristic_name=heuristic_name,
+                                  open_list=open_list, duplicate_detection=duplicate_detection, **options)
+        times.append(time.perf_counter() - start)
+    steps = solution.steps if solution else None
+    return statistics.median(times), steps, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare A* open list implementations")
+    parser.add_argument("--levels", type=int, nargs="+", default=[5, 7])
+    parser.add_argument("--heuristics", nargs="+", default=HEURISTICS)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per configuration; the median time is reported")
+    parser.add_argument("--compact", action="store_true")
+    parser.add_argument("--push-level", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{'Level':<6} {'Heuristic':<26} {'Open list':<14} {'Time(s)':>8} {'Steps':>6} "
+          f"{'Explored':>9} {'Generated':>10} {'Dropped':>8} {'Speedup':>8}")
+    for level in args.levels:
+        for heuristic_name in args.heuristics:
+            baseline = None
+            for label, open_list, duplicate_detection in CONFIGURATIONS:
+                elapsed, steps, stats = run(level, heuristic_name, open_list, duplicate_detection, args.repeat,
+                                            compact=args.compact, push_level=args.push_level)
+                baseline = baseline or elapsed
+                print(f"{level:<6} {heuristic_name:<26} {label:<14} {elapsed:>8.3f} {str(steps):>6} "
+                      f"{stats['nodes_explored']:>9} {stats['nodes_generated']:>10} "
+                      f"{stats.get('duplicates_dropped', 0):>8} {baseline / elapsed:>7.2f}x")
+            print()
+
+
+if __name__ == "__main__":
+    main()
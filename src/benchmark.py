@@ -0,0 +1,302 @@
+"""
+Headless batch benchmark: levels x algorithms, run in parallel worker
+processes, written as the pipe-separated table of eval/solver_benchmark3.txt
+plus one JSON object per run.
+
+Usage:
+    python -m src.benchmark [--levels 1-155] [--algorithms DFS A*_Manhattan ...]
+                            [--timeout 100] [--memory-limit 4096] [--workers N]
+                            [--output eval/solver_benchmark3.txt] [--push-level] [--compact]
+                            [--store [FOLDER]] [--profile LEVEL] [--checkpoint-dir DIR]
+                            [--closed-set mmap] [--open-list bucket] [--duplicate-detection]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+import _thread
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import psutil
+
+from src.solve import solve, solver_config, BUDGET_METHODS, METHOD_DFS, METHOD_ASTAR, METHOD_IDASTAR, METHOD_BIDIRECTIONAL, METHOD_HDASTAR, METHOD_PORTFOLIO, METHOD_DFS_ID
+from src.levels import Level, LevelRepository, level_number
+from src.solution_store import STORE_FOLDER, SolutionStore
+from src.profiling import HotPathProfiler
+from src.budget import SearchBudget, SearchCheckpoint
+from src.closedset import CLOSED_SETS
+from src.openlist import OPEN_LISTS
+from src.metrics import format_stats
+
+# Table name -> (solve() method, heuristic name)
+ALGORITHMS = {
+    'DFS': (METHOD_DFS, None),
+    'DFS_ID': (METHOD_DFS_ID, None),
+    'A*_Manhattan': (METHOD_ASTAR, 'Manhattan'),
+    'A*_Relaxation_1.5': (METHOD_ASTAR, 'BoundRelaxation (Static)'),
+    'A*_Relaxation_Dynamic': (METHOD_ASTAR, 'BoundRelaxation (Dynamic)'),
+    'A*_Matching': (METHOD_ASTAR, 'Matching (Hungarian)'),
+    'IDA*_Relaxation_Dynamic': (METHOD_IDASTAR, 'BoundRelaxation (Dynamic)'),
+    'Bidirectional': (METHOD_BIDIRECTIONAL, None),
+    'HDA*_Relaxation_Dynamic': (METHOD_HDASTAR, 'BoundRelaxation (Dynamic)'),
+    'Portfolio': (METHOD_PORTFOLIO, None)
+}
+
+# The four variants of eval/solver_benchmark3.txt
+DEFAULT_ALGORITHMS = ['DFS', 'A*_Manhattan', 'A*_Relaxation_1.5', 'A*_Relaxation_Dynamic']
+
+DEFAULT_TIMEOUT = 100.0
+DEFAULT_OUTPUT = os.path.join("eval", "solver_benchmark3.txt")
+
+TABLE_HEADER = "Level | Algorithm | Time(s) | Steps | MemoryDelta(Bytes) | NodesExplored | NodesExpanded | NodesGenerated | Status"
+
+# Seconds between two limit checks of the watchdog thread
+WATCHDOG_INTERVAL = 0.05
+
+# Extra time (seconds) and memory (fraction of the limit) the watchdog allows
+# solvers that stop on their own SearchBudget, so they can report first
+WATCHDOG_GRACE = 5.0
+WATCHDOG_MEMORY_GRACE = 0.25
+
+
+class _Watchdog:
+    """
+    Enforces the wall-clock and memory limits of one run inside a worker.
+    A background thread polls the clock and the process RSS and interrupts
+    the solver (KeyboardInterrupt in the main thread) once a limit is hit.
+    """
+
+    def __init__(self, timeout: float, memory_limit: int, baseline_rss: int):
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.baseline_rss = baseline_rss
+        self.reason = None
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        proc = psutil.Process(os.getpid())
+        start = time.perf_counter()
+        while not self.done.wait(WATCHDOG_INTERVAL):
+            if time.perf_counter() - start > self.timeout:
+                self.reason = f"TIMEOUT({self.timeout}s)"
+            elif self.memory_limit and proc.memory_info().rss - self.baseline_rss > self.memory_limit:
+                self.reason = f"MEMORY({self.memory_limit // (1024 * 1024)}MB)"
+            else:
+                continue
+            _thread.interrupt_main()
+            return
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.done.set()
+        self.thread.join()
+
+
+def run_task(level: Level, algorithm: str, timeout: float, memory_limit: int, options: dict,
+             store_folder: str = None, checkpoint_dir: str = None, closed_set: str = 'memory',
+             open_list: str = 'heap', duplicate_detection: bool = False) -> dict:
+    """
+    Solve one level with one algorithm; runs in a worker process. Solutions go to the store when given.
+    Solvers with budget support stop at the limits themselves and keep their statistics; the watchdog
+    interrupts the others (and is the backstop for all of them). With checkpoint_dir, A* runs save
+    their search there and continue from a saved search of an earlier run. closed_set is passed to
+    solve() (memory-mapped closed sets for the BUDGET_METHODS), and so are the A* open_list and
+    duplicate_detection
+    """
+    walls, player, boxes, goals = level.walls, level.player, level.boxes, level.goals
+    method, heuristic_name = ALGORITHMS[algorithm]
+    budget = None
+    watchdog_timeout, watchdog_memory = timeout, memory_limit
+    if method in BUDGET_METHODS:
+        budget = SearchBudget(max_time=timeout, max_memory=memory_limit or None)
+        watchdog_timeout += WATCHDOG_GRACE
+        watchdog_memory += int(memory_limit * WATCHDOG_MEMORY_GRACE)
+    checkpoint_file = resume = None
+    if checkpoint_dir and method == METHOD_ASTAR:
+        name = f"{os.path.splitext(level.name)[0]}.{algorithm.replace('*', 'star')}.ckpt"
+        checkpoint_file = os.path.join(checkpoint_dir, name)
+        if os.path.exists(checkpoint_file):
+            resume = SearchCheckpoint.read(checkpoint_file)
+    before_mem = psutil.Process(os.getpid()).memory_info().rss
+
+    result = {
+        'level': level.name,
+        'algorithm': algorithm,
+        'time': 0.0,
+        'steps': None,
+        'memory_delta': None,
+        'nodes_explored': 0,
+        'nodes_expanded': 0,
+        'nodes_generated': 0,
+        'status': 'OK',
+        'stats': None
+    }
+    watchdog = _Watchdog(watchdog_timeout, watchdog_memory, before_mem)
+    start_time = time.perf_counter()
+    try:
+        with watchdog, contextlib.redirect_stdout(io.StringIO()):
+            solution, stats = solve(walls, player, boxes, goals, level.cols, level.rows, method,
+                                heuristic_name=heuristic_name, budget=budget, checkpoint_file=checkpoint_file,
+                                resume=resume, closed_set=closed_set, open_list=open_list,
+                                duplicate_detection=duplicate_detection, **options)
+    except KeyboardInterrupt:
+        if watchdog.reason is None:
+            raise
+        result['time'] = time.perf_counter() - start_time
+        result['status'] = f"ERR ({watchdog.reason})"
+        return result
+    except MemoryError:
+        result['time'] = time.perf_counter() - start_time
+        result['status'] = "ERR (MEMORY)"
+        return result
+    except Exception as e:
+        result['time'] = time.perf_counter() - start_time
+        result['status'] = f"ERR ({type(e).__name__}: {e})"
+        return result
+
+    result['time'] = time.perf_counter() - start_time
+    if stats:
+        # Peak growth sampled during the run; the RSS difference after it was noisy and often negative
+        result['memory_delta'] = stats['memory']['peak_delta']
+        result['nodes_explored'] = stats['nodes_explored']
+        result['nodes_expanded'] = stats['nodes_expanded']
+        result['nodes_generated'] = stats['nodes_generated']
+        result['stats'] = stats
+    if stats.get('budget_exhausted'):
+        limits = {'time': f"TIMEOUT({timeout}s)", 'memory': f"MEMORY({memory_limit // (1024 * 1024)}MB)", 'nodes': "NODES"}
+        result['status'] = f"ERR ({limits[stats['budget_exhausted']]})"
+    elif solution:
+        result['steps'] = solution.steps
+        if store_folder:
+            SolutionStore(store_folder).put(walls, goals,
+                                            solver_config(method, heuristic_name, **options), solution, stats)
+    else:
+        result['status'] = "ERR (NO SOLUTION)"
+    return result
+
+
+def format_row(result: dict) -> str:
+    steps = result['steps'] if result['steps'] is not None else '-'
+    memory = result['memory_delta'] if result['memory_delta'] is not None else '-'
+    return (f"{result['level']} | {result['algorithm']} | {result['time']:.6f} | {steps} | {memory} | "
+            f"{result['nodes_explored']} | {result['nodes_expanded']} | {result['nodes_generated']} | {result['status']}")
+
+
+def write_table(results: list, filename: str, levels: list, algorithms: list) -> None:
+    """Pipe-separated table grouped by level, in level and algorithm order"""
+    by_task = {(result['level'], result['algorithm']): result for result in results}
+    with open(filename, "w") as f:
+        f.write(TABLE_HEADER + "\n\n")
+        for level in levels:
+            rows = [by_task[(level, algorithm)] for algorithm in algorithms if (level, algorithm) in by_task]
+            if rows:
+                f.write("".join(format_row(result) + "\n" for result in rows) + "\n")
+
+
+def parse_levels(specs: list, files: list) -> list:
+    """Level file names from numbers and ranges ('5', '1-20'); all levels when empty"""
+    if not specs:
+        return files
+    wanted = set()
+    for spec in specs:
+        first, _, last = spec.partition('-')
+        wanted.update(range(int(first), int(last or first) + 1))
+    return [f for f in files if level_number(f) in wanted]
+
+
+def profile_level(level: Level, algorithms: list, options: dict, output: str, open_list: str = 'heap',
+                  duplicate_detection: bool = False) -> None:
+    """
+    Solve one level with every algorithm in this process with hot-path
+    counters (no limits); prints the counters and writes one folded-stack
+    file per algorithm, <output>.<level>.<algorithm>.folded
+    """
+    for algorithm in algorithms:
+        method, heuristic_name = ALGORITHMS[algorithm]
+        profiler = HotPathProfiler()
+        solution, stats = solve(level.walls, level.player, level.boxes, level.goals, level.cols, level.rows, method,
+                                heuristic_name=heuristic_name, profiler=profiler, open_list=open_list,
+                                duplicate_detection=duplicate_detection, **options)
+        search_time = stats['phases'].get('search', stats['time'])
+        print(f"== {level.name} | {algorithm} | {solution.steps if solution else 'no solution'} steps")
+        print(format_stats(stats))
+        if not profiler.counters:
+            print("(no hot-path counters: only DFS, A* and IDA* are instrumented)\n")
+            continue
+        print(profiler.format_table(search_time))
+        filename = f"{os.path.splitext(output)[0]}.{os.path.splitext(level.name)[0]}.{algorithm.replace('*', 'star')}.folded"
+        profiler.write_folded(filename, algorithm, search_time)
+        print(f"-> {filename}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run levels x algorithms in parallel and write the benchmark table")
+    parser.add_argument("--levels", nargs="*", default=[], help="level numbers or ranges, e.g. 1-20 35 (default: all)")
+    parser.add_argument("--algorithms", nargs="+", default=DEFAULT_ALGORITHMS, choices=list(ALGORITHMS))
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="wall-clock seconds per run")
+    parser.add_argument("--memory-limit", type=int, default=0, help="MB of extra RSS per run (0: no limit)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="table file; results also go to <output>.jsonl")
+    parser.add_argument("--push-level", action="store_true")
+    parser.add_argument("--compact", action="store_true")
+    parser.add_argument("--corral-pruning", action="store_true")
+    parser.add_argument("--store", nargs="?", const=STORE_FOLDER, default=None, metavar="FOLDER",
+                        help=f"save solutions to a solution store (default folder: {STORE_FOLDER})")
+    parser.add_argument("--checkpoint-dir", metavar="DIR",
+                        help="A* runs save their search here (periodically and at the limits) and the next "
+                             "benchmark continues it")
+    parser.add_argument("--open-list", choices=list(OPEN_LISTS), default='heap',
+                        help="A* open list; 'bucket' is the bucket queue (see BucketOpenList)")
+    parser.add_argument("--duplicate-detection", action="store_true",
+                        help="A* drops generated nodes that do not improve the best g of their state")
+    parser.add_argument("--closed-set", choices=CLOSED_SETS, default='memory',
+                        help="'mmap': DFS and A* keep their closed sets in memory-mapped files (see MmapHashTable)")
+    parser.add_argument("--profile", type=int, metavar="LEVEL",
+                        help="solve only this level in-process with hot-path counters and write flamegraph input "
+                             "(<output>.<level>.<algorithm>.folded) instead of running the batch")
+    args = parser.parse_args()
+
+    # Parsed once here; workers get the Level objects and never read level files
+    repository = LevelRepository()
+    levels = parse_levels(args.levels, repository.names)
+    options = {'push_level': args.push_level, 'compact': args.compact, 'corral_pruning': args.corral_pruning}
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    if args.profile is not None:
+        profile_level(repository.by_number(args.profile), args.algorithms, options, args.output, args.open_list,
+                      args.duplicate_detection)
+        return
+    memory_limit = args.memory_limit * 1024 * 1024
+    jsonl_file = os.path.splitext(args.output)[0] + ".jsonl"
+
+    # Longest-running variants first keeps the workers busy until the end
+    tasks = [(level, algorithm) for algorithm in args.algorithms for level in reversed(levels)]
+    results = []
+    start = time.perf_counter()
+    # One process per run: a timed-out or memory-hungry solver never affects the next one
+    with ProcessPoolExecutor(max_workers=args.workers, max_tasks_per_child=1) as executor, open(jsonl_file, "w") as jsonl:
+        futures = [executor.submit(run_task, repository.get(level), algorithm, args.timeout, memory_limit, options,
+                                   args.store, args.checkpoint_dir, args.closed_set, args.open_list,
+                                   args.duplicate_detection)
+                   for level, algorithm in tasks]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            jsonl.write(json.dumps(result) + "\n")
+            jsonl.flush()
+            print(f"[{len(results)}/{len(tasks)}] {format_row(result)}", file=sys.stderr)
+
+    write_table(results, args.output, levels, args.algorithms)
+    solved = sum(result['status'] == 'OK' for result in results)
+    print(f"{solved}/{len(results)} runs solved in {time.perf_counter() - start:.1f}s -> {args.output}, {jsonl_file}")
+
+
+if __name__ == "__main__":
+    main()
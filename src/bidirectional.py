@@ -0,0 +1,136 @@
+from typing import List, Optional, Set, Tuple
+from src.dfs import State
+from src.compact import CompactLevel
+from src.moves import Solution, push_path_to_moves
+from src.metrics import PhaseTimer
+
+
+class BidirectionalSearch:
+    """
+    Bidirectional breadth-first search over box pushes.
+
+    The forward side pushes from the start position, the backward side pulls
+    from every solved position (CompactLevel.goal_states). Both sides use
+    player-normalized compact states, so a position reached by both has the
+    same Zobrist key and the two parent tables act as one shared hashed
+    frontier. The smaller frontier is expanded one full layer at a time and
+    the layer's cheapest meeting point is kept, which makes the joined
+    solution optimal in pushes.
+
+    Pulls never move a box onto a dead square, so the backward side needs
+    no deadlock checks; the forward side keeps the dead-square and freeze
+    pruning of get_push_states.
+    """
+
+    def __init__(self, start_state: State, walls: Set[Tuple[int, int]], goals: Set[Tuple[int, int]]):
+        # The backward side starts from every goal filled with a box
+        if len(start_state.boxes) != len(goals):
+            raise ValueError(f"Bidirectional search needs as many boxes as goals "
+                             f"({len(start_state.boxes)} boxes, {len(goals)} goals)")
+        self.start_state = start_state
+        self.walls = walls
+        self.goals = goals
+        self.timer = PhaseTimer()
+        self.timer.start('precompute')
+        self.level = CompactLevel(walls, goals, start_state.player)
+        self.nodes_explored = 0
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.forward_expanded = 0
+        self.backward_expanded = 0
+        self.peak_open_size = 0
+        self.peak_closed_size = 0
+
+    def solve(self) -> Optional[Solution]:
+        level = self.level
+        start = level.normalize(level.encode(self.start_state))
+        goal_states = level.goal_states()
+        self.timer.start('search')
+
+        # key -> (parent key, state, depth); parents point towards the side's roots
+        forward = {start.key: (None, start, 0)}
+        backward = {state.key: (None, state, 0) for state in goal_states}
+        self.nodes_generated = len(forward) + len(backward)
+
+        meet = start.key if start.key in backward else None
+        if meet is None and level.is_goal(start):
+            self.timer.stop()
+            return Solution(self.start_state, "")
+
+        forward_frontier = [start]
+        backward_frontier = list(goal_states)
+        while meet is None and forward_frontier and backward_frontier:
+            self.peak_open_size = max(self.peak_open_size, len(forward_frontier) + len(backward_frontier))
+            if len(forward_frontier) <= len(backward_frontier):
+                forward_frontier, meet = self._expand_layer(forward_frontier, forward, backward, level.get_push_states)
+                self.forward_expanded += 1
+            else:
+                backward_frontier, meet = self._expand_layer(backward_frontier, backward, forward, level.get_pull_states)
+                self.backward_expanded += 1
+        # Both parent tables only grow
+        self.peak_closed_size = len(forward) + len(backward)
+
+        if meet is None:
+            self.timer.stop()
+            return None
+        self.timer.start('reconstruct')
+        moves = push_path_to_moves(self.start_state, self._join(forward, backward, meet), self.walls)
+        self.timer.stop()
+        return Solution(self.start_state, moves)
+
+    def _expand_layer(self, frontier: list, own: dict, other: dict, expand) -> Tuple[list, Optional[int]]:
+        """Expand every state of one layer; returns the next layer and the best meeting key"""
+        next_frontier = []
+        meet = None
+        best = None
+        for state in frontier:
+            self.nodes_explored += 1
+            self.nodes_expanded += 1
+            depth = own[state.key][2] + 1
+            for next_state in expand(state):
+                key = next_state.key
+                if key in own:
+                    continue
+                own[key] = (state.key, next_state, depth)
+                self.nodes_generated += 1
+                next_frontier.append(next_state)
+                if key in other and (best is None or depth + other[key][2] < best):
+                    meet, best = key, depth + other[key][2]
+        return next_frontier, meet
+
+    def _join(self, forward: dict, backward: dict, meet: int) -> List[State]:
+        """Push-level State path: forward chain up to the meeting point, then the backward chain"""
+        path = []
+        key = meet
+        while key is not None:
+            parent, state, _ = forward[key]
+            path.append(state)
+            key = parent
+        path.reverse()
+
+        key = backward[meet][0]
+        while key is not None:
+            parent, state, _ = backward[key]
+            path.append(state)
+            key = parent
+        return [self.level.decode(state) for state in path]
+
+    def get_statistics(self) -> dict:
+        return {
+            'nodes_explored': self.nodes_explored,
+            'nodes_expanded': self.nodes_expanded,
+            'nodes_generated': self.nodes_generated,
+            'forward_layers': self.forward_expanded,
+            'backward_layers': self.backward_expanded,
+            'peak_open_size': self.peak_open_size,
+            'peak_closed_size': self.peak_closed_size,
+            'phases': self.timer.phases,
+            **self.level.prune_counts
+        }
+
+
+def bidirectional_solver(start_state: State, walls: Set[Tuple[int, int]],
+                         goals: Set[Tuple[int, int]]) -> Tuple[Optional[Solution], Optional[dict]]:
+    search = BidirectionalSearch(start_state, walls, goals)
+    solution = search.solve()
+    return solution, search.get_statistics()
@@ -0,0 +1,191 @@
+import gzip
+import os
+import pickle
+import time
+from array import array
+from typing import Optional
+
+import psutil
+
+from src.closedset import MmapHashTable
+
+# Expansions between two wall-clock / memory checks of a SearchBudget
+BUDGET_CHECK_INTERVAL = 256
+
+# Format of checkpoint files written by SearchCheckpoint.write
+CHECKPOINT_VERSION = 1
+
+
+def _pack_keys(keys) -> object:
+    """
+    State keys as an unsigned 64-bit array when they are Zobrist keys, else
+    as they are. Memory-mapped tables are kept: they pickle slot by slot
+    without being loaded into RAM.
+    """
+    if isinstance(keys, MmapHashTable):
+        return keys
+    keys = list(keys)
+    if all(type(key) is int and 0 <= key < 1 << 64 for key in keys):
+        return array('Q', keys)
+    return keys
+
+
+class SearchCheckpoint:
+    """
+    What a stopped search needs to continue where it left off: the engine
+    that wrote it, its counters and the engine's own search data.
+
+    AStar data ('astar'):
+        nodes: (state, g, h, parent index or -1, action) rows; every open
+               node and its ancestors, parents before children
+        open: Node indices in the order they are pushed back
+        closed: State keys already expanded
+        best_g: Best g per generated state key (duplicate detection), or None
+    DFS data ('dfs'):
+        stack: States still to expand
+        parents: State key -> parent state (None for the start); parent
+                 key with closed_set='mmap'
+        closed_set: Kind of visited table; a resumed search must use the same
+    Iterative-deepening DFS data ('dfs_id'):
+        path: States from the start to the one being searched
+        limit: Depth limit of the interrupted pass
+        children: Children of every path state not tried yet
+        depths: State key -> smallest depth reached in this pass
+        cut_off: Whether the pass has met its depth limit yet
+        closed_set: As for 'dfs'
+
+    AStar checkpoints written by astar_solve also carry `problem`, the
+    level and solver options that astar_resume needs.
+    """
+
+    def __init__(self, engine: str, counters: dict, data: dict, problem: Optional[dict] = None):
+        self.engine = engine
+        self.counters = counters
+        self.data = data
+        self.problem = problem
+
+    def write(self, filename: str) -> None:
+        """
+        Save to a gzip-compressed pickle. A* node rows and Zobrist keys are
+        stored as columns of flat arrays; memory-mapped closed tables are
+        streamed from their files (see MmapHashTable). The file is written to a temporary
+        name and renamed into place, so a crash while saving keeps the
+        previous checkpoint.
+        """
+        data = self.data
+        if self.engine == 'astar':
+            states, g_scores, h_scores, parents, actions = zip(*data['nodes']) if data['nodes'] else ((),) * 5
+            best_g = data['best_g']
+            # A dict goes as key and value columns, a memory-mapped table as it is
+            columns = best_g is not None and not isinstance(best_g, MmapHashTable)
+            data = {
+                'states': list(states),
+                'g': array('I', g_scores),
+                'h': array('d', h_scores),
+                'parents': array('q', parents),
+                'actions': list(actions),
+                'open': array('q', data['open']),
+                'closed': _pack_keys(data['closed']),
+                'best_g_keys': _pack_keys(best_g) if columns else None,
+                'best_g': array('I', best_g.values()) if columns else best_g
+            }
+        payload = {'version': CHECKPOINT_VERSION, 'engine': self.engine, 'counters': self.counters,
+                   'problem': self.problem, 'data': data}
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_file = f"{filename}.{os.getpid()}.tmp"
+        with gzip.open(temp_file, "wb", compresslevel=1) as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, filename)
+
+    @classmethod
+    def read(cls, filename: str) -> 'SearchCheckpoint':
+        """
+        Raises:
+            ValueError: if the file is not a checkpoint of this format version
+        """
+        with gzip.open(filename, "rb") as f:
+            payload = pickle.load(f)
+        if not isinstance(payload, dict) or payload.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"{filename} is not a version {CHECKPOINT_VERSION} search checkpoint")
+        data = payload['data']
+        if payload['engine'] == 'astar':
+            best_g = dict(zip(data['best_g_keys'], data['best_g'])) if data['best_g_keys'] is not None else data['best_g']
+            data = {
+                'nodes': list(zip(data['states'], data['g'], data['h'], data['parents'], data['actions'])),
+                'open': data['open'],
+                'closed': data['closed'],
+                'best_g': best_g
+            }
+        return cls(payload['engine'], payload['counters'], data, payload['problem'])
+
+    def __repr__(self) -> str:
+        return f"SearchCheckpoint({self.engine}, {self.counters.get('nodes_expanded', 0)} expanded)"
+
+
+class SearchBudget:
+    """
+    Node, wall-clock and memory limits of one AStar or DFS run (None: no
+    limit). The engine checks it between two expansions and, once a limit
+    is hit, stops with its open and closed sets intact and calls stop():
+
+        reason: 'nodes', 'time' or 'memory'
+        checkpoint: SearchCheckpoint to pass as `resume` to astar_solve or
+                    dfs_solver (built on first access)
+
+    The statistics of a stopped run carry 'budget_exhausted' (the reason)
+    and 'best_frontier', the open node with the lowest h.
+    """
+
+    def __init__(self, max_nodes: Optional[int] = None, max_time: Optional[float] = None,
+                 max_memory: Optional[int] = None):
+        """
+        Args:
+            max_nodes: Node expansions, counted over resumed runs as well
+            max_time: Wall-clock seconds of this run
+            max_memory: Bytes of RSS growth since the search started
+        """
+        self.max_nodes = max_nodes
+        self.max_time = max_time
+        self.max_memory = max_memory
+        self.reason = None
+        self.engine = None
+        self._checkpoint = None
+        self._deadline = None
+        self._process = None
+        self._baseline = 0
+
+    def start(self) -> None:
+        if self.max_time is not None:
+            self._deadline = time.perf_counter() + self.max_time
+        if self.max_memory is not None:
+            self._process = psutil.Process(os.getpid())
+            self._baseline = self._process.memory_info().rss
+
+    def next_check(self, nodes_expanded: int) -> int:
+        """Expansion count at which check() is due next"""
+        due = nodes_expanded + BUDGET_CHECK_INTERVAL
+        return min(due, self.max_nodes) if self.max_nodes is not None else due
+
+    def check(self, nodes_expanded: int) -> Optional[str]:
+        """The limit that has been reached, or None"""
+        if self.max_nodes is not None and nodes_expanded >= self.max_nodes:
+            return 'nodes'
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            return 'time'
+        if self._process is not None and self._process.memory_info().rss - self._baseline >= self.max_memory:
+            return 'memory'
+        return None
+
+    def stop(self, reason: str, engine) -> None:
+        """Called by the engine when it stops; the engine builds the checkpoint on demand"""
+        self.reason = reason
+        self.engine = engine
+        self._checkpoint = None
+
+    @property
+    def checkpoint(self) -> Optional[SearchCheckpoint]:
+        if self._checkpoint is None and self.engine is not None:
+            self._checkpoint = self.engine.checkpoint()
+        return self._checkpoint
@@ -0,0 +1,338 @@
+import mmap
+import struct
+import tempfile
+from collections import OrderedDict
+from itertools import chain
+from typing import Callable, Iterator, Optional, Tuple
+
+CLOSED_SETS = ('memory', 'mmap')
+
+# Slots of a new table file; the file is sparse, so unused slots cost no disk
+MMAP_INITIAL_CAPACITY = 1 << 16
+
+# Share of used slots before the table doubles (linear probing slows down past it)
+MMAP_MAX_LOAD = 0.5
+
+# Entries of the in-RAM cache in front of each table file
+MMAP_CACHE_SIZE = 100000
+
+# Slot flags
+_EMPTY = 0
+_USED = 1
+
+# Returned by _lookup for a key that is not in the table
+_MISSING = object()
+
+
+def key_codec(sample) -> Tuple[int, Callable, Callable]:
+    """
+    (size, pack, unpack) for fixed-width packed state keys shaped like
+    `sample`: Zobrist keys (ints below 2**64, 8 bytes) or (player, boxes)
+    position tuples (2 bytes per coordinate). The packing is exact, so two
+    keys share a slot only if they are equal.
+
+    Raises:
+        ValueError: for any other kind of key
+    """
+    if isinstance(sample, int):
+        return 8, lambda key: key.to_bytes(8, 'little'), lambda data: int.from_bytes(data, 'little')
+    if (isinstance(sample, tuple) and len(sample) == 2 and isinstance(sample[1], tuple)
+            and all(isinstance(pos, tuple) and len(pos) == 2 for pos in (sample[0], *sample[1]))):
+        boxes = len(sample[1])
+        packer = struct.Struct(f"<{2 + 2 * boxes}H")
+
+        def unpack(data: bytes) -> tuple:
+            values = packer.unpack(data)
+            return values[:2], tuple(zip(values[2::2], values[3::2]))
+        return packer.size, lambda key: packer.pack(*key[0], *chain.from_iterable(key[1])), unpack
+    raise ValueError(f"Cannot pack state keys like {sample!r} into fixed-width slots")
+
+
+class MmapHashTable:
+    """
+    Open-addressing hash table of fixed-width packed state keys (see
+    key_codec) in a memory-mapped file, for closed sets that outgrow RAM.
+
+    Each slot is a flag byte, the packed key and the packed value; a key goes
+    to slot hash(key) % capacity and collisions probe the following slots.
+    The file is an unlinked temporary file in `directory` (default: TMPDIR),
+    created on the first insert, when the key width is known, and freed when
+    the table is closed or garbage collected. Past MMAP_MAX_LOAD the table
+    moves to a file twice the size.
+
+    An LRU cache of recently used entries answers repeated lookups without
+    touching the file. The file pages are left to the kernel, which writes
+    them back and drops them under memory pressure, so the resident size
+    stays bounded however many states the table holds.
+
+    Subclasses give the value format (_value_size, _pack_value, _unpack_value)
+    and the set or mapping interface.
+    """
+
+    def __init__(self, directory: Optional[str] = None, capacity: int = MMAP_INITIAL_CAPACITY,
+                 cache_size: int = MMAP_CACHE_SIZE):
+        """
+        Args:
+            directory: Where the table file is created
+            capacity: Initial slots; sized for the expected states, it saves
+                      the rehashing of the doublings
+            cache_size: Entries of the in-RAM cache
+        """
+        self.directory = directory
+        self.capacity = max(1, capacity)
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.count = 0
+        self.cache_hits = 0
+        self.probes = 0
+        self.resizes = 0
+        self._key_size = 0
+        self._pack_key = None
+        self._unpack_key = None
+        self._slot_size = 0
+        self._file = None
+        self._map = None
+
+    def _value_size(self) -> int:
+        return 0
+
+    def _pack_value(self, value) -> bytes:
+        return b''
+
+    def _unpack_value(self, data: bytes):
+        return None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, key) -> bool:
+        return self._lookup(key) is not _MISSING
+
+    def __reduce__(self):
+        # Pickled (e.g. in a SearchCheckpoint) as a new table file filled by
+        # extend() from the slots, streamed one at a time. A slot goes as an
+        # int: the pickler memoizes tuples and bytes, so tuple keys would put
+        # the whole table in RAM on both sides.
+        if self._map is None:
+            return type(self), (self.directory, self.capacity, self.cache_size)
+        sample = next(key for key, _ in self._entries())
+        return (_unpickle_table, (type(self), self.directory, self.capacity, self.cache_size, sample), None,
+                self._rows())
+
+    def extend(self, rows) -> None:
+        """Insert slots written by __reduce__ (unpickling only)"""
+        slot_size = self._slot_size
+        key_end = 1 + self._key_size
+        for row in rows:
+            slot = row.to_bytes(slot_size, 'little')
+            offset, found = self._find(self._unpack_key(slot[1:key_end]), slot[1:key_end])
+            self._map[offset:offset + slot_size] = slot
+            if not found:
+                self.count += 1
+                if self.count > self.capacity * MMAP_MAX_LOAD:
+                    self._grow()
+
+    def _create(self, sample) -> None:
+        """Open the table file for keys shaped like `sample`"""
+        self._key_size, self._pack_key, self._unpack_key = key_codec(sample)
+        self._slot_size = 1 + self._key_size + self._value_size()
+        self._file, self._map = self._open(self.capacity)
+
+    def _open(self, capacity: int) -> Tuple[object, mmap.mmap]:
+        table_file = tempfile.TemporaryFile(prefix="closedset-", dir=self.directory)
+        table_file.truncate(capacity * self._slot_size)
+        return table_file, mmap.mmap(table_file.fileno(), capacity * self._slot_size)
+
+    def _find(self, key, packed: bytes) -> Tuple[int, bool]:
+        """(offset of the key's slot or of the empty slot it goes to, whether it is there)"""
+        table = self._map
+        slot_size = self._slot_size
+        key_end = 1 + self._key_size
+        capacity = self.capacity
+        slot = hash(key) % capacity
+        while True:
+            self.probes += 1
+            offset = slot * slot_size
+            if table[offset] == _EMPTY:
+                return offset, False
+            if table[offset + 1:offset + key_end] == packed:
+                return offset, True
+            slot += 1
+            if slot == capacity:
+                slot = 0
+
+    def _lookup(self, key):
+        """Value of a key, or _MISSING"""
+        cache = self.cache
+        if key in cache:
+            self.cache_hits += 1
+            cache.move_to_end(key)
+            return cache[key]
+        if not self.count:
+            return _MISSING
+        offset, found = self._find(key, self._pack_key(key))
+        if not found:
+            return _MISSING
+        key_end = offset + 1 + self._key_size
+        value = self._unpack_value(self._map[key_end:key_end + self._slot_size - 1 - self._key_size])
+        self._cache(key, value)
+        return value
+
+    def _store(self, key, value) -> None:
+        if self._map is None:
+            self._create(key)
+        packed = self._pack_key(key)
+        offset, found = self._find(key, packed)
+        self._map[offset:offset + self._slot_size] = bytes((_USED,)) + packed + self._pack_value(value)
+        self._cache(key, value)
+        if not found:
+            self.count += 1
+            if self.count > self.capacity * MMAP_MAX_LOAD:
+                self._grow()
+
+    def _cache(self, key, value) -> None:
+        cache = self.cache
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+    def _grow(self) -> None:
+        """Move every entry to a new file with twice the slots"""
+        old_file, old_map, old_capacity = self._file, self._map, self.capacity
+        self.capacity *= 2
+        self._file, self._map = self._open(self.capacity)
+        slot_size = self._slot_size
+        key_end = 1 + self._key_size
+        for offset in range(0, old_capacity * slot_size, slot_size):
+            if old_map[offset] != _EMPTY:
+                key = self._unpack_key(old_map[offset + 1:offset + key_end])
+                new_offset, _ = self._find(key, old_map[offset + 1:offset + key_end])
+                self._map[new_offset:new_offset + slot_size] = old_map[offset:offset + slot_size]
+        old_map.close()
+        old_file.close()
+        self.resizes += 1
+
+    def _entries(self) -> Iterator[tuple]:
+        """(key, value) of every entry, in slot order"""
+        if self._map is None:
+            return
+        table = self._map
+        slot_size = self._slot_size
+        key_end = 1 + self._key_size
+        for offset in range(0, self.capacity * slot_size, slot_size):
+            if table[offset] != _EMPTY:
+                yield (self._unpack_key(table[offset + 1:offset + key_end]),
+                       self._unpack_value(table[offset + key_end:offset + slot_size]))
+
+    def _rows(self) -> Iterator[int]:
+        """Every used slot as a little-endian int, in slot order"""
+        table = self._map
+        slot_size = self._slot_size
+        for offset in range(0, self.capacity * slot_size, slot_size):
+            if table[offset] != _EMPTY:
+                yield int.from_bytes(table[offset:offset + slot_size], 'little')
+
+    def close(self) -> None:
+        """Free the table file; the table is empty afterwards"""
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = None
+            self._file = None
+        self.cache.clear()
+        self.count = 0
+
+    def get_statistics(self) -> dict:
+        return {
+            'entries': self.count,
+            'capacity': self.capacity,
+            'file_bytes': self.capacity * self._slot_size if self._map is not None else 0,
+            'cache_hits': self.cache_hits,
+            'probes': self.probes,
+            'resizes': self.resizes
+        }
+
+
+class MmapClosedSet(MmapHashTable):
+    """Set of state keys on an MmapHashTable (the A* closed set)"""
+
+    def add(self, key) -> None:
+        if key not in self.cache:
+            self._store(key, None)
+
+    def update(self, keys) -> None:
+        for key in keys:
+            self.add(key)
+
+    def __iter__(self) -> Iterator:
+        return (key for key, _ in self._entries())
+
+
+class MmapIntDict(MmapHashTable):
+    """
+    State key -> unsigned 32-bit int on an MmapHashTable (best g of A*
+    duplicate detection, depths of iterative-deepening DFS)
+    """
+    _packer = struct.Struct("<I")
+
+    def _value_size(self) -> int:
+        return self._packer.size
+
+    def _pack_value(self, value) -> bytes:
+        return self._packer.pack(value)
+
+    def _unpack_value(self, data: bytes):
+        return self._packer.unpack(data)[0]
+
+    def get(self, key, default=None):
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def __getitem__(self, key):
+        value = self._lookup(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value) -> None:
+        self._store(key, value)
+
+    def update(self, items) -> None:
+        for key, value in (items.items() if hasattr(items, 'items') else items):
+            self._store(key, value)
+
+    def __iter__(self) -> Iterator:
+        return (key for key, _ in self._entries())
+
+    def values(self) -> Iterator:
+        return (value for _, value in self._entries())
+
+    def items(self) -> Iterator[tuple]:
+        return self._entries()
+
+
+class MmapParentTable(MmapIntDict):
+    """
+    State key -> key of the parent state (None for the start) on an
+    MmapHashTable (the plain DFS visited table). It stores keys, not states,
+    so the path is rebuilt by replaying the keys from the start.
+    """
+
+    def _value_size(self) -> int:
+        return 1 + self._key_size
+
+    def _pack_value(self, value) -> bytes:
+        if value is None:
+            return bytes(self._value_size())
+        return bytes((_USED,)) + self._pack_key(value)
+
+    def _unpack_value(self, data: bytes):
+        return self._unpack_key(data[1:]) if data[0] == _USED else None
+
+
+def _unpickle_table(table_type, directory: Optional[str], capacity: int, cache_size: int, sample) -> MmapHashTable:
+    """Empty table of a pickled one, with its file open for extend()"""
+    table = table_type(directory, capacity, cache_size)
+    table._create(sample)
+    return table
@@ -0,0 +1,265 @@
+import random
+from typing import List, Set, Tuple, Optional
+from src.dfs import State
+from src.deadlock import floor_positions, compute_live_squares
+
+# Same order and names as get_neighbors_with_actions in astar.py
+ACTIONS = [
+    (-1, 0, 'UP'),
+    (1, 0, 'DOWN'),
+    (0, -1, 'LEFT'),
+    (0, 1, 'RIGHT')
+]
+
+# Fixed seed so Zobrist keys are reproducible between runs
+ZOBRIST_SEED = 0x50C0BA4
+
+
+class CompactState:
+    """
+    Search state with the player stored as a cell index and the boxes as an
+    int bitmask over the level's flat cell array.
+    `key` is a 64-bit Zobrist hash of (player, boxes) and is what the solvers
+    store in their visited sets.
+    """
+    __slots__ = ('player', 'boxes', 'box_hash', 'key')
+
+    def __init__(self, player: int, boxes: int, box_hash: int, key: int):
+        self.player = player
+        self.boxes = boxes
+        self.box_hash = box_hash
+        self.key = key
+
+    def __eq__(self, other) -> bool:
+        """Check if two states are equal"""
+        return self.player == other.player and self.boxes == other.boxes
+
+    def __hash__(self) -> int:
+        """Hash function for state comparison"""
+        return self.key
+
+
+class CompactLevel:
+    """
+    Static level data for the compact engine.
+    Cells are indexed row-major as y * width + x, so the top-left-most cell of
+    any area is simply its lowest set bit.
+    """
+
+    def __init__(self, walls: Set[Tuple[int, int]], goals: Set[Tuple[int, int]], player: Tuple[int, int]):
+        self.walls = walls
+        self.goals = goals
+        # One padding column keeps row wrap-around out of the bit shifts below
+        self.width = max(x for x, _ in walls) + 2
+        self.height = max(y for _, y in walls) + 1
+        self.size = self.width * self.height
+        self.offsets = [dx + dy * self.width for dx, dy, _ in ACTIONS]
+
+        # Floor = every cell the player could walk on if there were no boxes
+        floor = floor_positions(walls, player)
+        self.floor = 0
+        for pos in floor:
+            self.floor |= 1 << self.index(pos)
+
+        self.goal_mask = 0
+        for goal in goals:
+            self.goal_mask |= 1 << self.index(goal)
+
+        rng = random.Random(ZOBRIST_SEED)
+        self.zobrist_box = [rng.getrandbits(64) for _ in range(self.size)]
+        self.zobrist_player = [rng.getrandbits(64) for _ in range(self.size)]
+
+        # Cells a box must never be pushed onto (one lookup per push)
+        self.dead = bytearray(self.size)
+        for pos in floor - compute_live_squares(walls, goals):
+            self.dead[self.index(pos)] = 1
+
+        # Pruning counters reported in the solver statistics
+        self.prune_counts = {'freeze_pruned': 0}
+
+    def index(self, pos: Tuple[int, int]) -> int:
+        return pos[1] * self.width + pos[0]
+
+    def position(self, index: int) -> Tuple[int, int]:
+        return (index % self.width, index // self.width)
+
+    def mask_cells(self, mask: int) -> List[int]:
+        """Indices of the set bits of a cell mask"""
+        cells = []
+        while mask:
+            low = mask & -mask
+            cells.append(low.bit_length() - 1)
+            mask ^= low
+        return cells
+
+    def make_state(self, player: int, boxes: int, box_hash: int) -> CompactState:
+        return CompactState(player, boxes, box_hash, box_hash ^ self.zobrist_player[player])
+
+    def encode(self, state: State) -> CompactState:
+        """Convert a State into a CompactState"""
+        boxes = 0
+        box_hash = 0
+        for box in state.boxes:
+            i = self.index(box)
+            boxes |= 1 << i
+            box_hash ^= self.zobrist_box[i]
+        return self.make_state(self.index(state.player), boxes, box_hash)
+
+    def decode(self, state: CompactState) -> State:
+        """Convert a CompactState back into a State"""
+        return State(self.position(state.player), [self.position(i) for i in self.mask_cells(state.boxes)])
+
+    def cell_table(self, cost_map: dict, default: float = float('inf')) -> list:
+        """Flatten a {position: cost} map into a list indexed by cell"""
+        return [cost_map.get(self.position(i), default) for i in range(self.size)]
+
+    def box_cost(self, boxes: int, table: list):
+        """Sum a per-cell cost table over every box"""
+        total = 0
+        while boxes:
+            low = boxes & -boxes
+            total += table[low.bit_length() - 1]
+            boxes ^= low
+        return total
+
+    def moved_box(self, parent_boxes: int, boxes: int) -> Optional[Tuple[int, int]]:
+        """(old, new) cell when exactly one box moved between two box masks, else None"""
+        changed = parent_boxes ^ boxes
+        old = changed & parent_boxes
+        new = changed & boxes
+        if not old or not new or old & (old - 1) or new & (new - 1):
+            return None
+        return old.bit_length() - 1, new.bit_length() - 1
+
+    def is_goal(self, state: CompactState) -> bool:
+        return state.boxes & ~self.goal_mask == 0
+
+    def reachable(self, player: int, boxes: int) -> int:
+        """Bit-parallel flood fill of the player area"""
+        free = self.floor & ~boxes
+        width = self.width
+        area = 1 << player
+        while True:
+            grown = (area | (area << 1) | (area >> 1) | (area << width) | (area >> width)) & free
+            if grown == area:
+                return area
+            area = grown
+
+    def normalize(self, state: CompactState) -> CompactState:
+        """Replace the player by the top-left-most cell of its area"""
+        area = self.reachable(state.player, state.boxes)
+        return self.make_state((area & -area).bit_length() - 1, state.boxes, state.box_hash)
+
+    def _push(self, state: CompactState, box: int, target: int) -> Tuple[int, int]:
+        """Box mask and incrementally updated Zobrist hash after one push"""
+        boxes = state.boxes ^ (1 << box) ^ (1 << target)
+        box_hash = state.box_hash ^ self.zobrist_box[box] ^ self.zobrist_box[target]
+        return boxes, box_hash
+
+    def _is_frozen(self, cell: int, boxes: int, fixed: int) -> bool:
+        """Bitmask version of deadlock._is_frozen; cells off the floor are walls"""
+        fixed |= 1 << cell
+        blocked = ~self.floor | fixed
+        for step in (1, self.width):
+            before, after = cell - step, cell + step
+            if (blocked >> before) & 1 or (blocked >> after) & 1:
+                continue
+            if self.dead[before] and self.dead[after]:
+                continue
+            if (boxes >> before) & 1 and self._is_frozen(before, boxes, fixed):
+                continue
+            if (boxes >> after) & 1 and self._is_frozen(after, boxes, fixed):
+                continue
+            return False
+        return True
+
+    def is_freeze_deadlock(self, cell: int, boxes: int) -> bool:
+        """Check the moved box and its neighbours for a box frozen off goal"""
+        for candidate in (cell, cell - 1, cell + 1, cell - self.width, cell + self.width):
+            if (boxes >> candidate) & 1 and not (self.goal_mask >> candidate) & 1:
+                if self._is_frozen(candidate, boxes, 0):
+                    self.prune_counts['freeze_pruned'] += 1
+                    return True
+        return False
+
+    def get_next_states(self, state: CompactState) -> List[Tuple[CompactState, str]]:
+        """Single player steps, equivalent to get_neighbors_with_actions"""
+        neighbors = []
+        floor = self.floor
+        for offset, (_, _, direction) in zip(self.offsets, ACTIONS):
+            nxt = state.player + offset
+            if not (floor >> nxt) & 1:
+                continue
+            if (state.boxes >> nxt) & 1:
+                target = nxt + offset
+                if not (floor >> target) & 1 or (state.boxes >> target) & 1 or self.dead[target]:
+                    continue
+                boxes, box_hash = self._push(state, nxt, target)
+                if self.is_freeze_deadlock(target, boxes):
+                    continue
+                neighbors.append((self.make_state(nxt, boxes, box_hash), direction))
+            else:
+                neighbors.append((self.make_state(nxt, state.boxes, state.box_hash), direction))
+        return neighbors
+
+    def get_push_states(self, state: CompactState) -> List[CompactState]:
+        """One box push per successor with a normalized player, like get_push_states in dfs.py"""
+        next_states = []
+        floor = self.floor
+        area = self.reachable(state.player, state.boxes)
+        for box in self.mask_cells(state.boxes):
+            for offset in self.offsets:
+                if not (area >> (box - offset)) & 1:
+                    continue
+                target = box + offset
+                if not (floor >> target) & 1 or (state.boxes >> target) & 1 or self.dead[target]:
+                    continue
+                boxes, box_hash = self._push(state, box, target)
+                if self.is_freeze_deadlock(target, boxes):
+                    continue
+                new_area = self.reachable(box, boxes)
+                player = (new_area & -new_area).bit_length() - 1
+                next_states.append(self.make_state(player, boxes, box_hash))
+        return next_states
+
+    def get_pull_states(self, state: CompactState) -> List[CompactState]:
+        """
+        Reverse of get_push_states: the player stands next to a box, steps
+        away from it and drags it one cell. Every push that leads to a state
+        is a pull leading back from it, so both searches see the same graph.
+        """
+        prev_states = []
+        floor = self.floor
+        area = self.reachable(state.player, state.boxes)
+        for box in self.mask_cells(state.boxes):
+            for offset in self.offsets:
+                target = box + offset
+                player = target + offset
+                if not (area >> target) & 1 or not (floor >> player) & 1 or (state.boxes >> player) & 1:
+                    continue
+                boxes, box_hash = self._push(state, box, target)
+                new_area = self.reachable(player, boxes)
+                prev_states.append(self.make_state((new_area & -new_area).bit_length() - 1, boxes, box_hash))
+        return prev_states
+
+    def goal_states(self) -> List[CompactState]:
+        """
+        Normalized solved positions: every box on a goal and the player in
+        any area next to a box (the last push leaves the player touching
+        the box it pushed). Needs as many boxes as goals.
+        """
+        boxes = self.goal_mask
+        box_hash = 0
+        for goal in self.mask_cells(boxes):
+            box_hash ^= self.zobrist_box[goal]
+
+        width = self.width
+        states = []
+        free = self.floor & ~boxes
+        while free:
+            area = self.reachable((free & -free).bit_length() - 1, boxes)
+            free &= ~area
+            touching = (area << 1) | (area >> 1) | (area << width) | (area >> width)
+            if touching & boxes:
+                states.append(self.make_state((area & -area).bit_length() - 1, boxes, box_hash))
+        return states
@@ -0,0 +1,172 @@
+from collections import OrderedDict, deque
+from typing import List, Set, Tuple
+from src.dfs import State
+from src.compact import CompactLevel, CompactState
+
+# Maximum number of push states explored when trying to prove a corral deadlock
+CORRAL_NODE_LIMIT = 2000
+
+# Corrals remembered as not proven (bounded LRU)
+CORRAL_CACHE_SIZE = 100000
+
+# Proven deadlock patterns kept for matching; later proofs are not stored
+CORRAL_PATTERN_LIMIT = 10000
+
+
+class CorralPruner:
+    """
+    Corral deadlock detection for the A* driver.
+
+    A corral is an area the player cannot reach because it is fenced off by
+    boxes. For PI-corrals (every fence box can be reached by the player and
+    every push the player can make on them goes into the corral) a small
+    bounded push search is run on the fence boxes alone. If that search can
+    neither put those boxes on goals nor open the corral, the position is a
+    deadlock.
+
+    A proof holds for every state that has the fence boxes, whatever its
+    other boxes, with the player in the same area of the fence-only board:
+    more boxes only make pushing harder. Proven (fence, area) patterns are
+    matched against a state's box mask before any corral analysis, with a
+    few bit operations per pattern. They are indexed by their lowest fence
+    cell, so only patterns whose first box is present are tested. Corrals
+    that could not be proven are remembered by (fence, area cell) in a
+    bounded LRU, so they are not searched again.
+
+    The analysis runs on the bitmask representation of the compact engine.
+    The pruner keeps its own CompactLevel so that its sub-searches do not
+    touch the solver's pruning counters; CompactStates built by another
+    CompactLevel for the same level share the same cell indices.
+    """
+
+    def __init__(self, walls: Set[Tuple[int, int]], goals: Set[Tuple[int, int]],
+                 player: Tuple[int, int], node_limit: int = CORRAL_NODE_LIMIT):
+        self.level = CompactLevel(walls, goals, player)
+        self.node_limit = node_limit
+        # (fence, player area cell) of corrals the search could not prove
+        self.cache = OrderedDict()
+        self.cache_size = CORRAL_CACHE_SIZE
+        # Lowest fence cell -> [(fence mask, player area mask)] of proven deadlocks
+        self.patterns = {}
+        self.pattern_count = 0
+        self.deadlocks_proven = 0
+        self.pattern_hits = 0
+
+    def _grow(self, mask: int) -> int:
+        """Mask plus its four neighbours of every cell"""
+        width = self.level.width
+        return mask | (mask << 1) | (mask >> 1) | (mask << width) | (mask >> width)
+
+    def find_pi_corrals(self, player: int, boxes: int) -> List[Tuple[int, int]]:
+        """Return (corral cells, fence boxes) masks for every PI-corral of a position"""
+        level = self.level
+        reachable = level.reachable(player, boxes)
+        unreached = level.floor & ~reachable & ~boxes
+        corrals = []
+
+        while unreached:
+            # Connected component of unreachable cells
+            cells = unreached & -unreached
+            while True:
+                grown = self._grow(cells) & unreached
+                if grown == cells:
+                    break
+                cells = grown
+            unreached &= ~cells
+
+            fence = self._grow(cells) & boxes
+            if self._is_pi_corral(cells, fence, reachable, boxes):
+                corrals.append((cells, fence))
+
+        return corrals
+
+    def _is_pi_corral(self, cells: int, fence: int, reachable: int, boxes: int) -> bool:
+        level = self.level
+        if fence & ~level.goal_mask == 0:
+            return False
+
+        for box in level.mask_cells(fence):
+            touched = False
+            for offset in level.offsets:
+                if not (reachable >> (box - offset)) & 1:
+                    continue
+                touched = True
+                target = box + offset
+                if not (level.floor >> target) & 1 or (boxes >> target) & 1:
+                    continue
+                # I-condition: every possible push must go into the corral
+                if not (cells >> target) & 1:
+                    return False
+            # P-condition: the player can reach every fence box
+            if not touched:
+                return False
+        return True
+
+    def is_deadlock(self, state: State) -> bool:
+        """Check every PI-corral of a State; proven deadlocks are cached"""
+        return self.is_compact_deadlock(self.level.encode(state))
+
+    def is_compact_deadlock(self, state: CompactState) -> bool:
+        """Check a CompactState against the proven patterns, then its PI-corrals"""
+        if self.patterns and self._matches_pattern(state.player, state.boxes):
+            self.pattern_hits += 1
+            return True
+        level = self.level
+        cache = self.cache
+        for cells, fence in self.find_pi_corrals(state.player, state.boxes):
+            area = level.reachable(state.player, fence)
+            key = (fence, (area & -area).bit_length() - 1)
+            if key in cache:
+                cache.move_to_end(key)
+                continue
+            if self._prove_deadlock(key[1], fence, cells):
+                self.deadlocks_proven += 1
+                self._add_pattern(fence, area)
+                return True
+            cache[key] = False
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        return False
+
+    def _matches_pattern(self, player: int, boxes: int) -> bool:
+        """Whether the boxes contain a proven fence with the player in its area"""
+        for cell, entries in self.patterns.items():
+            if (boxes >> cell) & 1:
+                for fence, area in entries:
+                    if boxes & fence == fence and (area >> player) & 1:
+                        return True
+        return False
+
+    def _add_pattern(self, fence: int, area: int) -> None:
+        if self.pattern_count < CORRAL_PATTERN_LIMIT:
+            self.patterns.setdefault((fence & -fence).bit_length() - 1, []).append((fence, area))
+            self.pattern_count += 1
+
+    def _prove_deadlock(self, player: int, fence: int, cells: int) -> bool:
+        """
+        Bounded push search with only the fence boxes on the board.
+        Removing the other boxes only makes pushing easier, so if the fence
+        boxes can never all reach goals here they cannot in the full level.
+        Reaching a corral cell means the corral opened, which gives up.
+        """
+        level = self.level
+        box_hash = 0
+        for box in level.mask_cells(fence):
+            box_hash ^= level.zobrist_box[box]
+        start = level.make_state(player, fence, box_hash)
+
+        queue = deque([start])
+        visited = {start.key}
+        while queue:
+            state = queue.popleft()
+            if level.is_goal(state):
+                return False
+            if level.reachable(state.player, state.boxes) & cells:
+                return False
+            for next_state in level.get_push_states(state):
+                if next_state.key not in visited:
+                    if len(visited) >= self.node_limit:
+                        return False
+                    visited.add(next_state.key)
+                    queue.append(next_state)
+        return True
@@ -0,0 +1,109 @@
+from collections import deque
+from typing import Optional, Set, Tuple
+
+# Movement directions: up, down, left, right (same as dfs.DIRECTIONS)
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+
+def floor_positions(walls: Set[Tuple[int, int]], player: Tuple[int, int]) -> Set[Tuple[int, int]]:
+    """Every cell the player could walk on if the level had no boxes"""
+    floor = {player}
+    queue = deque([player])
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in DIRECTIONS:
+            pos = (x + dx, y + dy)
+            if pos not in floor and pos not in walls:
+                floor.add(pos)
+                queue.append(pos)
+    return floor
+
+
+def compute_live_squares(walls: Set[Tuple[int, int]], goals: Set[Tuple[int, int]]) -> Set[Tuple[int, int]]:
+    """
+    Reverse pull-BFS from every goal.
+    A box on cell c can be pulled to c + d when the player has room at c + d
+    and c + 2d; every cell reached this way can push a lone box onto a goal.
+    """
+    live = set(goals)
+    queue = deque(goals)
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in DIRECTIONS:
+            box = (x + dx, y + dy)
+            player = (x + 2 * dx, y + 2 * dy)
+            if box in live or box in walls or player in walls:
+                continue
+            live.add(box)
+            queue.append(box)
+    return live
+
+
+def pull_distances(walls: Set[Tuple[int, int]], goal: Tuple[int, int]) -> dict:
+    """
+    Pull-BFS from one goal: the minimum number of pushes needed to bring a
+    lone box from each cell onto that goal. Cells missing from the result
+    can never reach it.
+    """
+    distances = {goal: 0}
+    queue = deque([goal])
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in DIRECTIONS:
+            box = (x + dx, y + dy)
+            player = (x + 2 * dx, y + 2 * dy)
+            if box in distances or box in walls or player in walls:
+                continue
+            distances[box] = distances[(x, y)] + 1
+            queue.append(box)
+    return distances
+
+
+def compute_dead_squares(walls: Set[Tuple[int, int]], goals: Set[Tuple[int, int]],
+                         player: Tuple[int, int]) -> Set[Tuple[int, int]]:
+    """
+    Floor cells from which no goal can ever be reached by pushing.
+    Computed once per level; covers corners as well as dead wall edges.
+    """
+    return floor_positions(walls, player) - compute_live_squares(walls, goals)
+
+
+def _is_frozen(box: Tuple[int, int], boxes, walls: Set[Tuple[int, int]],
+               dead_squares: Optional[Set[Tuple[int, int]]], fixed: frozenset) -> bool:
+    """
+    A box is frozen when it is blocked on both axes. An axis is blocked by a
+    wall on either side, by dead squares on both sides, or by a neighbouring
+    box that is itself frozen. Boxes already on the recursion path count as
+    walls, which is what lets mutually blocking groups (2x2 blocks, pairs
+    along a wall) be detected.
+    """
+    fixed = fixed | {box}
+    x, y = box
+    for dx, dy in ((1, 0), (0, 1)):
+        before = (x - dx, y - dy)
+        after = (x + dx, y + dy)
+        if before in walls or after in walls or before in fixed or after in fixed:
+            continue
+        if dead_squares is not None and before in dead_squares and after in dead_squares:
+            continue
+        if before in boxes and _is_frozen(before, boxes, walls, dead_squares, fixed):
+            continue
+        if after in boxes and _is_frozen(after, boxes, walls, dead_squares, fixed):
+            continue
+        return False
+    return True
+
+
+def is_freeze_deadlock(box: Tuple[int, int], boxes, walls: Set[Tuple[int, int]], goals: Set[Tuple[int, int]],
+                       dead_squares: Optional[Set[Tuple[int, int]]] = None) -> bool:
+    """
+    Check whether the push that just moved a box to `box` froze any box off
+    goal. Only the moved box and its direct neighbours are examined.
+    """
+    x, y = box
+    candidates = [box] + [(x + dx, y + dy) for dx, dy in DIRECTIONS]
+    for candidate in candidates:
+        if candidate in boxes and candidate not in goals:
+            if _is_frozen(candidate, boxes, walls, dead_squares, frozenset()):
+                return True
+    return False
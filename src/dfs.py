@@ -1,7 +1,23 @@
-from typing import List, Set, Tuple, Optional
+from typing import TYPE_CHECKING, Callable, List, Set, Tuple, Optional
+from collections import deque
+from src.deadlock import compute_dead_squares, is_freeze_deadlock
+from src.distances import PushDistances
+from src.metrics import PhaseTimer
+from src.profiling import HotPathProfiler
+from src.budget import SearchBudget, SearchCheckpoint
+from src.closedset import CLOSED_SETS, MmapHashTable, MmapIntDict, MmapParentTable
+
+if TYPE_CHECKING:
+    from src.moves import Solution
 
 # Movement directions: up, down, left, right
 DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+# Expansions between two progress reports of a solver
+PROGRESS_INTERVAL = 1000
+
+# Deepest limit tried by iterative-deepening DFS (moves, or pushes at push level)
+DFS_MAX_DEPTH = 500
 class State:
     def __init__(self, player: Tuple[int, int], boxes: List[Tuple[int, int]]):
         self.player = player
@@ -15,8 +31,16 @@ class State:
         """Hash function for state comparison"""
         return hash((self.player, self.boxes))
 
-def get_next_states(state: State, walls: Set[Tuple[int, int]], goals: Set[Tuple[int, int]]) -> List[State]:
-    """Generate all possible next states from current state"""
+def get_next_states(state: State, walls: Set[Tuple[int, int]], goals: Set[Tuple[int, int]],
+                    dead_squares: Optional[Set[Tuple[int, int]]] = None,
+                    prune_counts: Optional[dict] = None) -> List[State]:
+    """
+    Generate all possible next states from current state
+    dead_squares: precomputed table from compute_dead_squares; falls back to
+                  the per-push corner check when not given
+    prune_counts: optional dict; 'freeze_pruned' counts pushes rejected by
+                  the freeze deadlock check
+    """
     next_states = []
     px, py = state.player
 
@@ -34,12 +58,19 @@ def get_next_states(state: State, walls: Set[Tuple[int, int]], goals: Set[Tuple[
             if (bx, by) in walls or (bx, by) in state.boxes:
                 continue
             # Check for deadlock
-            if is_deadlock((bx, by), walls, goals):
+            if dead_squares is not None:
+                if (bx, by) in dead_squares:
+                    continue
+            elif is_deadlock((bx, by), walls, goals):
                 continue
             # Create new state with pushed box
             new_boxes = set(state.boxes)
             new_boxes.remove((nx, ny))
             new_boxes.add((bx, by))
+            if is_freeze_deadlock((bx, by), new_boxes, walls, goals, dead_squares):
+                if prune_counts is not None:
+                    prune_counts['freeze_pruned'] = prune_counts.get('freeze_pruned', 0) + 1
+                continue
             next_states.append(State((nx, ny), new_boxes))
         else:
             # Simple move without pushing
@@ -47,6 +78,107 @@ def get_next_states(state: State, walls: Set[Tuple[int, int]], goals: Set[Tuple[
 
     return next_states
 
+def reachable_positions(player: Tuple[int, int], boxes, walls: Set[Tuple[int, int]]) -> Set[Tuple[int, int]]:
+    """Flood fill of every cell the player can walk to without pushing a box"""
+    reachable = {player}
+    queue = deque([player])
+    while queue:
+        px, py = queue.popleft()
+        for dx, dy in DIRECTIONS:
+            pos = (px + dx, py + dy)
+            if pos in reachable or pos in walls or pos in boxes:
+                continue
+            reachable.add(pos)
+            queue.append(pos)
+    return reachable
+
+def canonical_position(positions) -> Tuple[int, int]:
+    """Top-left-most cell of a player area (smallest row, then smallest column)"""
+    return min(positions, key=lambda pos: (pos[1], pos[0]))
+
+def normalize_state(state: State, walls: Set[Tuple[int, int]]) -> State:
+    """Replace the player position by the canonical cell of its reachable area"""
+    reachable = reachable_positions(state.player, state.boxes, walls)
+    return State(canonical_position(reachable), state.boxes)
+
+def get_push_states(state: State, walls: Set[Tuple[int, int]], goals: Set[Tuple[int, int]],
+                    dead_squares: Optional[Set[Tuple[int, int]]] = None,
+                    prune_counts: Optional[dict] = None) -> List[State]:
+    """
+    Generate all states reachable with exactly one box push.
+    The player may walk anywhere in its area before pushing, so every
+    returned state has its player position normalized.
+    Deadlock pruning is the same as in get_next_states.
+    """
+    next_states = []
+    reachable = reachable_positions(state.player, state.boxes, walls)
+
+    for bx, by in state.boxes:
+        for dx, dy in DIRECTIONS:
+            # Player must stand behind the box to push it
+            if (bx - dx, by - dy) not in reachable:
+                continue
+            nx, ny = bx + dx, by + dy
+            if (nx, ny) in walls or (nx, ny) in state.boxes:
+                continue
+            if dead_squares is not None:
+                if (nx, ny) in dead_squares:
+                    continue
+            elif is_deadlock((nx, ny), walls, goals):
+                continue
+            new_boxes = set(state.boxes)
+            new_boxes.remove((bx, by))
+            new_boxes.add((nx, ny))
+            if is_freeze_deadlock((nx, ny), new_boxes, walls, goals, dead_squares):
+                if prune_counts is not None:
+                    prune_counts['freeze_pruned'] = prune_counts.get('freeze_pruned', 0) + 1
+                continue
+            area = reachable_positions((bx, by), new_boxes, walls)
+            next_states.append(State(canonical_position(area), new_boxes))
+
+    return next_states
+
+def walk_path(start: Tuple[int, int], target: Tuple[int, int], boxes, walls: Set[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Shortest walk from start to target (excluding start) that does not touch any box"""
+    parents = {start: None}
+    queue = deque([start])
+    while queue:
+        pos = queue.popleft()
+        if pos == target:
+            break
+        for dx, dy in DIRECTIONS:
+            nxt = (pos[0] + dx, pos[1] + dy)
+            if nxt in parents or nxt in walls or nxt in boxes:
+                continue
+            parents[nxt] = pos
+            queue.append(nxt)
+
+    path = []
+    pos = target
+    while pos != start:
+        path.append(pos)
+        pos = parents[pos]
+    path.reverse()
+    return path
+
+def expand_push_path(start_state: State, push_path: List[State], walls: Set[Tuple[int, int]]) -> List[State]:
+    """
+    Rebuild the step-by-step State path from a push-level solution.
+    Each consecutive pair of push states differs in exactly one box; the
+    player walks behind that box and pushes it once.
+    """
+    path = [start_state]
+    player = start_state.player
+    for prev, nxt in zip(push_path, push_path[1:]):
+        (bx, by), = prev.boxes - nxt.boxes
+        (nx, ny), = nxt.boxes - prev.boxes
+        dx, dy = nx - bx, ny - by
+        for pos in walk_path(player, (bx - dx, by - dy), prev.boxes, walls):
+            path.append(State(pos, prev.boxes))
+        player = (bx, by)
+        path.append(State(player, nxt.boxes))
+    return path
+
 def is_goal(state: State, goals: Set[Tuple[int, int]]) -> bool:
     """Check if all boxes are on goal positions"""
     return all(box in goals for box in state.boxes)
@@ -75,49 +207,422 @@ def is_deadlock(box_pos: Tuple[int, int], walls: Set[Tuple[int, int]],
     return False
         
 class DFS:
-    """Depth-First Search algorithm with node tracking"""
+    """
+    Depth-First Search algorithm with node tracking.
+
+    The visited table maps each state key to the parent state it was first
+    generated from, so a node costs one table entry and the path is only
+    built once, from the goal back to the start.
+
+    With iterative_deepening the search is repeated with a depth limit of
+    1, 2, ... up to max_depth (moves, or pushes with push_level), which
+    returns a shortest solution. Each pass keeps the smallest depth every
+    state was reached at and skips states reached again no shallower, and
+    children are tried pushes first, by the pushed box's distance to the
+    nearest goal, then walks by the player's distance to the nearest box
+    that is not on a goal.
+    """
     
     def __init__(self, start_state: State, walls: Set[Tuple[int, int]], 
-                 goals: Set[Tuple[int, int]]):
-        """Initialize DFS solver"""
+                 goals: Set[Tuple[int, int]], push_level: bool = False, compact: bool = False,
+                 progress: Optional[Callable[[dict], None]] = None,
+                 iterative_deepening: bool = False, max_depth: int = DFS_MAX_DEPTH,
+                 move_ordering: Optional[bool] = None, profiler: Optional[HotPathProfiler] = None,
+                 budget: Optional[SearchBudget] = None, closed_set: str = 'memory'):
+        """
+        Initialize DFS solver
+
+        Args:
+            push_level: Search over box pushes with a normalized player position
+                        instead of single player steps
+            compact: Search over CompactState (bitmask boxes, Zobrist keys in
+                     the visited set) instead of State
+            progress: Called every PROGRESS_INTERVAL expansions with the node
+                      counters and the stack ('open_size') and visited
+                      ('closed_size') sizes
+            iterative_deepening: Depth-limited passes with a growing limit
+            max_depth: Last depth limit tried by iterative deepening
+            move_ordering: Sort children as described above (default: on
+                           with iterative deepening only)
+            profiler: Counts and samples the time of the successor (with
+                      move ordering), goal test and state key functions
+            budget: Node, time and memory limits; when one is hit, solve()
+                    returns None with the search kept for checkpoint()
+            closed_set: 'memory' (dict) or 'mmap': the visited table (or the
+                        depths of iterative deepening) in a memory-mapped
+                        file (see MmapHashTable). It links state keys to
+                        parent keys, and the path is rebuilt by replaying
+                        them from the start.
+        """
+        if closed_set not in CLOSED_SETS:
+            raise ValueError(f"Unknown closed set '{closed_set}' (expected one of {', '.join(CLOSED_SETS)})")
         self.start_state = start_state
         self.walls = walls
         self.goals = goals
+        self.push_level = push_level
+        self.compact = compact
         self.nodes_explored = 0
         self.nodes_expanded = 0
         self.nodes_generated = 1  # Count initial state
+        self.prune_counts = {'freeze_pruned': 0}
+        self.progress = progress
+        self.iterative_deepening = iterative_deepening
+        self.max_depth = max_depth
+        self.move_ordering = iterative_deepening if move_ordering is None else move_ordering
+        self.iterations = 0
+        self.peak_open_size = 0
+        self.peak_closed_size = 0
+        self.timer = PhaseTimer()
+        self.profiler = profiler
+        self.budget = budget
+        self.closed_set = closed_set
+        # Visited table (or depths) of the last search, for its statistics
+        self.closed = None
+        self.stop_reason = None
+        self.best_frontier = None
+        # Plain search: (stack, parents); iterative deepening:
+        # (current path, depth limit, remaining children per path state, depths, cut off)
+        self.frontier = None
     
-    def solve(self) -> Optional[List[State]]:
-        stack = [(self.start_state, [self.start_state])]
-        visited = set([self.start_state])
+    def solve(self) -> Optional['Solution']:
+        # Imported here because compact.py and moves.py build on this module
+        from src.moves import Solution, path_to_moves, push_path_to_moves
+        self.timer.start('precompute')
+        position = None
+        order = None
+        goal_distance = PushDistances(self.walls, self.goals, self.start_state.player).nearest_map() if self.move_ordering else None
+        if self.compact:
+            from src.compact import CompactLevel
+            level = CompactLevel(self.walls, self.goals, self.start_state.player)
+            level.prune_counts.update(self.prune_counts)  # Counts of a restored checkpoint
+            self.prune_counts = level.prune_counts
+            start = level.encode(self.start_state)
+            if self.push_level:
+                start = level.normalize(start)
+                expand = level.get_push_states
+            else:
+                expand = lambda state: [next_state for next_state, _ in level.get_next_states(state)]
+            goal_test, key = level.is_goal, lambda state: state.key
+            position = lambda state: level.position(state.player)
+            off_goal = lambda state: bin(state.boxes & ~level.goal_mask).count('1')
+            if self.move_ordering:
+                box_cost = level.cell_table(goal_distance)
+                order = lambda parent, child: self._order_key(
+                    parent, child, position,
+                    lambda parent, child: box_cost[(child.boxes & ~parent.boxes).bit_length() - 1],
+                    lambda boxes: [level.position(i) for i in level.mask_cells(boxes & ~level.goal_mask)])
+        else:
+            start = self.start_state
+            dead_squares = compute_dead_squares(self.walls, self.goals, start.player)
+            if self.push_level:
+                start = normalize_state(start, self.walls)
+                expand = lambda state: get_push_states(state, self.walls, self.goals, dead_squares, self.prune_counts)
+            else:
+                expand = lambda state: get_next_states(state, self.walls, self.goals, dead_squares, self.prune_counts)
+            goal_test, key = lambda state: is_goal(state, self.goals), lambda state: state
+            if self.closed_set == 'mmap':
+                key = lambda state: (state.player, tuple(sorted(state.boxes)))  # Packs into fixed-width slots
+            off_goal = lambda state: sum(box not in self.goals for box in state.boxes)
+            if self.move_ordering:
+                order = lambda parent, child: self._order_key(
+                    parent, child, lambda state: state.player,
+                    lambda parent, child: goal_distance.get(next(iter(child.boxes - parent.boxes)), float('inf')),
+                    lambda boxes: [box for box in boxes if box not in self.goals])
+        if order:
+            unordered = expand
+            # The plain search pops the last child first, so it gets them in reverse
+            reverse = not self.iterative_deepening
+            expand = lambda state: sorted(unordered(state), key=lambda child: order(state, child), reverse=reverse)
+
+        if self.profiler:
+            expand = self.profiler.wrap('expand', expand)
+            goal_test = self.profiler.wrap('is_goal', goal_test)
+            key = self.profiler.wrap('state_key', key)
+
+        def to_moves(path: list) -> str:
+            if self.push_level:
+                if self.compact:
+                    path = [level.decode(state) for state in path]
+                return push_path_to_moves(self.start_state, path, self.walls)
+            return path_to_moves(path, position)
+
+        self.timer.start('search')
+        if self.iterative_deepening:
+            path = self._deepening_search(start, expand, goal_test, key)
+        else:
+            path = self._search(start, expand, goal_test, key)
+            if path is not None:
+                path = self._path_to(path[-1], self.closed, key, start, expand)
+
+        if path is None:
+            if self.stop_reason:
+                # Stopped by the budget: the frontier state with the fewest boxes off their goals
+                best_path = self._best_frontier_path(off_goal, key, start, expand)
+                self.best_frontier = {'g': len(best_path) - 1, 'h': off_goal(best_path[-1]), 'moves': to_moves(best_path)}
+            self.timer.stop()
+            return None
+        self.timer.start('reconstruct')
+        moves = to_moves(path)
+        self.timer.stop()
+        return Solution(self.start_state, moves)
+
+    def _best_frontier_path(self, off_goal, key, start, expand) -> list:
+        if self.iterative_deepening:
+            path = self.frontier[0]
+            best = min(range(len(path)), key=lambda i: off_goal(path[i]))
+            return path[:best + 1]
+        stack, parents = self.frontier
+        return self._path_to(min(stack, key=off_goal), parents, key, start, expand)
+
+    def _path_to(self, state, parents, key, start, expand) -> list:
+        """States from the start to a visited state, following the visited table"""
+        if not isinstance(parents, MmapParentTable):
+            path = [state]
+            parent = parents[key(state)]
+            while parent is not None:
+                path.append(parent)
+                parent = parents[key(parent)]
+            path.reverse()
+            return path
+        # The disk table links keys: replay them from the start to get the states
+        keys = [key(state)]
+        parent = parents[keys[-1]]
+        while parent is not None:
+            keys.append(parent)
+            parent = parents[parent]
+        keys.reverse()
+        prune_counts = dict(self.prune_counts)
+        path = [start]
+        for next_key in keys[1:]:
+            path.append(next(child for child in expand(path[-1]) if key(child) == next_key))
+        self.prune_counts.update(prune_counts)  # The replay is not part of the search
+        return path
+
+    def _new_table(self, table_type, entries):
+        """A dict, or a table_type file with closed_set='mmap', holding the given entries"""
+        if self.closed_set == 'mmap':
+            table = table_type()
+            table.update(entries)
+            return table
+        return dict(entries)
+
+    def _stop(self, reason: str, frontier: tuple) -> None:
+        self.frontier = frontier
+        self.stop_reason = reason
+        self.budget.stop(reason, self)
+
+    def checkpoint(self) -> SearchCheckpoint:
+        """Snapshot of a search stopped by its budget (the parents table is shared with it)"""
+        counters = {
+            'nodes_explored': self.nodes_explored,
+            'nodes_expanded': self.nodes_expanded,
+            'nodes_generated': self.nodes_generated,
+            'iterations': self.iterations,
+            'peak_open_size': self.peak_open_size,
+            'peak_closed_size': self.peak_closed_size,
+            'prune_counts': dict(self.prune_counts)
+        }
+        if self.iterative_deepening:
+            path, limit, children, depths, cut_off = self.frontier
+            data = {'path': path, 'limit': limit, 'children': children, 'depths': depths, 'cut_off': cut_off,
+                    'closed_set': self.closed_set}
+            return SearchCheckpoint('dfs_id', counters, data)
+        stack, parents = self.frontier
+        return SearchCheckpoint('dfs', counters, {'stack': list(stack), 'parents': parents, 'closed_set': self.closed_set})
+
+    def restore(self, checkpoint: SearchCheckpoint) -> None:
+        """Load a checkpoint of the same level and settings; the next solve() continues it"""
+        engine = 'dfs_id' if self.iterative_deepening else 'dfs'
+        if checkpoint.engine != engine:
+            raise ValueError(f"Cannot resume {engine} from a '{checkpoint.engine}' checkpoint")
+        if checkpoint.data.get('closed_set', 'memory') != self.closed_set:
+            # The disk tables key states differently and link parents by key
+            raise ValueError(f"Cannot resume a '{self.closed_set}' closed set search from a "
+                             f"'{checkpoint.data.get('closed_set', 'memory')}' checkpoint")
+        counters = dict(checkpoint.counters)
+        self.prune_counts.update(counters.pop('prune_counts'))
+        for name, value in counters.items():
+            setattr(self, name, value)
+        if self.iterative_deepening:
+            data = checkpoint.data
+            self.frontier = (list(data['path']), data['limit'], [list(remaining) for remaining in data['children']],
+                             self._new_table(MmapIntDict, data['depths']), data['cut_off'])
+        else:
+            self.frontier = (list(checkpoint.data['stack']), self._new_table(MmapParentTable, checkpoint.data['parents']))
+
+    @staticmethod
+    def _order_key(parent, child, position, pushed_cost, boxes_off_goal) -> tuple:
+        """
+        Sort key of a child: (0, goal distance of the pushed box) for a push,
+        (1, player distance to the nearest box off its goal) for a walk.
+        The callbacks hide the state representation (State or CompactState).
+        """
+        if child.boxes != parent.boxes:
+            return (0, pushed_cost(parent, child))
+        px, py = position(child)
+        return (1, min((abs(bx - px) + abs(by - py) for bx, by in boxes_off_goal(child.boxes)), default=0))
+
+    def _report_progress(self, open_size: int, closed_size: int) -> None:
+        self.progress({'nodes_explored': self.nodes_explored, 'nodes_expanded': self.nodes_expanded,
+                       'nodes_generated': self.nodes_generated, 'open_size': open_size, 'closed_size': closed_size})
+
+    def _search(self, start, expand, goal_test, key) -> Optional[list]:
+        if self.frontier is not None:
+            stack, parents = self.frontier
+            self.frontier = None
+        else:
+            stack = [start]
+            # key -> parent state (parent key on disk; None for the start)
+            parents = self._new_table(MmapParentTable, {key(start): None})
+        self.closed = parents
+        link = (lambda state: key(state)) if isinstance(parents, MmapParentTable) else (lambda state: state)
+        self.stop_reason = None
+        budget = self.budget
+        if budget:
+            budget.start()
+            budget_due = budget.next_check(self.nodes_expanded)
 
         while stack:
-            state, path = stack.pop()
+            if budget and self.nodes_expanded >= budget_due:
+                reason = budget.check(self.nodes_expanded)
+                if reason:
+                    self.peak_closed_size = len(parents)
+                    self._stop(reason, (stack, parents))
+                    return None
+                budget_due = budget.next_check(self.nodes_expanded)
+            if len(stack) > self.peak_open_size:
+                self.peak_open_size = len(stack)
+            state = stack.pop()
             self.nodes_explored += 1
             
-            if is_goal(state, self.goals):
-                return path
+            if goal_test(state):
+                self.peak_closed_size = len(parents)
+                return [state]  # solve() rebuilds the path through the visited table
 
             # Generate neighbors
-            neighbors = get_next_states(state, self.walls, self.goals)
+            neighbors = expand(state)
             self.nodes_expanded += 1  # Count as expanded
+            if self.progress and self.nodes_expanded % PROGRESS_INTERVAL == 0:
+                self._report_progress(len(stack), len(parents))
             
+            parent = link(state)
             for next_state in neighbors:
-                if next_state not in visited:
-                    visited.add(next_state)
+                next_key = key(next_state)
+                if next_key not in parents:
+                    parents[next_key] = parent
                     self.nodes_generated += 1
-                    stack.append((next_state, path + [next_state]))
+                    stack.append(next_state)
+        self.peak_closed_size = len(parents)
+        return None
+
+    def _deepening_search(self, start, expand, goal_test, key) -> Optional[list]:
+        resume = self.frontier
+        self.frontier = None
+        if resume is None:
+            self.nodes_explored += 1
+            if goal_test(start):
+                return [start]
+        self.stop_reason = None
+        budget = self.budget
+        if budget:
+            budget.start()
+            budget_due = budget.next_check(self.nodes_expanded)
+
+        for limit in range(resume[1] if resume else 1, self.max_depth + 1):
+            if resume:
+                # Continue the interrupted pass
+                path, _, remaining, depths, cut_off = resume
+                children = [iter(states) for states in remaining]
+                resume = None
+            else:
+                self.iterations += 1
+                # key -> smallest depth reached in this pass
+                depths = self._new_table(MmapIntDict, {key(start): 0})
+                # The states of the current path and their remaining children
+                path = [start]
+                children = [iter(expand(start))]
+                self.nodes_expanded += 1
+                cut_off = False
+            self.closed = depths
+
+            while children:
+                if budget and self.nodes_expanded >= budget_due:
+                    reason = budget.check(self.nodes_expanded)
+                    if reason:
+                        self._stop(reason, (path, limit, [list(states) for states in children], depths, cut_off))
+                        return None
+                    budget_due = budget.next_check(self.nodes_expanded)
+                next_state = next(children[-1], None)
+                if next_state is None:
+                    children.pop()
+                    path.pop()
+                    continue
+                depth = len(path)
+                next_key = key(next_state)
+                if depths.get(next_key, depth + 1) <= depth:
+                    continue
+                depths[next_key] = depth
+                if len(depths) > self.peak_closed_size:
+                    self.peak_closed_size = len(depths)
+                self.nodes_generated += 1
+                self.nodes_explored += 1
+                if goal_test(next_state):
+                    return path + [next_state]
+                if depth == limit:
+                    cut_off = True
+                    continue
+                path.append(next_state)
+                children.append(iter(expand(next_state)))
+                if len(path) > self.peak_open_size:
+                    self.peak_open_size = len(path)
+                self.nodes_expanded += 1
+                if self.progress and self.nodes_expanded % PROGRESS_INTERVAL == 0:
+                    self._report_progress(len(path), len(depths))
+
+            if not cut_off:
+                return None  # Every reachable state was searched
         return None
     
     def get_statistics(self) -> dict:
-        return {
+        stats = {
             'nodes_explored': self.nodes_explored,
             'nodes_expanded': self.nodes_expanded,
-            'nodes_generated': self.nodes_generated
+            'nodes_generated': self.nodes_generated,
+            'peak_open_size': self.peak_open_size,
+            'peak_closed_size': self.peak_closed_size,
+            'phases': self.timer.phases,
+            **self.prune_counts
         }
+        if self.iterative_deepening:
+            stats['iterations'] = self.iterations
+        if isinstance(self.closed, MmapHashTable):
+            stats['closed_set'] = self.closed.get_statistics()
+        if self.stop_reason:
+            stats['budget_exhausted'] = self.stop_reason
+            stats['best_frontier'] = self.best_frontier
+        if self.profiler:
+            stats['profile'] = self.profiler.get_statistics()
+        return stats
 
 def dfs_solver(start_state: State, walls: Set[Tuple[int, int]], 
-               goals: Set[Tuple[int, int]]) -> Tuple[Optional[List[State]], Optional[dict]]:
-    dfs_algorithm = DFS(start_state, walls, goals)
-    path = dfs_algorithm.solve()
-    return path, dfs_algorithm.get_statistics()
\ No newline at end of file
+               goals: Set[Tuple[int, int]], push_level: bool = False,
+               compact: bool = False, progress: Optional[Callable[[dict], None]] = None,
+               iterative_deepening: bool = False, max_depth: int = DFS_MAX_DEPTH,
+               profiler: Optional[HotPathProfiler] = None, budget: Optional[SearchBudget] = None,
+               resume: Optional[SearchCheckpoint] = None,
+               closed_set: str = 'memory') -> Tuple[Optional['Solution'], Optional[dict]]:
+    """
+    Args:
+        budget: Node, time and memory limits (see SearchBudget); a stopped
+                run reports 'budget_exhausted' and 'best_frontier' (g, boxes
+                off their goals as h, and moves of the best state on the stack)
+        resume: SearchCheckpoint of an earlier run with the same settings
+        (other arguments as in DFS)
+    """
+    dfs_algorithm = DFS(start_state, walls, goals, push_level=push_level, compact=compact, progress=progress,
+                        iterative_deepening=iterative_deepening, max_depth=max_depth, profiler=profiler,
+                        budget=budget, closed_set=closed_set)
+    if resume:
+        dfs_algorithm.restore(resume)
+    solution = dfs_algorithm.solve()
+    return solution, dfs_algorithm.get_statistics()
\ No newline at end of file
@@ -0,0 +1,53 @@
+from array import array
+from typing import List, Set, Tuple
+from src.deadlock import floor_positions, pull_distances
+
+# Sentinel stored in the matrix for cells from which a goal cannot be reached
+UNREACHABLE = 0xFFFF
+
+
+class PushDistances:
+    """
+    Goals x cells matrix of push distances, built once per level.
+
+    Row g holds, for every floor cell, the minimum number of pushes that
+    bring a lone box from that cell onto goal g (one pull-BFS per goal).
+    Rows are array('H') indexed by the position of the cell in `cells`.
+    Cells no goal can be pulled back to are the level's dead squares.
+    """
+
+    def __init__(self, walls: Set[Tuple[int, int]], goals: Set[Tuple[int, int]], player: Tuple[int, int]):
+        self.goals = sorted(goals)
+        # Row-major order, same as the compact engine's cell indices
+        self.cells = sorted(floor_positions(walls, player), key=lambda pos: (pos[1], pos[0]))
+        self.index = {pos: i for i, pos in enumerate(self.cells)}
+
+        self.matrix: List[array] = []
+        for goal in self.goals:
+            row = array('H', [UNREACHABLE]) * len(self.cells)
+            for pos, dist in pull_distances(walls, goal).items():
+                if pos in self.index:
+                    row[self.index[pos]] = dist
+            self.matrix.append(row)
+
+        self.nearest = array('H', [UNREACHABLE]) * len(self.cells)
+        for row in self.matrix:
+            for i, dist in enumerate(row):
+                if dist < self.nearest[i]:
+                    self.nearest[i] = dist
+
+        self.dead_squares = {pos for pos, i in self.index.items() if self.nearest[i] == UNREACHABLE}
+
+    def distance(self, goal_index: int, pos: Tuple[int, int]) -> float:
+        """Pushes from pos to goal number goal_index, inf when impossible"""
+        dist = self.matrix[goal_index][self.index[pos]] if pos in self.index else UNREACHABLE
+        return float('inf') if dist == UNREACHABLE else dist
+
+    def nearest_map(self) -> dict:
+        """{position: pushes to the nearest goal}; dead squares are left out"""
+        return {pos: self.nearest[i] for pos, i in self.index.items() if self.nearest[i] != UNREACHABLE}
+
+    def goal_maps(self) -> List[dict]:
+        """One {position: pushes} map per goal (in self.goals order), inf when unreachable"""
+        return [{pos: (float('inf') if row[i] == UNREACHABLE else row[i]) for pos, i in self.index.items()}
+                for row in self.matrix]
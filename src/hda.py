@@ -0,0 +1,269 @@
+import multiprocessing
+import os
+import queue
+import time
+from typing import Optional, Set, Tuple
+from src.dfs import State
+from src.astar import build_search_problem
+from src.moves import Solution
+from src.metrics import PhaseTimer
+from src.openlist import OPEN_LISTS
+
+# Nodes collected for one destination worker before they are sent
+HDA_BATCH_SIZE = 64
+
+# Seconds a worker with nothing to do waits for incoming nodes
+HDA_IDLE_WAIT = 0.005
+
+# Expansions between two checks of the inbox while a worker is busy
+HDA_POLL_INTERVAL = 16
+
+# Seconds between the two reads of the termination check
+HDA_TERMINATION_INTERVAL = 0.01
+
+
+def _owner(key, workers: int) -> int:
+    """Worker that owns a state. Zobrist keys are used as they are; tuple keys of ints hash the same in every process"""
+    return (key if isinstance(key, int) else hash(key)) % workers
+
+
+def _worker(index: int, workers: int, problem_args: tuple, problem_options: dict, open_list: str, max_depth: int,
+            inboxes: list, results, incumbent, sent, received, idle) -> None:
+    """
+    One HDA* worker: owns the states hashed to it, with its own open list and
+    closed table, and sends every generated successor to its owner.
+
+    Messages on the inbox:
+        ('nodes', [(state, g, parent key), ...])
+        ('trace', key)   -> replies ('trace', key, state, parent key)
+        ('stop',)        -> replies ('stats', statistics) and exits
+    """
+    problem = build_search_problem(*problem_args, **problem_options)
+    heuristic = problem.heuristic
+    epsilon = problem.epsilon
+    inbox = inboxes[index]
+    open_nodes = OPEN_LISTS[open_list]()
+    best_g = {}
+    closed = {}  # key -> (g, parent key, state)
+    outboxes = [[] for _ in range(workers)]
+    stats = {'nodes_explored': 0, 'nodes_expanded': 0, 'nodes_generated': 0, 'peak_open_size': 0}
+
+    def flush(destination: int) -> None:
+        if outboxes[destination]:
+            sent[index] += 1
+            inboxes[destination].put(('nodes', outboxes[destination]))
+            outboxes[destination] = []
+
+    def receive(nodes: list) -> None:
+        for state, g_score, parent_key in nodes:
+            key = problem.state_key(state)
+            if best_g.get(key, g_score + 1) <= g_score:
+                continue
+            best_g[key] = g_score
+            f_score = g_score + epsilon * heuristic(state, g_score)
+            open_nodes.push(f_score, g_score, (f_score, g_score, key, parent_key, state))
+
+    if index == _owner(problem.state_key(problem.initial_state), workers):
+        receive([(problem.initial_state, 0, None)])
+        stats['nodes_generated'] += 1
+
+    polls = 0
+    while True:
+        # Block briefly when idle; while busy only look at the inbox now and then
+        message = None
+        polls += 1
+        if not open_nodes or polls >= HDA_POLL_INTERVAL:
+            polls = 0
+            try:
+                message = inbox.get(timeout=HDA_IDLE_WAIT) if not open_nodes else inbox.get_nowait()
+            except queue.Empty:
+                pass
+        if message is not None:
+            if message[0] == 'nodes':
+                idle[index] = 0
+                received[index] += 1
+                receive(message[1])
+                polls = HDA_POLL_INTERVAL  # Drain the rest of the inbox first
+                continue
+            if message[0] == 'trace':
+                _, parent_key, state = closed[message[1]]
+                results.put(('trace', message[1], state, parent_key))
+                continue
+            stats['peak_closed_size'] = len(closed)
+            stats.update(problem.prune_counts)
+            if hasattr(heuristic, 'get_statistics'):
+                stats.update(heuristic.get_statistics())
+            results.put(('stats', stats))
+            return
+
+        if not open_nodes:
+            for destination in range(workers):
+                flush(destination)
+            idle[index] = 1
+            continue
+
+        if len(open_nodes) > stats['peak_open_size']:
+            stats['peak_open_size'] = len(open_nodes)
+        f_score, g_score, key, parent_key, state = open_nodes.pop()
+        if f_score >= incumbent.value:
+            # Nothing here can beat the solution already found
+            open_nodes = OPEN_LISTS[open_list]()
+            continue
+        # Workers expand out of order, so a closed state is reopened when a cheaper path arrives
+        if best_g.get(key) != g_score or (key in closed and closed[key][0] <= g_score):
+            continue
+        closed[key] = (g_score, parent_key, state)
+        stats['nodes_explored'] += 1
+
+        if problem.is_goal(state):
+            with incumbent.get_lock():
+                if g_score < incumbent.value:
+                    incumbent.value = g_score
+                    results.put(('goal', g_score, key))
+            continue
+        if g_score >= max_depth:
+            continue
+
+        stats['nodes_expanded'] += 1
+        if problem.on_expand:
+            problem.on_expand(state)
+        for next_state, _ in problem.get_neighbors(state):
+            stats['nodes_generated'] += 1
+            destination = _owner(problem.state_key(next_state), workers)
+            outboxes[destination].append((next_state, g_score + 1, key))
+            if len(outboxes[destination]) >= HDA_BATCH_SIZE:
+                flush(destination)
+        # Keep latency low when this worker's own queue runs dry
+        if not open_nodes:
+            for destination in range(workers):
+                flush(destination)
+
+
+class HDAStar:
+    """
+    Hash-distributed A* over several worker processes.
+
+    Every state is owned by the worker its key hashes to. Workers keep their
+    own open list and closed table and send successors to their owners in
+    batches over multiprocessing queues. Once a goal is found its cost is
+    shared as the incumbent, and workers stop expanding nodes whose f is not
+    below it. The search ends when every worker is idle and every batch sent
+    has been received (checked twice, so no batch can be in flight), after
+    which the solution is traced back through the owners' closed tables.
+    """
+
+    def __init__(self, start_state: State, walls: Set[Tuple[int, int]], goals: Set[Tuple[int, int]],
+                 heuristic_name: str = "BoundRelaxation (Dynamic)", workers: Optional[int] = None,
+                 open_list: str = 'bucket', max_depth: int = 500, **problem_options):
+        """
+        Args:
+            workers: Number of worker processes (default: one per CPU)
+            problem_options: push_level, compact, corral_pruning and
+                             heuristic_cache, as in astar_solve
+        """
+        self.start_state = start_state
+        self.walls = walls
+        self.goals = goals
+        self.heuristic_name = heuristic_name
+        self.workers = workers or os.cpu_count() or 1
+        self.open_list = open_list
+        self.max_depth = max_depth
+        self.problem_options = problem_options
+        self.statistics = {'nodes_explored': 0, 'nodes_expanded': 0, 'nodes_generated': 0}
+        self.timer = PhaseTimer()
+
+    def solve(self) -> Optional[Solution]:
+        # Built here too, for to_moves (and to fail early on bad arguments)
+        self.timer.start('precompute')
+        problem = build_search_problem(self.start_state, self.walls, self.goals, self.heuristic_name, **self.problem_options)
+        context = multiprocessing.get_context()
+        inboxes = [context.Queue() for _ in range(self.workers)]
+        results = context.Queue()
+        incumbent = context.Value('d', float('inf'))
+        sent = context.Array('q', self.workers, lock=False)
+        received = context.Array('q', self.workers, lock=False)
+        idle = context.Array('b', self.workers, lock=False)
+
+        problem_args = (self.start_state, self.walls, self.goals, self.heuristic_name)
+        processes = [context.Process(target=_worker, daemon=True,
+                                     args=(index, self.workers, problem_args, self.problem_options, self.open_list,
+                                           self.max_depth, inboxes, results, incumbent, sent, received, idle))
+                     for index in range(self.workers)]
+        self.timer.start('search')
+        for process in processes:
+            process.start()
+
+        goal = None  # (g, key) of the cheapest goal reported
+        try:
+            previous = None
+            while True:
+                try:
+                    message = results.get(timeout=HDA_TERMINATION_INTERVAL)
+                    if message[0] == 'goal' and (goal is None or message[1] < goal[0]):
+                        goal = message[1:]
+                    continue
+                except queue.Empty:
+                    pass
+                if not any(process.is_alive() for process in processes):
+                    raise RuntimeError("HDA* workers exited unexpectedly")
+                snapshot = (all(idle), sum(sent), sum(received))
+                if snapshot[0] and snapshot[1] == snapshot[2] and snapshot == previous:
+                    break
+                previous = snapshot
+
+            self.timer.start('reconstruct')
+            path = self._trace(goal[1], inboxes, results) if goal is not None else None
+        finally:
+            for inbox in inboxes:
+                inbox.put(('stop',))
+            self._collect_statistics(results, len(processes))
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+
+        if path is None:
+            self.timer.stop()
+            return None
+        moves = problem.to_moves(path)
+        self.timer.stop()
+        return Solution(self.start_state, moves)
+
+    def _trace(self, key, inboxes: list, results) -> list:
+        """Follow parent keys from the goal back to the start, one owner at a time"""
+        states = []
+        while key is not None:
+            inboxes[_owner(key, self.workers)].put(('trace', key))
+            message = results.get()
+            while message[0] != 'trace':
+                message = results.get()
+            _, _, state, key = message
+            states.append(state)
+        states.reverse()
+        return states
+
+    def _collect_statistics(self, results, workers: int) -> None:
+        """Sum the counters every worker sends back when it stops (peak sizes are summed per worker peaks)"""
+        deadline = time.perf_counter() + 5
+        reported = 0
+        while reported < workers and time.perf_counter() < deadline:
+            try:
+                message = results.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if message[0] != 'stats':
+                continue
+            reported += 1
+            for name, value in message[1].items():
+                self.statistics[name] = self.statistics.get(name, 0) + value
+
+    def get_statistics(self) -> dict:
+        return {**self.statistics, 'workers': self.workers, 'phases': self.timer.phases}
+
+
+def hda_solver(start_state: State, walls: Set[Tuple[int, int]], goals: Set[Tuple[int, int]],
+               heuristic_name: str = "BoundRelaxation (Dynamic)", workers: Optional[int] = None,
+               **options) -> Tuple[Optional[Solution], Optional[dict]]:
+    search = HDAStar(start_state, walls, goals, heuristic_name, workers=workers, **options)
+    solution = search.solve()
+    return solution, search.get_statistics()
@@ -0,0 +1,120 @@
+import hashlib
+import os
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+
+LEVEL_FOLDER = "levels"
+
+
+def parse_level(lines: List[str]) -> Tuple[Set[Tuple[int, int]], Optional[Tuple[int, int]],
+                                           Set[Tuple[int, int]], Set[Tuple[int, int]], int, int]:
+    """
+    Parse level text (same characters as sokoban.load_level).
+
+    Returns:
+        (walls, player, boxes, goals, rows, cols)
+    """
+    walls, boxes, goals = set(), set(), set()
+    player = None
+    for i, row in enumerate(lines):
+        for j, cell in enumerate(row):
+            pos = (j, i)
+            if cell == "#":
+                walls.add(pos)
+            elif cell == "$":
+                boxes.add(pos)
+            elif cell == "@":
+                player = pos
+            elif cell == ".":
+                goals.add(pos)
+            elif cell == "*":
+                goals.add(pos)
+                boxes.add(pos)
+            elif cell == "+":
+                goals.add(pos)
+                player = pos
+    return walls, player, boxes, goals, len(lines), max(len(line) for line in lines)
+
+
+def read_level(filename: str):
+    """Parse a level file; see parse_level"""
+    with open(filename, "r") as f:
+        return parse_level([line.rstrip("\n") for line in f])
+
+
+def level_hash(walls: Set[Tuple[int, int]], player: Tuple[int, int],
+               boxes: Set[Tuple[int, int]], goals: Set[Tuple[int, int]]) -> str:
+    """Stable key of a level's contents, independent of its file name and set ordering"""
+    text = repr((sorted(walls), tuple(player), sorted(boxes), sorted(goals)))
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def level_number(filename: str) -> Optional[int]:
+    """N for 'levelN.txt', else None"""
+    name = os.path.basename(filename)
+    if name.lower().startswith('level') and name.lower().endswith('.txt'):
+        try:
+            return int(name[5:-4])
+        except ValueError:
+            pass
+    return None
+
+
+def level_files(folder: str = LEVEL_FOLDER) -> List[str]:
+    """Level file names in play order (numbered levels first, like the level select screen)"""
+    def _level_key(fname):
+        number = level_number(fname)
+        return (0, number) if number is not None else (1, fname)
+    return sorted((f for f in os.listdir(folder) if f.endswith('.txt')), key=_level_key)
+
+
+class Level(NamedTuple):
+    """A parsed level; immutable, so the GUI and the solvers can share one instance"""
+    name: str
+    lines: Tuple[str, ...]  # Level text, one string per row
+    walls: FrozenSet[Tuple[int, int]]
+    player: Optional[Tuple[int, int]]
+    boxes: FrozenSet[Tuple[int, int]]
+    goals: FrozenSet[Tuple[int, int]]
+    rows: int
+    cols: int
+
+    @property
+    def key(self) -> str:
+        """Content hash (see level_hash)"""
+        return level_hash(self.walls, self.player, self.boxes, self.goals)
+
+
+class LevelRepository:
+    """
+    Level files of one folder, each read and parsed at most once.
+
+    The file list is read when the repository is created; a level is
+    parsed the first time it is asked for (or all of them by load_all)
+    and the same Level object is returned afterwards, so nothing touches
+    the disk once a level has been seen.
+    """
+
+    def __init__(self, folder: str = LEVEL_FOLDER):
+        self.folder = folder
+        self.names = level_files(folder)
+        self._levels: Dict[str, Level] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def get(self, name: str) -> Level:
+        """Level by file name, e.g. 'level5.txt'"""
+        level = self._levels.get(name)
+        if level is None:
+            with open(os.path.join(self.folder, name), "r") as f:
+                lines = tuple(line.rstrip("\n") for line in f)
+            walls, player, boxes, goals, rows, cols = parse_level(list(lines))
+            level = Level(name, lines, frozenset(walls), player, frozenset(boxes), frozenset(goals), rows, cols)
+            self._levels[name] = level
+        return level
+
+    def by_number(self, number: int) -> Level:
+        return self.get(f"level{number}.txt")
+
+    def load_all(self) -> List[Level]:
+        return [self.get(name) for name in self.names]
@@ -0,0 +1,162 @@
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+# Finite stand-in for unreachable box/goal pairs inside the assignment solver
+UNREACHABLE = 10 ** 6
+
+# Maximum number of box configurations whose matching is kept for reuse
+MATCHING_CACHE_SIZE = 50000
+
+
+class _Assignment:
+    """Hungarian solver state for one box configuration (1-indexed, rows = boxes)"""
+    __slots__ = ('boxes', 'u', 'v', 'p', 'cost')
+
+    def __init__(self, boxes: list, u: list, v: list, p: list, cost):
+        self.boxes = boxes
+        self.u = u
+        self.v = v
+        self.p = p
+        self.cost = cost
+
+
+class MatchingHeuristic:
+    """
+    Minimum-cost perfect matching of boxes to goals.
+
+    Costs are per-goal push distances, so unlike the nearest-goal relaxation
+    two boxes can never count the same goal. The assignment is solved with
+    the Hungarian algorithm. When a configuration differs from the parent
+    set with set_parent() by a single moved box, only that box's row is
+    re-augmented (O(n^2)) starting from the parent's potentials instead of
+    solving from scratch (O(n^3)).
+    """
+
+    def __init__(self, goal_rows: List, boxes_of: Callable, cache_size: int = MATCHING_CACHE_SIZE):
+        """
+        Args:
+            goal_rows: One row per goal, indexable by a box key, holding the
+                       push distance (float('inf') when unreachable)
+            boxes_of: Function returning a state's boxes as a frozenset of keys
+        """
+        self.goal_rows = goal_rows
+        self.boxes_of = boxes_of
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.parent = None
+        self.hits = 0
+        self.full_solves = 0
+        self.incremental_solves = 0
+
+    def set_parent(self, state) -> None:
+        """Remember the state being expanded; its children are solved incrementally"""
+        self.parent = self.boxes_of(state)
+
+    def __call__(self, state, current_depth: int = 0):
+        boxes = self.boxes_of(state)
+        solution = self._lookup(boxes)
+        if solution is not None:
+            self.hits += 1
+        else:
+            parent = self._lookup(self.parent) if self.parent is not None else None
+            moved = parent is not None and len(self.goal_rows) == len(boxes) and len(boxes ^ self.parent) == 2
+            if moved:
+                solution = self._solve_incremental(parent, self.parent, boxes)
+                self.incremental_solves += 1
+            else:
+                solution = self._solve(list(boxes))
+                self.full_solves += 1
+            self._store(boxes, solution)
+        return solution.cost
+
+    def get_statistics(self) -> dict:
+        return {
+            'heuristic_cache_hits': self.hits,
+            'heuristic_cache_misses': self.full_solves + self.incremental_solves,
+            'matching_full_solves': self.full_solves,
+            'matching_incremental_solves': self.incremental_solves
+        }
+
+    def _lookup(self, boxes) -> Optional[_Assignment]:
+        solution = self.cache.get(boxes)
+        if solution is not None:
+            self.cache.move_to_end(boxes)
+        return solution
+
+    def _store(self, boxes, solution: _Assignment) -> None:
+        self.cache[boxes] = solution
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def _cost(self, box, goal: int) -> int:
+        cost = self.goal_rows[goal - 1][box]
+        return UNREACHABLE if cost == float('inf') else cost
+
+    def _solve(self, boxes: list) -> _Assignment:
+        n, m = len(boxes), len(self.goal_rows)
+        if n > m:
+            return _Assignment(boxes, [], [], [], float('inf'))
+        u = [0] * (n + 1)
+        v = [0] * (m + 1)
+        p = [0] * (m + 1)
+        for row in range(1, n + 1):
+            self._augment(boxes, row, u, v, p)
+        return _Assignment(boxes, u, v, p, self._total(boxes, p))
+
+    def _solve_incremental(self, parent: _Assignment, parent_boxes, boxes) -> _Assignment:
+        (old,) = parent_boxes - boxes
+        (new,) = boxes - parent_boxes
+        row = parent.boxes.index(old) + 1
+        new_boxes = list(parent.boxes)
+        new_boxes[row - 1] = new
+        u, v, p = list(parent.u), list(parent.v), list(parent.p)
+
+        # Free the moved box's goal and restore dual feasibility for its row
+        p[p.index(row, 1)] = 0
+        u[row] = min(self._cost(new, goal) - v[goal] for goal in range(1, len(v)))
+        self._augment(new_boxes, row, u, v, p)
+        return _Assignment(new_boxes, u, v, p, self._total(new_boxes, p))
+
+    def _augment(self, boxes: list, row: int, u: list, v: list, p: list) -> None:
+        """One Hungarian phase: shortest augmenting path for a single row"""
+        m = len(v) - 1
+        minv = [float('inf')] * (m + 1)
+        used = [False] * (m + 1)
+        way = [0] * (m + 1)
+        p[0] = row
+        j0 = 0
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            box = boxes[i0 - 1]
+            delta = float('inf')
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = self._cost(box, j) - u[i0] - v[j]
+                    if cur < minv[j]:
+                        minv[j] = cur
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    def _total(self, boxes: list, p: list):
+        total = 0
+        for goal in range(1, len(p)):
+            if p[goal]:
+                total += self._cost(boxes[p[goal] - 1], goal)
+        return float('inf') if total >= UNREACHABLE else total
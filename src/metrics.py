@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+import tracemalloc
+from typing import Optional
+
+import psutil
+
+# Seconds between two RSS samples of MemoryMonitor
+MEMORY_SAMPLE_INTERVAL = 0.01
+
+MEMORY_MODES = ('rss', 'tracemalloc')
+
+
+class PhaseTimer:
+    """
+    Wall-clock seconds per named phase of one solver run, e.g.
+    {'precompute': 0.01, 'search': 2.5, 'reconstruct': 0.001}.
+    start() ends the running phase and begins the next one; a phase that
+    is started again adds to its total.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self._current = None
+        self._started = 0.0
+
+    def start(self, name: str) -> None:
+        self.stop()
+        self._current = name
+        self._started = time.perf_counter()
+
+    def stop(self) -> None:
+        if self._current is not None:
+            elapsed = time.perf_counter() - self._started
+            self.phases[self._current] = self.phases.get(self._current, 0.0) + elapsed
+            self._current = None
+
+
+class MemoryMonitor:
+    """
+    Peak memory of the code run inside a `with` block.
+
+    Modes:
+        'rss': a background thread samples the resident set size of this
+               process (and of its child processes with include_children)
+               every MEMORY_SAMPLE_INTERVAL seconds. Close to free, sees
+               every allocation, but a spike shorter than the interval can
+               be missed.
+        'tracemalloc': exact peak of the memory allocated by Python, at the
+                       cost of a much slower search while it is traced.
+    """
+
+    def __init__(self, mode: str = 'rss', include_children: bool = False):
+        if mode not in MEMORY_MODES:
+            raise ValueError(f"Unknown memory mode '{mode}' (expected one of {', '.join(MEMORY_MODES)})")
+        self.mode = mode
+        self.include_children = include_children
+        self.baseline = 0
+        self.peak = 0
+        self.final = 0
+        self._process = None
+        self._thread = None
+        self._done = None
+        self._was_tracing = False
+
+    def __enter__(self):
+        if self.mode == 'tracemalloc':
+            self._was_tracing = tracemalloc.is_tracing()
+            if not self._was_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self.baseline = tracemalloc.get_traced_memory()[0]
+        else:
+            self._process = psutil.Process(os.getpid())
+            self.baseline = self._sample()
+            self._done = threading.Event()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        self.peak = self.baseline
+        return self
+
+    def __exit__(self, *exc):
+        if self.mode == 'tracemalloc':
+            self.final, self.peak = tracemalloc.get_traced_memory()
+            if not self._was_tracing:
+                tracemalloc.stop()
+        else:
+            self._done.set()
+            self._thread.join()
+            self.final = self._sample()
+            self.peak = max(self.peak, self.final)
+
+    def _sample(self) -> int:
+        rss = self._process.memory_info().rss
+        if self.include_children:
+            for child in self._process.children(recursive=True):
+                try:
+                    rss += child.memory_info().rss
+                except psutil.Error:
+                    pass  # Exited between listing and sampling
+        return rss
+
+    def _run(self) -> None:
+        while not self._done.wait(MEMORY_SAMPLE_INTERVAL):
+            try:
+                self.peak = max(self.peak, self._sample())
+            except psutil.Error:
+                pass
+
+    def get_statistics(self) -> dict:
+        """Bytes; peak_delta is the growth at the peak and never negative"""
+        return {
+            'mode': self.mode,
+            'baseline': self.baseline,
+            'peak': self.peak,
+            'final': self.final,
+            'peak_delta': max(0, self.peak - self.baseline)
+        }
+
+
+def format_stats(stats: Optional[dict]) -> str:
+    """Console report of solve() statistics; keys a run did not record are left out"""
+    if not stats:
+        return ""
+    lines = [f"Nodes explored: {stats['nodes_explored']}",
+             f"Nodes expanded: {stats['nodes_expanded']}",
+             f"Nodes generated: {stats['nodes_generated']}"]
+    if 'freeze_pruned' in stats:
+        lines.append(f"Freeze deadlocks pruned: {stats['freeze_pruned']}")
+    if 'corral_pruned' in stats:
+        lines.append(f"Corral deadlocks pruned: {stats['corral_pruned']}")
+    if 'iterations' in stats:
+        lines.append(f"Iterations: {stats['iterations']}")
+    if stats.get('winner'):
+        lines.append(f"Portfolio winner: {stats['winner']} ({stats['winner_time']:.3f} seconds)")
+    if stats.get('peak_open_size') is not None:
+        lines.append(f"Peak open list: {stats['peak_open_size']}")
+    if stats.get('peak_closed_size') is not None:
+        lines.append(f"Peak closed list: {stats['peak_closed_size']}")
+    if 'time' in stats:
+        lines.append(f"Time taken: {stats['time']:.3f} seconds")
+    if stats.get('phases'):
+        lines.append("Phases: " + ", ".join(f"{name} {seconds:.3f}s" for name, seconds in stats['phases'].items()))
+    if 'nodes_per_second' in stats:
+        lines.append(f"Nodes/sec: {stats['nodes_per_second']:.0f}")
+    if stats.get('memory'):
+        memory = stats['memory']
+        lines.append(f"Peak memory ({memory['mode']}): {memory['peak'] / 1024:.2f} KB "
+                     f"(+{memory['peak_delta'] / 1024:.2f} KB)")
+    return "\n".join(lines)
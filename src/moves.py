@@ -0,0 +1,110 @@
+from typing import Callable, Iterator, List, Optional, Set, Tuple
+from src.dfs import State, walk_path
+
+# LURD notation: lowercase for a walk, uppercase for a push
+MOVE_LETTERS = {(-1, 0): 'l', (1, 0): 'r', (0, -1): 'u', (0, 1): 'd'}
+LETTER_MOVES = {letter: delta for delta, letter in MOVE_LETTERS.items()}
+
+
+class Solution:
+    """
+    A solution as its start state and LURD move string. States are
+    replayed on demand by states(), one at a time.
+    """
+    __slots__ = ('start_state', 'moves')
+
+    def __init__(self, start_state: State, moves: str):
+        self.start_state = start_state
+        self.moves = moves
+
+    @property
+    def steps(self) -> int:
+        return len(self.moves)
+
+    @property
+    def pushes(self) -> int:
+        return sum(letter.isupper() for letter in self.moves)
+
+    def states(self) -> Iterator[State]:
+        """The start state, then the state after every move"""
+        return iter_states(self.start_state, self.moves)
+
+    def __repr__(self) -> str:
+        return f"Solution({self.steps} steps, {self.pushes} pushes)"
+
+
+def path_to_moves(path: list, position: Optional[Callable] = None) -> str:
+    """
+    Move string of a step-by-step path. Consecutive states whose boxes
+    differ count as a push.
+
+    Args:
+        path: States of any kind with a `boxes` attribute (State, CompactState)
+        position: Player (x, y) of a path state (default: state.player)
+    """
+    position = position or (lambda state: state.player)
+    moves = []
+    for prev, nxt in zip(path, path[1:]):
+        (px, py), (nx, ny) = position(prev), position(nxt)
+        letter = MOVE_LETTERS[(nx - px, ny - py)]
+        moves.append(letter.upper() if prev.boxes != nxt.boxes else letter)
+    return "".join(moves)
+
+
+def push_path_to_moves(start_state: State, push_path: List[State], walls: Set[Tuple[int, int]]) -> str:
+    """Move string of a push-level path (see expand_push_path), without building the step States"""
+    moves = []
+    player = start_state.player
+    for prev, nxt in zip(push_path, push_path[1:]):
+        (bx, by), = prev.boxes - nxt.boxes
+        (nx, ny), = nxt.boxes - prev.boxes
+        dx, dy = nx - bx, ny - by
+        for pos in walk_path(player, (bx - dx, by - dy), prev.boxes, walls):
+            moves.append(MOVE_LETTERS[(pos[0] - player[0], pos[1] - player[1])])
+            player = pos
+        moves.append(MOVE_LETTERS[(dx, dy)].upper())
+        player = (bx, by)
+    return "".join(moves)
+
+
+def iter_states(start_state: State, moves: str) -> Iterator[State]:
+    """Replay a trusted move string lazily; walking states share their parent's box set"""
+    yield start_state
+    player = start_state.player
+    boxes = start_state.boxes
+    for letter in moves:
+        dx, dy = LETTER_MOVES[letter.lower()]
+        player = (player[0] + dx, player[1] + dy)
+        if letter.isupper():
+            boxes = (boxes - {player}) | {(player[0] + dx, player[1] + dy)}
+        yield State(player, boxes)
+
+
+def moves_to_path(start_state: State, moves: str, walls: Set[Tuple[int, int]]) -> List[State]:
+    """
+    Replay a move string from start_state, checking every move.
+
+    Raises:
+        ValueError: if a move walks into a wall or a push is blocked, or
+                    the case of a letter does not match what it does
+    """
+    path = [start_state]
+    player = start_state.player
+    boxes = start_state.boxes
+    for i, letter in enumerate(moves):
+        if letter.lower() not in LETTER_MOVES:
+            raise ValueError(f"Unknown move '{letter}' at {i}")
+        dx, dy = LETTER_MOVES[letter.lower()]
+        nxt = (player[0] + dx, player[1] + dy)
+        if nxt in walls:
+            raise ValueError(f"Move {i} walks into a wall")
+        if (nxt in boxes) != letter.isupper():
+            raise ValueError(f"Move {i} ('{letter}') does not match the position")
+        if nxt in boxes:
+            beyond = (nxt[0] + dx, nxt[1] + dy)
+            if beyond in walls or beyond in boxes:
+                raise ValueError(f"Push {i} is blocked")
+            boxes = (boxes - {nxt}) | {beyond}
+        player = nxt
+        path.append(State(player, boxes))
+    return path
@@ -0,0 +1,124 @@
+import heapq
+from typing import Generic, TypeVar
+
+T = TypeVar('T')
+
+# Bucket keys per unit of f in BucketOpenList: f values closer than this share a bucket
+BUCKET_RESOLUTION = 4
+
+
+class HeapOpenList(Generic[T]):
+    """
+    Binary-heap open list ordered by f, ties broken by insertion order.
+    This is the original AStar behaviour; push and pop are O(log n).
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.counter = 0
+
+    def push(self, f_score: float, g_score: int, item: T) -> None:
+        self.counter += 1
+        heapq.heappush(self.heap, (f_score, self.counter, item))
+
+    def pop(self) -> T:
+        return heapq.heappop(self.heap)[2]
+
+    def items(self) -> list:
+        """Items in insertion order: pushed again into an empty list they pop in the same order"""
+        return [entry[2] for entry in sorted(self.heap, key=lambda entry: entry[1])]
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+
+class BucketOpenList(Generic[T]):
+    """
+    Two-level bucket queue: f is quantized to an integer key,
+    round(f * BUCKET_RESOLUTION), with one bucket per key and inside it one
+    LIFO stack per g value. Pops take the lowest key and, within a key, the
+    deepest node (highest g), which reaches goals sooner on plateaus.
+
+    g is a small integer under unit move costs, and f stays below the search
+    depth plus the weighted heuristic, so both levels are plain lists indexed
+    directly and no heap is involved. `low` is a lower bound on the live keys:
+    a push below it moves it down and a pop scans up from it to the first
+    live bucket. A push is O(1); a pop is O(1) plus the scan over the keys
+    between two successive minima, which A* keeps short as f grows.
+
+    Integral f (epsilon 1.0, and the half-integral f of epsilon 1.5) keeps
+    the exact lowest-f order. Depth-weighted heuristics (BoundRelaxation
+    (Dynamic)), whose f takes a different value at almost every depth, are
+    ordered to within 1/BUCKET_RESOLUTION of f, with ties going to the deeper
+    node. Nodes with an infinite f are kept apart and popped last.
+    """
+
+    def __init__(self):
+        self.buckets = []    # key -> None or [top g, node count, stacks (or None) indexed by g]
+        self.low = 0         # No live bucket has a lower key
+        self.unbounded = []  # Nodes with f = inf
+        self.size = 0
+
+    def push(self, f_score: float, g_score: int, item: T) -> None:
+        self.size += 1
+        try:
+            key = int(f_score * BUCKET_RESOLUTION + 0.5)
+        except OverflowError:
+            self.unbounded.append(item)
+            return
+        buckets = self.buckets
+        if key >= len(buckets):
+            buckets.extend([None] * (key + 1 - len(buckets)))
+        bucket = buckets[key]
+        if bucket is None:
+            bucket = buckets[key] = [g_score, 0, [None] * (g_score + 1)]
+        stacks = bucket[2]
+        if g_score >= len(stacks):
+            stacks.extend([None] * (g_score + 1 - len(stacks)))
+        if g_score > bucket[0]:
+            bucket[0] = g_score
+        stack = stacks[g_score]
+        if stack is None:
+            stack = stacks[g_score] = []
+        stack.append(item)
+        bucket[1] += 1
+        if key < self.low:
+            self.low = key
+
+    def pop(self) -> T:
+        self.size -= 1
+        if self.size < len(self.unbounded):
+            return self.unbounded.pop()  # Only nodes with f = inf are left
+        buckets = self.buckets
+        key = self.low
+        while buckets[key] is None:
+            key += 1
+        self.low = key
+        bucket = buckets[key]
+        stacks = bucket[2]
+        top = bucket[0]
+        while not stacks[top]:
+            top -= 1
+        item = stacks[top].pop()
+        bucket[0] = top
+        bucket[1] -= 1
+
+        # Drop the bucket once its last node is gone
+        if not bucket[1]:
+            buckets[key] = None
+        return item
+
+    def items(self) -> list:
+        """Items bottom-up per stack: pushed again into an empty list they pop in the same order"""
+        return [item for bucket in self.buckets if bucket is not None
+                for stack in bucket[2] if stack for item in stack] + self.unbounded
+
+    def __len__(self) -> int:
+        return self.size
+
+
+# Open list implementations selectable by name (AStar / astar_solve `open_list`)
+OPEN_LISTS = {
+    'heap': HeapOpenList,
+    'bucket': BucketOpenList
+}
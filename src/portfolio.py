@@ -0,0 +1,177 @@
+import json
+import multiprocessing
+import os
+import queue
+import time
+from typing import List, Optional, Set, Tuple
+from src.dfs import State, dfs_solver
+from src.astar import astar_solve
+from src.bidirectional import bidirectional_solver
+from src.levels import level_hash
+from src.moves import Solution
+
+# Variant name -> (engine, heuristic name); names match the benchmark table
+PORTFOLIO_VARIANTS = {
+    'DFS': ('dfs', None),
+    'A*_Manhattan': ('astar', 'Manhattan'),
+    'A*_Relaxation_1.5': ('astar', 'BoundRelaxation (Static)'),
+    'A*_Relaxation_Dynamic': ('astar', 'BoundRelaxation (Dynamic)'),
+    'A*_Matching': ('astar', 'Matching (Hungarian)'),
+    'IDA*_Relaxation_Dynamic': ('idastar', 'BoundRelaxation (Dynamic)'),
+    'Bidirectional': ('bidirectional', None)
+}
+
+# Next to the repository's eval/ results, whatever the working directory
+PREFERENCES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "eval", "portfolio_preferences.json")
+
+# Seconds the race loop waits for a result before checking the workers
+PORTFOLIO_POLL_INTERVAL = 0.05
+
+
+def _run_variant(name: str, start_state: State, walls: Set[Tuple[int, int]], goals: Set[Tuple[int, int]],
+                 map_width: int, map_height: int, options: dict, results) -> None:
+    """Worker process: solve with one variant and report (name, solution, stats, seconds)"""
+    engine, heuristic_name = PORTFOLIO_VARIANTS[name]
+    start = time.perf_counter()
+    try:
+        if engine == 'dfs':
+            solution, stats = dfs_solver(start_state, walls, goals, push_level=options.get('push_level', False),
+                                         compact=options.get('compact', False))
+        elif engine == 'bidirectional':
+            solution, stats = bidirectional_solver(start_state, walls, goals)
+        else:
+            solution, stats = astar_solve(start_state, walls, goals, map_width, map_height, heuristic_name=heuristic_name,
+                                          ida_star=engine == 'idastar', **options)
+    except Exception as e:
+        solution, stats = None, {'error': f"{type(e).__name__}: {e}"}
+    results.put((name, solution, stats, time.perf_counter() - start))
+
+
+class PreferenceTable:
+    """
+    Per-level win counts of the portfolio variants, stored as JSON:
+        {level hash: {variant name: wins}}
+    Variants that won a level before are started first on it.
+    """
+
+    def __init__(self, filename: str = PREFERENCES_FILE):
+        self.filename = filename
+        self.table = {}
+        if os.path.exists(filename):
+            try:
+                with open(filename, "r") as f:
+                    self.table = json.load(f)
+            except (OSError, ValueError):
+                self.table = {}
+
+    def order(self, key: str, variants: List[str]) -> List[str]:
+        """Variants by past wins on this level, ties in the given order"""
+        wins = self.table.get(key, {})
+        return sorted(variants, key=lambda name: -wins.get(name, 0))
+
+    def record(self, key: str, winner: str) -> None:
+        wins = self.table.setdefault(key, {})
+        wins[winner] = wins.get(winner, 0) + 1
+        directory = os.path.dirname(self.filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Per-process temporary file: concurrent portfolio runs never write the same one
+        temp_file = f"{self.filename}.{os.getpid()}.tmp"
+        with open(temp_file, "w") as f:
+            json.dump(self.table, f, indent=1, sort_keys=True)
+        os.replace(temp_file, self.filename)
+
+
+class PortfolioSolver:
+    """
+    Races several solver variants in separate processes on the same level.
+
+    The first variant that returns a solution wins and every other process
+    is terminated at once. Variants that finish without a solution (or
+    fail) drop out of the race. With fewer workers than variants the
+    variants are started in order of their past wins on this level, and a
+    waiting variant starts whenever a worker drops out. The winner is
+    recorded in the PreferenceTable.
+    """
+
+    def __init__(self, start_state: State, walls: Set[Tuple[int, int]], goals: Set[Tuple[int, int]],
+                 map_width: int, map_height: int, variants: Optional[List[str]] = None,
+                 workers: Optional[int] = None, preferences: Optional[PreferenceTable] = None, **options):
+        """
+        Args:
+            variants: Names from PORTFOLIO_VARIANTS (default: all of them)
+            workers: Variants running at the same time (default: all of them)
+            preferences: Win table to order variants by and record into;
+                         PreferenceTable() when omitted
+            options: push_level, compact and corral_pruning, passed to the
+                     variants that support them
+        """
+        self.start_state = start_state
+        self.walls = walls
+        self.goals = goals
+        self.map_width = map_width
+        self.map_height = map_height
+        self.variants = list(variants or PORTFOLIO_VARIANTS)
+        self.workers = workers or len(self.variants)
+        self.preferences = preferences if preferences is not None else PreferenceTable()
+        self.options = options
+        self.level_key = level_hash(walls, start_state.player, start_state.boxes, goals)
+        self.winner = None
+        self.winner_stats = None
+        self.winner_time = None
+        self.failed = {}
+
+    def solve(self) -> Optional[Solution]:
+        context = multiprocessing.get_context()
+        results = context.Queue()
+        waiting = self.preferences.order(self.level_key, self.variants)
+        running = {}
+        solution = None
+        try:
+            while waiting or running:
+                while waiting and len(running) < self.workers:
+                    name = waiting.pop(0)
+                    process = context.Process(target=_run_variant, daemon=True,
+                                              args=(name, self.start_state, self.walls, self.goals,
+                                                    self.map_width, self.map_height, self.options, results))
+                    process.start()
+                    running[name] = process
+                try:
+                    name, solution, stats, elapsed = results.get(timeout=PORTFOLIO_POLL_INTERVAL)
+                except queue.Empty:
+                    # A worker that reported exits cleanly; any other exit (killed, out of memory) drops out
+                    for name, process in list(running.items()):
+                        if not process.is_alive() and process.exitcode != 0:
+                            del running[name]
+                            self.failed[name] = f"exit code {process.exitcode}"
+                    continue
+                running.pop(name).join()
+                if solution:
+                    self.winner, self.winner_stats, self.winner_time = name, stats, elapsed
+                    break
+                self.failed[name] = (stats or {}).get('error', "no solution")
+        finally:
+            for process in running.values():
+                process.terminate()
+            for process in running.values():
+                process.join()
+
+        if self.winner is None:
+            return None
+        self.preferences.record(self.level_key, self.winner)
+        return solution
+
+    def get_statistics(self) -> dict:
+        stats = dict(self.winner_stats or {'nodes_explored': 0, 'nodes_expanded': 0, 'nodes_generated': 0})
+        stats['winner'] = self.winner
+        stats['winner_time'] = self.winner_time
+        stats['variants'] = len(self.variants)
+        return stats
+
+
+def portfolio_solver(start_state: State, walls: Set[Tuple[int, int]], goals: Set[Tuple[int, int]],
+                     map_width: int, map_height: int, **options) -> Tuple[Optional[Solution], Optional[dict]]:
+    search = PortfolioSolver(start_state, walls, goals, map_width, map_height, **options)
+    solution = search.solve()
+    return solution, search.get_statistics()
@@ -0,0 +1,89 @@
+import time
+from typing import Callable, Optional
+
+# One call in this many is timed; the others are only counted
+PROFILE_SAMPLE_EVERY = 16
+
+
+class HotPathProfiler:
+    """
+    Call counts and cumulative time of the callables a search spends its
+    time in (successor generation, heuristic, state key, goal test, open
+    list push/pop).
+
+    Engines given a profiler replace those callables with wrap()ped ones;
+    without a profiler nothing is wrapped, so a normal run pays nothing.
+    A wrapper counts every call but reads the clock for only one call in
+    `sample_every`, and the measured time is scaled up to all calls.
+
+    The result goes to get_statistics() (JSON values), format_table() for
+    the console and write_folded(), the folded-stack text that flamegraph.pl,
+    inferno and speedscope read.
+    """
+
+    def __init__(self, sample_every: int = PROFILE_SAMPLE_EVERY):
+        self.sample_every = sample_every
+        # name -> [calls, timed calls, timed seconds]
+        self.counters = {}
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        counter = self.counters.setdefault(name, [0, 0, 0.0])
+        every = self.sample_every
+        clock = time.perf_counter
+
+        def profiled(*args):
+            counter[0] += 1
+            if counter[0] % every:
+                return func(*args)
+            start = clock()
+            result = func(*args)
+            counter[2] += clock() - start
+            counter[1] += 1
+            return result
+        profiled.__wrapped__ = func
+        return profiled
+
+    def wrap_methods(self, obj, prefix: str, names: tuple) -> None:
+        """Wrap methods of one object in place, counted as '<prefix>.<method>'"""
+        for name in names:
+            setattr(obj, name, self.wrap(f"{prefix}.{name}", getattr(obj, name)))
+
+    def estimated_time(self, name: str) -> float:
+        calls, timed_calls, timed_seconds = self.counters[name]
+        return timed_seconds * calls / timed_calls if timed_calls else 0.0
+
+    def get_statistics(self) -> dict:
+        """name -> {'calls', 'time' (estimated seconds), 'sampled' (timed calls)}"""
+        return {name: {'calls': calls, 'time': self.estimated_time(name), 'sampled': timed_calls}
+                for name, (calls, timed_calls, _) in self.counters.items()}
+
+    def format_table(self, total_time: Optional[float] = None) -> str:
+        """Counters by estimated time; with total_time also as a share of it"""
+        lines = [f"{'Function':<20} {'Calls':>12} {'Time(s)':>10} {'us/call':>9}" + (f" {'Share':>7}" if total_time else "")]
+        for name in sorted(self.counters, key=self.estimated_time, reverse=True):
+            calls = self.counters[name][0]
+            seconds = self.estimated_time(name)
+            line = f"{name:<20} {calls:>12} {seconds:>10.3f} {1e6 * seconds / calls if calls else 0:>9.2f}"
+            if total_time:
+                line += f" {100 * seconds / total_time:>6.1f}%"
+            lines.append(line)
+        return "\n".join(lines)
+
+    def write_folded(self, filename: str, root: str, total_time: float) -> None:
+        """
+        Folded stacks in microseconds, one '<root>;<function> <us>' line per
+        counter plus '<root> <us>' for the time outside every counter.
+
+        Args:
+            root: Frame name of the search (e.g. 'AStar.solve')
+            total_time: Seconds of the whole search, to derive the root's own time
+        """
+        lines = []
+        profiled = 0.0
+        for name in self.counters:
+            seconds = self.estimated_time(name)
+            profiled += seconds
+            lines.append(f"{root};{name} {round(seconds * 1e6)}")
+        lines.append(f"{root} {round(max(0.0, total_time - profiled) * 1e6)}")
+        with open(filename, "w") as f:
+            f.write("\n".join(lines) + "\n")
@@ -0,0 +1,44 @@
+"""
+Continue an A* search from a checkpoint file (astar_solve(checkpoint_file=...)
+or benchmark --checkpoint-dir), e.g. after the process was killed.
+
+Usage:
+    python -m src.resume FILE [--max-time S] [--max-nodes N] [--max-memory MB] [--interval S] [--closed-set mmap]
+"""
+import argparse
+
+from src.astar import CHECKPOINT_INTERVAL, astar_resume
+from src.budget import SearchBudget
+from src.closedset import CLOSED_SETS
+from src.metrics import format_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Continue an A* search from its checkpoint file")
+    parser.add_argument("checkpoint", help="checkpoint file; rewritten while the search runs")
+    parser.add_argument("--max-time", type=float, help="stop (and checkpoint) after this many seconds")
+    parser.add_argument("--max-nodes", type=int, help="stop after this many expansions in total")
+    parser.add_argument("--max-memory", type=int, help="stop after this many MB of memory growth")
+    parser.add_argument("--interval", type=float, default=CHECKPOINT_INTERVAL, help="seconds between checkpoints")
+    parser.add_argument("--closed-set", choices=CLOSED_SETS, default='memory',
+                        help="'mmap': keep the closed set in memory-mapped files")
+    args = parser.parse_args()
+
+    budget = None
+    if args.max_time is not None or args.max_nodes is not None or args.max_memory is not None:
+        budget = SearchBudget(max_nodes=args.max_nodes, max_time=args.max_time,
+                              max_memory=args.max_memory * 1024 * 1024 if args.max_memory is not None else None)
+    solution, stats = astar_resume(args.checkpoint, budget=budget, checkpoint_interval=args.interval,
+                                   closed_set=args.closed_set)
+    print(format_stats(stats))
+    if solution:
+        print(f"Solved: {solution.steps} steps, {solution.pushes} pushes")
+        print(solution.moves)
+    elif stats.get('budget_exhausted'):
+        print(f"Stopped ({stats['budget_exhausted']}); continue with the same command")
+    else:
+        print("No solution")
+
+
+if __name__ == "__main__":
+    main()
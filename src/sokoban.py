@@ -2,7 +2,12 @@ import pygame
 import os
 import sys
 
-from src.solve import solve
+from src.dfs import State
+from src.solve import solve, solver_config
+from src.solution_store import SolutionStore
+from src.background import BackgroundSolver
+from src.levels import LevelRepository
+from src.metrics import format_stats
 
 # --- CONFIG ---
 SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
@@ -27,7 +32,9 @@ g_font = None
 # --- LEVELS DATA ---
 LEVEL_FOLDER = "levels"
 g_solution_dir = ".\solutions"
+g_solution_store = SolutionStore()
 g_levels = None
+g_level_repository = None  # Parsed levels, read from disk once (see track_level)
 g_current_level = 1
 g_walls = set()
 g_boxes = set()
@@ -59,10 +66,18 @@ g_current_level_index = 0
 # --- SOLVING ALGORITHM SELECTION ---
 DFS = 0
 ASTAR = 1
+IDASTAR = 2
+BIDIRECTIONAL = 3
+HDASTAR = 4
+PORTFOLIO = 5
 g_selected_algorithm = None
 solving_algorithm_buttons = {
     "DFS": pygame.Rect(SCREEN_WIDTH//2 - 75, SCREEN_HEIGHT//2 - 100, 170, 50),
-    "A*": pygame.Rect(SCREEN_WIDTH//2 - 75, SCREEN_HEIGHT//2 - 40, 170, 50)
+    "A*": pygame.Rect(SCREEN_WIDTH//2 - 75, SCREEN_HEIGHT//2 - 40, 170, 50),
+    "IDA*": pygame.Rect(SCREEN_WIDTH//2 - 75, SCREEN_HEIGHT//2 + 20, 170, 50),
+    "Bidirectional": pygame.Rect(SCREEN_WIDTH//2 - 75, SCREEN_HEIGHT//2 + 80, 170, 50),
+    "HDA*": pygame.Rect(SCREEN_WIDTH//2 - 75, SCREEN_HEIGHT//2 + 140, 170, 50),
+    "Portfolio": pygame.Rect(SCREEN_WIDTH//2 - 75, SCREEN_HEIGHT//2 + 200, 170, 50)
 }
 
 # --- HEURISTIC SELECTION ---
@@ -70,11 +85,23 @@ g_selected_heuristic = None
 heuristic_buttons = {
     "Manhattan": pygame.Rect(SCREEN_WIDTH//2 - 150, SCREEN_HEIGHT//2 - 150, 300, 50),
     "BoundRelaxation (Static)": pygame.Rect(SCREEN_WIDTH//2 - 150, SCREEN_HEIGHT//2 - 80, 300, 50),
-    "BoundRelaxation (Dynamic)": pygame.Rect(SCREEN_WIDTH//2 - 150, SCREEN_HEIGHT//2 - 10, 300, 50)
+    "BoundRelaxation (Dynamic)": pygame.Rect(SCREEN_WIDTH//2 - 150, SCREEN_HEIGHT//2 - 10, 300, 50),
+    "Matching (Hungarian)": pygame.Rect(SCREEN_WIDTH//2 - 150, SCREEN_HEIGHT//2 + 60, 300, 50)
 }
 
+# --- RENDER CACHE ---
+g_level_name = None    # File name of the loaded level (static layer key)
+g_static_layers = {}   # (level name, tile size) -> Surface with the walls and goals
+g_preview_layers = {}  # (level name, tile size) -> Surface with the whole level preview
+g_board_drawn = None   # (player, boxes) currently on screen; None redraws the whole board
+g_dirty_rects = None   # Screen areas changed this frame; None updates the whole window
+
+# --- BACKGROUND SOLVING ---
+g_background_solver = None
+solving_cancel_button = pygame.Rect(SCREEN_WIDTH//2 - 75, SCREEN_HEIGHT - 130, 170, 50)
+
 # --- SOLVING ANIMATION VARIABLES ---
-anim_path = None
+anim_states = None  # Lazy State replay of the solution (Solution.states)
 anim_index = 0
 anim_last_time = 0
 
@@ -99,9 +126,13 @@ def event_handler():
     global g_key_pressed
     global g_click
     
+    global g_board_drawn
+    
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             return False
+        if event.type == pygame.VIDEOEXPOSE:
+            g_board_drawn = None
         if event.type == pygame.KEYDOWN and g_render_state == RENDER_PLAYING:
             g_key_pressed = event.key
             return True
@@ -117,39 +148,21 @@ def load_level(level):
     global g_player
     global g_rows
     global g_cols
+    global g_level_name
+    global g_board_drawn
     
-    g_walls.clear()
-    g_boxes.clear()
-    g_goals.clear()
-    g_player = None
-    g_rows = 0
-    g_cols = 0
-
-    filename = os.path.join(LEVEL_FOLDER, f"level{level}.txt")
-    with open(filename, "r") as f:
-        lines = [line.rstrip("\n") for line in f]
-
-    for i, row in enumerate(lines):
-        for j, cell in enumerate(row):
-            pos = (j, i)
-            if cell == "#":
-                g_walls.add(pos)
-            elif cell == "$":
-                g_boxes.add(pos)
-            elif cell == "@":
-                g_player = pos
-            elif cell == ".":
-                g_goals.add(pos)
-            elif cell == "*":
-                g_goals.add(pos)
-                g_boxes.add(pos)
-            elif cell == "+":
-                g_goals.add(pos)
-                g_player = pos
-    g_rows, g_cols = len(lines), (max(len(line) for line in lines))
+    # Playing moves the boxes, so only they are copied from the shared level
+    data = g_level_repository.by_number(level)
+    g_level_name = data.name
+    g_board_drawn = None
+    g_walls = data.walls
+    g_boxes = set(data.boxes)
+    g_goals = data.goals
+    g_player = data.player
+    g_rows, g_cols = data.rows, data.cols
 
 # --- SAVE SOLUTION ---
-def save_solution(path, algorithm_name, heuristic_name=None, stats=None):
+def save_solution(solution, algorithm_name, heuristic_name=None, stats=None):
     # Add solution to file
     os.makedirs(g_solution_dir, exist_ok=True)
 
@@ -160,7 +173,8 @@ def save_solution(path, algorithm_name, heuristic_name=None, stats=None):
         file.write(f"Algorithm: {algorithm_name}\n")
         if heuristic_name:
             file.write(f"Heuristic: {heuristic_name}\n")
-        file.write(f"Steps: {len(path)-1}\n")
+        file.write(f"Steps: {solution.steps}\n")
+        file.write(f"Pushes: {solution.pushes}\n")
         
         # Write statistics if available
         if stats:
@@ -168,13 +182,9 @@ def save_solution(path, algorithm_name, heuristic_name=None, stats=None):
             file.write(f"Nodes expanded: {stats['nodes_expanded']}\n")
             file.write(f"Nodes generated: {stats['nodes_generated']}\n")
         
-        file.write("\nSolution path:\n")
-        
-        # Write solution steps
-        num = 0
-        for s in path:
-            file.write(f"Step {num}:{s.player}\n")
-            num += 1
+        # Write solution moves (LURD: lowercase walks, uppercase pushes)
+        file.write("\nSolution moves:\n")
+        file.write(solution.moves + "\n")
     print("Solution added to ", solution_file)
 
 # --- RENDER MOVE ---
@@ -183,33 +193,33 @@ def render_move():
     global g_current_level_index
     global g_click
     global g_screen
+    global g_board_drawn
+    global g_dirty_rects
     
-    # --- Render ---
-    g_screen.fill(WHITE)
-
-    # Walls
-    for (x, y) in g_walls:
-        pygame.draw.rect(g_screen, GRAY, (x*TILE_SIZE, y*TILE_SIZE, TILE_SIZE, TILE_SIZE))
-
-    # Goals
-    for (x, y) in g_goals:
-        pygame.draw.circle(g_screen, GOLD, (x*TILE_SIZE+TILE_SIZE//2, y*TILE_SIZE+TILE_SIZE//2), TILE_SIZE//6)
-
-    # Boxes
-    for (x, y) in g_boxes:
-        if (x, y) in g_goals:
-            pygame.draw.rect(g_screen, GREEN, (x*TILE_SIZE+8, y*TILE_SIZE+8, TILE_SIZE-16, TILE_SIZE-16))
-            continue
-        pygame.draw.rect(g_screen, BROWN, (x*TILE_SIZE+8, y*TILE_SIZE+8, TILE_SIZE-16, TILE_SIZE-16))
-
     # Player
     if g_player is None:
         print("render_move: player is None — check level file for player '@' or '+' marker")
         return
     
-    # Draw player with different color if on goal
-    player_color = YELLOW if g_player in g_goals else BLUE
-    pygame.draw.circle(g_screen, player_color, (g_player[0]*TILE_SIZE+TILE_SIZE//2, g_player[1]*TILE_SIZE+TILE_SIZE//2), TILE_SIZE//3)
+    # --- Render ---
+    # Walls and goals come from the cached static layer; only cells whose
+    # box or player changed since the last frame are drawn again
+    layer = get_static_layer(g_level_name, g_walls, g_goals, g_cols, g_rows)
+    boxes = frozenset(g_boxes)
+    if g_board_drawn is None:
+        g_screen.fill(WHITE)
+        g_screen.blit(layer, (0, 0))
+        changed = boxes | {g_player}
+        dirty_rects = None
+    else:
+        old_player, old_boxes = g_board_drawn
+        changed = (old_boxes ^ boxes) | ({old_player, g_player} if old_player != g_player else set())
+        dirty_rects = []
+    for pos in changed:
+        rect = draw_board_cell(layer, pos)
+        if dirty_rects is not None:
+            dirty_rects.append(rect)
+    g_board_drawn = (g_player, boxes)
 
     back_button = { "BACK": pygame.Rect((g_cols*TILE_SIZE)//2 - 75, (g_rows*TILE_SIZE) + 10, 170, 50)}
     mouse_pos = pygame.mouse.get_pos()
@@ -217,12 +227,46 @@ def render_move():
         color = LIGHT_BLUE if rect.collidepoint(mouse_pos) else BLUE
         pygame.draw.rect(g_screen, color, rect, border_radius=10)
         draw_text(text, g_font, WHITE, g_screen, rect.centerx, rect.centery)
+        if dirty_rects is not None:
+            dirty_rects.append(rect)
         
         if g_click and rect.collidepoint(mouse_pos):
             g_click = False
             if text == "BACK":
                 g_render_state = RENDER_LEVEL_SELECT
                 g_screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+                dirty_rects = None
+    g_dirty_rects = dirty_rects
+
+# --- STATIC LAYER ---
+def get_static_layer(name, walls, goals, cols, rows, tile_size=TILE_SIZE):
+    """Walls and goals of a level on a white Surface, drawn once per level and tile size"""
+    key = (name, tile_size)
+    layer = g_static_layers.get(key)
+    if layer is None:
+        layer = pygame.Surface((cols*tile_size, rows*tile_size))
+        layer.fill(WHITE)
+        for (x, y) in walls:
+            pygame.draw.rect(layer, GRAY, (x*tile_size, y*tile_size, tile_size, tile_size))
+        for (x, y) in goals:
+            pygame.draw.circle(layer, GOLD, (x*tile_size+tile_size//2, y*tile_size+tile_size//2), tile_size//6)
+        g_static_layers[key] = layer
+    return layer
+
+# --- DRAW BOARD CELL ---
+def draw_board_cell(layer, pos):
+    """Restore one cell from the static layer, then draw its box and player; returns the cell rect"""
+    x, y = pos
+    rect = pygame.Rect(x*TILE_SIZE, y*TILE_SIZE, TILE_SIZE, TILE_SIZE)
+    g_screen.blit(layer, rect, rect)
+    if pos in g_boxes:
+        box_color = GREEN if pos in g_goals else BROWN
+        pygame.draw.rect(g_screen, box_color, (x*TILE_SIZE+8, y*TILE_SIZE+8, TILE_SIZE-16, TILE_SIZE-16))
+    if pos == g_player:
+        # Draw player with different color if on goal
+        player_color = YELLOW if g_player in g_goals else BLUE
+        pygame.draw.circle(g_screen, player_color, (x*TILE_SIZE+TILE_SIZE//2, y*TILE_SIZE+TILE_SIZE//2), TILE_SIZE//3)
+    return rect
 
 # --- TEXT DRAWING ---
 def draw_text(text, font, color, surface, x, y):
@@ -260,27 +304,42 @@ def render_main_menu():
 
 # --- LOAD LEVEL PREVIEW ---
 def load_level_preview(filename):
-    with open(os.path.join(LEVEL_FOLDER, filename), "r") as f:
-        lines = [line.rstrip("\n") for line in f]
-    return lines
+    return g_level_repository.get(filename).lines
 
 # --- DRAW LEVEL PREVIEW ---
-def draw_level_preview(level_data, x, y, tile_size=PREVIEW_TILE_SIZE):
+def draw_level_preview(level_data, x, y, tile_size=PREVIEW_TILE_SIZE, surface=None):
+    if surface is None:
+        surface = g_screen
     for row_idx, row in enumerate(level_data):
         for col_idx, ch in enumerate(row):
             rect = pygame.Rect(x + col_idx * tile_size, y + row_idx * tile_size, tile_size, tile_size)
             if ch == '#':
-                pygame.draw.rect(g_screen, GRAY, rect) # Wall
+                pygame.draw.rect(surface, GRAY, rect) # Wall
             elif ch == '$':
-                pygame.draw.rect(g_screen, BROWN, (2 + x + col_idx * tile_size, 2 + y + row_idx * tile_size, tile_size - 4, tile_size - 4))  # Brown box
+                pygame.draw.rect(surface, BROWN, (2 + x + col_idx * tile_size, 2 + y + row_idx * tile_size, tile_size - 4, tile_size - 4))  # Brown box
             elif ch == '.':
-                pygame.draw.circle(g_screen, GOLD, rect.center, tile_size // 2 - 8) # Goal
+                pygame.draw.circle(surface, GOLD, rect.center, tile_size // 2 - 8) # Goal
             elif ch == '@':
-                pygame.draw.circle(g_screen, BLUE, rect.center, tile_size // 2 - 4) # Player
+                pygame.draw.circle(surface, BLUE, rect.center, tile_size // 2 - 4) # Player
             elif ch == '*':
-                pygame.draw.rect(g_screen, GREEN, (2 + x + col_idx * tile_size, 2 + y + row_idx * tile_size, tile_size - 4, tile_size - 4)) # Box on goal
+                pygame.draw.rect(surface, GREEN, (2 + x + col_idx * tile_size, 2 + y + row_idx * tile_size, tile_size - 4, tile_size - 4)) # Box on goal
             elif ch == '+':
-                pygame.draw.circle(g_screen, YELLOW, rect.center, tile_size // 2 - 4) # Player on goal
+                pygame.draw.circle(surface, YELLOW, rect.center, tile_size // 2 - 4) # Player on goal
+
+# --- LEVEL PREVIEW CACHE ---
+def get_level_preview(filename, tile_size=PREVIEW_TILE_SIZE):
+    """Preview Surface of a level, drawn once per level and tile size"""
+    key = (filename, tile_size)
+    layer = g_preview_layers.get(key)
+    if layer is None:
+        level_data = load_level_preview(filename)
+        rows = len(level_data)
+        cols = max(len(line) for line in level_data)
+        layer = pygame.Surface((cols * tile_size, rows * tile_size))
+        layer.fill(WHITE)
+        draw_level_preview(level_data, 0, 0, tile_size, layer)
+        g_preview_layers[key] = layer
+    return layer
 
 # --- RENDER LEVEL SELECT ---
 def render_level_select():
@@ -318,24 +377,22 @@ def render_level_select():
 
     # --- Display level ---
     if g_levels:
-        level_data = load_level_preview(g_levels[g_current_level_index])
         level_name = g_levels[g_current_level_index].replace(".txt", "")
         txt = g_font.render(level_name, True, BLACK)
         g_screen.blit(txt, (SCREEN_WIDTH//2 - txt.get_width()//2, 50))
 
         # Render map preview
         tile_size = 24
-        rows = len(level_data)
-        cols = max(len(line) for line in level_data)
+        preview = get_level_preview(g_levels[g_current_level_index], tile_size)
 
         # Calculate render position
-        map_width = cols * tile_size
-        map_height = rows * tile_size
+        map_width = preview.get_width()
+        map_height = preview.get_height()
         start_x = (SCREEN_WIDTH - map_width) // 2
         start_y = (SCREEN_HEIGHT - map_height) // 2 - 50
 
         # Render map preview in center
-        draw_level_preview(level_data, start_x, start_y, tile_size)
+        g_screen.blit(preview, (start_x, start_y))
 
 # --- RENDER PLAY ---
 def render_playing():
@@ -378,21 +435,14 @@ def render_playing():
     render_move()
 
 # --- RENDER SOLVING ---
-def render_solving():
-    global g_render_state
-    global anim_path
-    global anim_index
-    global anim_last_time
-    global g_screen
-    global map_height
-    global map_width
-    global g_selected_heuristic
-    
+def solving_names():
+    """(algorithm name, heuristic name) of the current selection"""
     # Map heuristic names to internal names
     heuristic_map = {
         "Manhattan": "Manhattan",
         "BoundRelaxation (Static)": "BoundRelaxation (Static)",
-        "BoundRelaxation (Dynamic)": "BoundRelaxation (Dynamic)"
+        "BoundRelaxation (Dynamic)": "BoundRelaxation (Dynamic)",
+        "Matching (Hungarian)": "Matching (Hungarian)"
     }
     
     heuristic_name = heuristic_map.get(g_selected_heuristic, "BoundRelaxation (Static)")
@@ -400,27 +450,103 @@ def render_solving():
     # Save algorithm
     if g_selected_algorithm == DFS:
         algorithm_name = "DFS"
+    elif g_selected_algorithm == IDASTAR:
+        algorithm_name = "IDA*"
+    elif g_selected_algorithm == BIDIRECTIONAL:
+        algorithm_name = "Bidirectional"
+    elif g_selected_algorithm == HDASTAR:
+        algorithm_name = "HDA*"
+    elif g_selected_algorithm == PORTFOLIO:
+        algorithm_name = "Portfolio"
     else:
         algorithm_name = "A*"
+    return algorithm_name, heuristic_name
+
+def start_solution_anim(solution, stats):
+    global g_render_state
+    global anim_states
+    global anim_index
+    global anim_last_time
+    global g_screen
+    global g_board_drawn
     
-    # compute solution path (list of State)
-    path, stats = solve(g_walls, g_player, g_boxes, g_goals, map_width, map_height, g_selected_algorithm, heuristic_name=heuristic_name)
-    if path:
-        print("Solved! Steps:", len(path)-1)
-        
-        # Save solution with algorithm and heuristic info
-        if g_selected_algorithm == ASTAR:
-            save_solution(path, algorithm_name, heuristic_name, stats)
-        else:
-            save_solution(path, algorithm_name, None, stats)
-        
-        anim_path = path
-        anim_index = 0
-        anim_last_time = pygame.time.get_ticks()
-        g_render_state = RENDER_SOLVING_ANIM
-        g_screen = pygame.display.set_mode((g_cols*TILE_SIZE, g_rows*TILE_SIZE + 70))
+    algorithm_name, heuristic_name = solving_names()
+    print("Solved! Steps:", solution.steps)
+    print(format_stats(stats))
+    if g_selected_algorithm == PORTFOLIO:
+        algorithm_name = f"Portfolio ({stats['winner']})"
+    
+    # Save solution with algorithm and heuristic info
+    if g_selected_algorithm in (ASTAR, IDASTAR, HDASTAR):
+        save_solution(solution, algorithm_name, heuristic_name, stats)
+    else:
+        save_solution(solution, algorithm_name, None, stats)
+    
+    anim_states = solution.states()
+    next(anim_states)  # The start position is already on screen
+    anim_index = 0
+    anim_last_time = pygame.time.get_ticks()
+    g_render_state = RENDER_SOLVING_ANIM
+    g_screen = pygame.display.set_mode((g_cols*TILE_SIZE, g_rows*TILE_SIZE + 70))
+    g_board_drawn = None
+
+def render_solving():
+    global g_render_state
+    global g_click
+    global g_background_solver
+    
+    algorithm_name, heuristic_name = solving_names()
+    start_state = State(g_player, g_boxes)
+    config = solver_config(g_selected_algorithm, heuristic_name)
+    
+    # First frame: replay a stored solution, or start the solver in the background
+    if g_background_solver is None:
+        stored = g_solution_store.get(g_walls, start_state, g_goals, config)
+        if stored:
+            print("Loaded stored solution")
+            start_solution_anim(*stored)
+            return
+        g_background_solver = BackgroundSolver(g_walls, g_player, set(g_boxes), g_goals, map_width, map_height,
+                                               g_selected_algorithm, heuristic_name=heuristic_name)
+        g_background_solver.start()
+    
+    solver = g_background_solver
+    if solver.poll() and solver.solution:
+        g_background_solver = None
+        g_solution_store.put(g_walls, g_goals, config, solver.solution, solver.stats)
+        start_solution_anim(solver.solution, solver.stats)
+        return
+    
+    # --- Progress screen ---
+    g_screen.fill(WHITE)
+    title = algorithm_name if g_selected_algorithm not in (ASTAR, IDASTAR, HDASTAR) else f"{algorithm_name} - {heuristic_name}"
+    draw_text(f"Level {g_current_level}: {title}", g_font, BLACK, g_screen, SCREEN_WIDTH//2, 100)
+    if not solver.finished:
+        status = "Solving..."
+    elif solver.error:
+        status = solver.error
     else:
-        print("No solution found.")
+        status = "No solution found."
+    lines = [status, f"Elapsed: {solver.elapsed:.1f} s"]
+    counters = solver.counters
+    if counters:
+        lines.append(f"Nodes expanded: {counters['nodes_expanded']}  ({solver.nodes_per_second:,.0f} nodes/s)")
+        lines.append(f"Open list: {counters['open_size']}")
+        if counters.get('closed_size') is not None:
+            lines.append(f"Closed set: {counters['closed_size']}")
+    for i, ln in enumerate(lines):
+        draw_text(ln, g_font, BLACK, g_screen, SCREEN_WIDTH//2, 180 + i*40)
+    
+    mouse_pos = pygame.mouse.get_pos()
+    text, rect = ("BACK" if solver.finished else "CANCEL"), solving_cancel_button
+    color = LIGHT_BLUE if rect.collidepoint(mouse_pos) else BLUE
+    pygame.draw.rect(g_screen, color, rect, border_radius=10)
+    draw_text(text, g_font, WHITE, g_screen, rect.centerx, rect.centery)
+    if g_click and rect.collidepoint(mouse_pos):
+        g_click = False
+        solver.cancel()
+        g_background_solver = None
+        g_render_state = RENDER_ALGORITHM_SELECTION
 
 # --- RENDER SELECT SOLVING ALGORITHM ---
 def render_select_solving_algorithm():
@@ -450,6 +576,27 @@ def render_select_solving_algorithm():
                 return
             if text == "A*":
                 g_render_state = RENDER_HEURISTIC_SELECTION
+                g_selected_algorithm = ASTAR
+                return
+            if text == "IDA*":
+                g_render_state = RENDER_HEURISTIC_SELECTION
+                g_selected_algorithm = IDASTAR
+                return
+            if text == "HDA*":
+                g_render_state = RENDER_HEURISTIC_SELECTION
+                g_selected_algorithm = HDASTAR
+                return
+            if text == "Bidirectional":
+                g_render_state = RENDER_SOLVING
+                g_selected_algorithm = BIDIRECTIONAL
+                g_current_level = g_current_level_index + 1
+                load_level(g_current_level_index + 1)
+                return
+            if text == "Portfolio":
+                g_render_state = RENDER_SOLVING
+                g_selected_algorithm = PORTFOLIO
+                g_current_level = g_current_level_index + 1
+                load_level(g_current_level_index + 1)
                 return
 
 # --- RENDER HEURISTIC SELECTION ---
@@ -478,7 +625,6 @@ def render_heuristic_selection():
             g_click = False
             g_selected_heuristic = text
             g_render_state = RENDER_SOLVING
-            g_selected_algorithm = ASTAR
             g_current_level = g_current_level_index + 1
             load_level(g_current_level_index + 1)
             return
@@ -486,25 +632,25 @@ def render_heuristic_selection():
 # --- RENDER SOLVING ANIM ---
 def render_solving_anim():
     global anim_index
-    global anim_path
+    global anim_states
     global anim_last_time
     global g_player
     global g_boxes
                     
     # --- Animation update (if we have a solution path) ---
-    if anim_path is not None:
+    if anim_states is not None:
         now = pygame.time.get_ticks()
         if now - anim_last_time >= ANIM_DELAY_MS:
             anim_last_time = now
             anim_index += 1
-            if anim_index < len(anim_path):
-                s = anim_path[anim_index]
+            s = next(anim_states, None)
+            if s is not None:
                 g_player = s.player
                 g_boxes = set(s.boxes)
             else:
                 # finished animation
                 print("---Animation finished---")
-                anim_path = None
+                anim_states = None
     
     # --- Render moves ---
     render_move()
@@ -567,20 +713,12 @@ def render_state_machine():
 # --- TRACK LEVEL ---
 def track_level():
     global g_levels
+    global g_level_repository
     
-    files = [f for f in os.listdir(LEVEL_FOLDER) if f.endswith('.txt')]
-    
-    def _level_key(fname):
-        name = fname
-        if name.lower().startswith('level') and name.lower().endswith('.txt'):
-            num_part = name[5:-4]  # strip 'level' and '.txt'
-            try:
-                return (0, int(num_part))
-            except Exception:
-                pass
-        return (1, name)
-
-    g_levels = sorted(files, key=_level_key)
+    # Parse every level up front; the frame loop never reads a file
+    g_level_repository = LevelRepository(LEVEL_FOLDER)
+    g_level_repository.load_all()
+    g_levels = g_level_repository.names
 
 # --- INIT GAME ---
 def init_game():
@@ -614,6 +752,7 @@ def main():
     global g_cols
     global g_render_state
     global g_screen
+    global g_dirty_rects
 
     # Mock level testing
     # g_walls, g_boxes, g_goals, g_player, g_rows, g_cols = load_level(g_current_level)
@@ -632,9 +771,18 @@ def main():
             print("---You Win!---")
             g_render_state = RENDER_LEVEL_SELECT
             g_screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.flip()
+            g_dirty_rects = None
+
+        # The board reports the cells it changed; every other screen is redrawn whole
+        if g_dirty_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(g_dirty_rects)
+        g_dirty_rects = None
 
     # Thoát game
+    if g_background_solver is not None:
+        g_background_solver.cancel()
     pygame.quit()
 
 if __name__ == "__main__":
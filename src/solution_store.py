@@ -0,0 +1,67 @@
+import hashlib
+import json
+import os
+import time
+from typing import Optional, Set, Tuple
+from src.dfs import State, is_goal
+from src.levels import level_hash
+from src.moves import Solution, moves_to_path
+
+STORE_FOLDER = os.path.join("solutions", "store")
+
+
+class SolutionStore:
+    """
+    Solved levels on disk, keyed by level content and solver configuration.
+
+    Each entry is its own small JSON file named by the SHA-1 of the level
+    hash and the configuration, so a lookup is a single file read and no
+    index has to be loaded or kept in sync. Entries hold the LURD move
+    string and the solver statistics; they are written to a temporary file
+    and renamed into place, which lets several processes (the batch
+    benchmark workers) fill the store at the same time.
+    """
+
+    def __init__(self, folder: str = STORE_FOLDER):
+        self.folder = folder
+
+    def _entry_file(self, level_key: str, config: dict) -> str:
+        text = level_key + json.dumps(config, sort_keys=True)
+        key = hashlib.sha1(text.encode()).hexdigest()
+        return os.path.join(self.folder, key[:2], key + ".json")
+
+    def get(self, walls: Set[Tuple[int, int]], start_state: State, goals: Set[Tuple[int, int]],
+            config: dict) -> Optional[Tuple[Solution, dict]]:
+        """
+        Stored (solution, stats) for this level and configuration, or None.
+        A missing, unreadable or no longer valid entry counts as a miss.
+        """
+        level_key = level_hash(walls, start_state.player, start_state.boxes, goals)
+        try:
+            with open(self._entry_file(level_key, config), "r") as f:
+                entry = json.load(f)
+            path = moves_to_path(start_state, entry['moves'], walls)
+        except (OSError, ValueError, KeyError):
+            return None
+        if not is_goal(path[-1], goals):
+            return None
+        return Solution(start_state, entry['moves']), entry['stats']
+
+    def put(self, walls: Set[Tuple[int, int]], goals: Set[Tuple[int, int]], config: dict,
+            solution: Solution, stats: Optional[dict]) -> None:
+        start_state = solution.start_state
+        level_key = level_hash(walls, start_state.player, start_state.boxes, goals)
+        filename = self._entry_file(level_key, config)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        entry = {
+            'level': level_key,
+            'config': config,
+            'moves': solution.moves,
+            'steps': solution.steps,
+            'stats': stats,
+            'saved': time.time()
+        }
+        temp_file = f"{filename}.{os.getpid()}.tmp"
+        with open(temp_file, "w") as f:
+            json.dump(entry, f)
+        os.replace(temp_file, filename)
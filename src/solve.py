@@ -1,36 +1,99 @@
 from src.dfs import State, dfs_solver
 from src.astar import astar_solve
+from src.bidirectional import bidirectional_solver
+from src.hda import hda_solver
+from src.portfolio import portfolio_solver
+from src.metrics import MemoryMonitor
 
+import contextlib
 import time
-import os
-import psutil
 
 METHOD_DFS = 0
 METHOD_ASTAR = 1
+METHOD_IDASTAR = 2
+METHOD_BIDIRECTIONAL = 3
+METHOD_HDASTAR = 4
+METHOD_PORTFOLIO = 5
+METHOD_DFS_ID = 6
 
-def solve(walls, player, boxes, goals, map_width, map_height, method=METHOD_DFS, heuristic_name="relaxation"):
+# Methods that take a heuristic_name
+HEURISTIC_METHODS = (METHOD_ASTAR, METHOD_IDASTAR, METHOD_HDASTAR)
 
-    proc = psutil.Process(os.getpid())
-    before_mem = proc.memory_info().rss
+# Methods that stop on a SearchBudget with partial statistics
+BUDGET_METHODS = (METHOD_DFS, METHOD_DFS_ID, METHOD_ASTAR)
+
+def solver_config(method, heuristic_name=None, push_level=False, compact=False, corral_pruning=False):
+    """Settings that identify a solution of solve(), e.g. as a SolutionStore key"""
+    return {
+        'method': method,
+        'heuristic': heuristic_name if method in HEURISTIC_METHODS else None,
+        'push_level': push_level,
+        'compact': compact,
+        'corral_pruning': corral_pruning
+    }
+
+def solve(walls, player, boxes, goals, map_width, map_height, method=METHOD_DFS, heuristic_name="relaxation", push_level=False, compact=False, corral_pruning=False, workers=None, progress=None, memory='rss', profiler=None, budget=None, checkpoint_file=None, resume=None, closed_set='memory', open_list='heap', duplicate_detection=False):
+    """
+    Run one solver and measure it.
+
+    Args:
+        memory: Peak memory measurement, 'rss' or 'tracemalloc' (see
+                MemoryMonitor), or None to skip it
+        profiler: HotPathProfiler for DFS, A* and IDA* (other methods
+                  ignore it); its counters are also returned as 'profile'
+        budget: SearchBudget for the methods in BUDGET_METHODS (others
+                ignore it); a stopped run returns no solution and stats with
+                'budget_exhausted' and 'best_frontier'
+        checkpoint_file: A* only; the search is saved there periodically and
+                         when the budget runs out (see astar_solve)
+        resume: SearchCheckpoint to continue (A* only)
+        open_list, duplicate_detection: A* open list ('heap' or 'bucket') and
+                                        best-g duplicate detection (see
+                                        astar_solve); the binary heap without
+                                        duplicate detection by default
+        closed_set: 'mmap' keeps the closed set of the methods in
+                    BUDGET_METHODS in memory-mapped files (see MmapHashTable)
+        
+    Returns:
+        (Solution or None, stats): the engine's counters plus
+            time: wall-clock seconds of the whole run
+            phases: seconds per phase ('precompute', 'search', 'reconstruct');
+                    only 'search' for engines that do not split their run
+            nodes_per_second: nodes expanded per wall-clock second
+            peak_open_size, peak_closed_size: largest open and closed lists
+                                              (None when not tracked)
+            memory: MemoryMonitor statistics, or None
+        The stats are plain JSON values; print them with format_stats.
+    """
     start_state = State(player, boxes)
+    # HDA* and the portfolio search in child processes, which count towards the peak
+    monitor = MemoryMonitor(memory, include_children=method in (METHOD_HDASTAR, METHOD_PORTFOLIO)) if memory else None
     start_time = time.perf_counter()
 
-    path = None
+    solution = None
     stats = None
-    if method == METHOD_DFS:
-        path, stats = dfs_solver(start_state, walls, goals)
-    elif method == METHOD_ASTAR:
-        path, stats = astar_solve(start_state, walls, goals, map_width, map_height, heuristic_name=heuristic_name)
-        
-    end_time = time.perf_counter()
-    after_mem = proc.memory_info().rss
+    with monitor or contextlib.nullcontext():
+        if method == METHOD_DFS:
+            solution, stats = dfs_solver(start_state, walls, goals, push_level=push_level, compact=compact, progress=progress, profiler=profiler, budget=budget, closed_set=closed_set)
+        elif method == METHOD_DFS_ID:
+            solution, stats = dfs_solver(start_state, walls, goals, push_level=push_level, compact=compact, progress=progress, iterative_deepening=True, profiler=profiler, budget=budget, closed_set=closed_set)
+        elif method == METHOD_ASTAR:
+            solution, stats = astar_solve(start_state, walls, goals, map_width, map_height, heuristic_name=heuristic_name, push_level=push_level, compact=compact, corral_pruning=corral_pruning, progress=progress, profiler=profiler, budget=budget, checkpoint_file=checkpoint_file, resume=resume, closed_set=closed_set, open_list=open_list, duplicate_detection=duplicate_detection)
+        elif method == METHOD_IDASTAR:
+            solution, stats = astar_solve(start_state, walls, goals, map_width, map_height, heuristic_name=heuristic_name, push_level=push_level, compact=compact, corral_pruning=corral_pruning, ida_star=True, progress=progress, profiler=profiler)
+        elif method == METHOD_BIDIRECTIONAL:
+            solution, stats = bidirectional_solver(start_state, walls, goals)
+        elif method == METHOD_HDASTAR:
+            solution, stats = hda_solver(start_state, walls, goals, heuristic_name=heuristic_name, workers=workers, push_level=push_level, compact=compact, corral_pruning=corral_pruning)
+        elif method == METHOD_PORTFOLIO:
+            solution, stats = portfolio_solver(start_state, walls, goals, map_width, map_height, workers=workers, push_level=push_level, compact=compact, corral_pruning=corral_pruning)
     
-    elapsed_time = end_time - start_time
-    memory_used = after_mem - before_mem
-    if stats:
-        print(f"Nodes explored: {stats['nodes_explored']}")
-        print(f"Nodes expanded: {stats['nodes_expanded']}")
-        print(f"Nodes generated: {stats['nodes_generated']}")
-    print(f"Time taken: {elapsed_time:.3f} seconds")
-    print(f"Memory used: {memory_used / 1024:.2f} KB")
-    return path, stats
+    elapsed_time = time.perf_counter() - start_time
+    stats = dict(stats or {'nodes_explored': 0, 'nodes_expanded': 0, 'nodes_generated': 0})
+    stats['time'] = elapsed_time
+    stats.setdefault('phases', {'search': elapsed_time})
+    stats['nodes_per_second'] = stats['nodes_expanded'] / elapsed_time if elapsed_time > 0 else 0.0
+    stats.setdefault('peak_open_size', None)
+    stats.setdefault('peak_closed_size', None)
+    stats['memory'] = monitor.get_statistics() if monitor else None
+    return solution, stats
@@ -0,0 +1,76 @@
+import os
+from collections import deque
+
+import pytest
+
+from src.compact import CompactLevel
+from src.deadlock import compute_dead_squares
+from src.dfs import State, get_next_states, get_push_states, is_goal, normalize_state
+from src.levels import LEVEL_FOLDER, read_level
+
+LEVELS = [1, 5, 7, 36]
+
+# States visited per level; enough to reach pushes and frozen boxes
+STATES_PER_LEVEL = 300
+
+
+def load(number: int):
+    walls, player, boxes, goals, _, _ = read_level(os.path.join(LEVEL_FOLDER, f"level{number}.txt"))
+    return walls, State(player, boxes), goals
+
+
+def breadth_first(start, successors, limit: int):
+    """The first `limit` states reached from start, in breadth-first order"""
+    seen = {start}
+    queue = deque([start])
+    order = []
+    while queue and len(order) < limit:
+        state = queue.popleft()
+        order.append(state)
+        for child in successors(state):
+            if child not in seen:
+                seen.add(child)
+                queue.append(child)
+    return order
+
+
+@pytest.mark.parametrize("number", LEVELS)
+def test_step_successors_match_state(number):
+    walls, start, goals = load(number)
+    level = CompactLevel(walls, goals, start.player)
+    dead_squares = compute_dead_squares(walls, goals, start.player)
+
+    def successors(state):
+        return [child for child, _ in level.get_next_states(state)]
+
+    for state in breadth_first(level.encode(start), successors, STATES_PER_LEVEL):
+        decoded = level.decode(state)
+        expected = set(get_next_states(decoded, walls, goals, dead_squares))
+        assert {level.decode(child) for child in successors(state)} == expected
+        assert level.is_goal(state) == is_goal(decoded, goals)
+
+
+@pytest.mark.parametrize("number", LEVELS)
+def test_push_successors_match_state(number):
+    walls, start, goals = load(number)
+    level = CompactLevel(walls, goals, start.player)
+    dead_squares = compute_dead_squares(walls, goals, start.player)
+
+    for state in breadth_first(level.normalize(level.encode(start)), level.get_push_states, STATES_PER_LEVEL):
+        decoded = level.decode(state)
+        assert decoded == normalize_state(decoded, walls)
+        expected = set(get_push_states(decoded, walls, goals, dead_squares))
+        assert {level.decode(child) for child in level.get_push_states(state)} == expected
+
+
+@pytest.mark.parametrize("number", LEVELS)
+def test_incremental_zobrist_key_matches_encoding(number):
+    walls, start, goals = load(number)
+    level = CompactLevel(walls, goals, start.player)
+
+    for state in breadth_first(level.encode(start), lambda state: [c for c, _ in level.get_next_states(state)],
+                               STATES_PER_LEVEL):
+        encoded = level.encode(level.decode(state))
+        assert encoded == state
+        assert encoded.key == state.key
+        assert encoded.box_hash == state.box_hash
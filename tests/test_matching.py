@@ -0,0 +1,53 @@
+import random
+from itertools import permutations
+
+import pytest
+
+from src.matching import MatchingHeuristic
+
+CELLS = 30
+
+
+def random_rows(rng: random.Random, goals: int, unreachable: float) -> list:
+    """Push distances of every cell to each goal, some pairs unreachable"""
+    return [{cell: float('inf') if rng.random() < unreachable else rng.randint(0, 20) for cell in range(CELLS)}
+            for _ in range(goals)]
+
+
+def brute_force(rows: list, boxes) -> float:
+    return min(sum(rows[goal][box] for goal, box in zip(range(len(rows)), order))
+               for order in permutations(boxes))
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("unreachable", [0.0, 0.3])
+def test_incremental_solve_matches_full_solve(seed, unreachable):
+    rng = random.Random(seed)
+    goals = rng.randint(2, 6)
+    rows = random_rows(rng, goals, unreachable)
+    heuristic = MatchingHeuristic(rows, lambda state: state)
+    boxes = frozenset(rng.sample(range(CELLS), goals))
+    heuristic(boxes)
+
+    # A walk of single box moves, each child solved from its parent's potentials
+    for _ in range(40):
+        old = rng.choice(sorted(boxes))
+        new = rng.choice([cell for cell in range(CELLS) if cell not in boxes])
+        child = boxes - {old} | {new}
+        heuristic.set_parent(boxes)
+        incremental = heuristic.incremental_solves
+        cost = heuristic(child)
+        if heuristic.incremental_solves == incremental:
+            continue  # Cache hit
+        assert cost == brute_force(rows, child)
+        assert cost == MatchingHeuristic(rows, lambda state: state)(child)
+        boxes = child
+    assert heuristic.incremental_solves > 0
+
+
+def test_child_without_cached_parent_is_solved_in_full():
+    rows = [{0: 1, 1: 2, 2: 5}, {0: 4, 1: 1, 2: 1}]
+    heuristic = MatchingHeuristic(rows, lambda state: state)
+    heuristic.set_parent(frozenset({0, 1}))
+    assert heuristic(frozenset({0, 2})) == 2
+    assert (heuristic.full_solves, heuristic.incremental_solves) == (1, 0)